@@ -1,12 +1,15 @@
 from django.contrib import admin
 from bot.models import TgUser
+from todolist.db.counts import LargeTableAdmin
 
 
 @admin.register(TgUser)
-class TgUserAdmin(admin.ModelAdmin):
+class TgUserAdmin(LargeTableAdmin):
     list_display = ('chat_id', 'db_user')
+    list_select_related = ('user',)
     readonly_fields = ('verification_code',)
 
+    @admin.display(description='Пользователь')
     def db_user(self, obj: TgUser) -> str | None:
         if obj.user:
             return obj.user.username
@@ -0,0 +1,48 @@
+import time
+from django.conf import settings
+from django.db import transaction
+from bot.models import UpdateCheckpoint, ProcessedUpdate
+
+
+class OffsetCheckpoint:
+    """Хранит offset getUpdates в базе. Offset сохраняется пачками: раз в batch_size обновлений
+    или раз в interval секунд, обновления после последнего сохранения отсекаются по ProcessedUpdate"""
+
+    def __init__(
+        self,
+        name: str = 'runbot',
+        batch_size: int = settings.BOT_CHECKPOINT_BATCH,
+        interval: float = settings.BOT_CHECKPOINT_INTERVAL,
+    ):
+        self.name = name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.offset = self.load()
+        self.saved_offset = self.offset
+        self.saved_at = time.monotonic()
+
+    def load(self) -> int:
+        return UpdateCheckpoint.objects.filter(name=self.name).values_list('offset', flat=True).first() or 0
+
+    def advance(self, offset: int) -> None:
+        """Запоминает новый offset и сохраняет его, если накопилась пачка или истёк интервал"""
+        self.offset = offset
+        if self.offset - self.saved_offset >= self.batch_size or time.monotonic() - self.saved_at >= self.interval:
+            self.commit()
+
+    def commit(self) -> None:
+        """Сохраняет offset. Обновления до него Telegram больше не выдаст, их отметки об обработке удаляются"""
+        self.saved_at = time.monotonic()
+        if self.offset == self.saved_offset:
+            return
+        with transaction.atomic():
+            UpdateCheckpoint.objects.update_or_create(name=self.name, defaults={'offset': self.offset})
+            ProcessedUpdate.objects.filter(update_id__lt=self.offset).delete()
+        self.saved_offset = self.offset
+
+    @staticmethod
+    def mark_processed(update_id: int) -> bool:
+        """Отмечает обновление обработанным, возвращает False если оно уже было обработано.
+        Вызывается в одной транзакции с обработкой, чтобы отметка откатилась вместе с ней при ошибке"""
+        _, created = ProcessedUpdate.objects.get_or_create(update_id=update_id)
+        return created
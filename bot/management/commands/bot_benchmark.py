@@ -0,0 +1,112 @@
+import json
+import time
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from bot.checkpoint import OffsetCheckpoint
+from bot.management.commands.runbot import Command as BotCommand, BOT_STATUS, TgBotStatus
+from bot.models import TgUser
+from bot.tg.client import TgClient
+from bot.tg.fake_server import FakeTelegramServer, percentile
+from core.models import User
+from todolist.goals.models import Board, BoardParticipant, GoalCategory, Goal
+
+FIRST_CHAT_ID = 10**12
+
+
+class Command(BaseCommand):
+    """Нагрузочный тест бота на локальной замене Telegram Bot API.
+    Все созданные данные откатываются в конце, в базе ничего не остаётся"""
+
+    help = 'Measure bot throughput and reply latency against a fake Telegram Bot API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chats', type=int, default=1000, help='number of simulated chats')
+        parser.add_argument('--goals-per-user', type=int, default=50, help='goals owned by every chat user')
+        parser.add_argument('--json', action='store_true', help='print results as JSON')
+
+    def handle(self, *args, **options):
+        chats: int = options['chats']
+
+        with transaction.atomic():
+            self.create_data(chats, options['goals_per_user'])
+
+            server = FakeTelegramServer().start()
+            try:
+                for i in range(chats):
+                    chat_id = FIRST_CHAT_ID + i
+                    # сценарии одного чата идут подряд: бот хранит состояние диалога глобально
+                    server.add_message(chat_id, '/goals', flow='goals')
+                    server.add_message(chat_id, '/create', flow='create')
+                    server.add_message(chat_id, f'Benchmark category {i}', flow='category')
+                    server.add_message(chat_id, f'Benchmark goal {i}', flow='goal')
+
+                bot = BotCommand()
+                bot.tg_client = TgClient(api_url=server.url)
+                bot.checkpoint = OffsetCheckpoint()
+                BOT_STATUS.set_status_b(TgBotStatus.STOK)
+
+                offset = 0
+                started = time.perf_counter()
+                while not server.is_drained:
+                    offset = bot.handle_updates(offset)
+                elapsed = time.perf_counter() - started
+            finally:
+                server.stop()
+
+            transaction.set_rollback(True)
+
+        updates = offset - 1
+        results = {
+            'updates': updates,
+            'seconds': round(elapsed, 3),
+            'updates_per_second': round(updates / elapsed, 1) if elapsed else 0,
+            'flows': {
+                flow: {
+                    'count': len(values),
+                    'p50_ms': round(percentile(values, 50) * 1000, 2),
+                    'p99_ms': round(percentile(values, 99) * 1000, 2),
+                }
+                for flow, values in server.stats().items()
+            },
+            'api_requests': {
+                method: {'count': count, 'avg_ms': round(server.state.request_time[method] / count * 1000, 3)}
+                for method, count in server.state.requests.items()
+            },
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f'{updates} updates in {results["seconds"]} s: {results["updates_per_second"]} updates/s')
+        for flow, flow_stats in results['flows'].items():
+            self.stdout.write(
+                f'{flow:>10}: {flow_stats["count"]} replies, '
+                f'p50 {flow_stats["p50_ms"]} ms, p99 {flow_stats["p99_ms"]} ms'
+            )
+
+    def create_data(self, chats: int, goals_per_user: int) -> None:
+        """Создаёт на каждый чат привязанного пользователя с доской, категорией и целями"""
+        now = timezone.now()
+        users = User.objects.bulk_create(
+            [User(username=f'benchmark_{FIRST_CHAT_ID + i}', password='!') for i in range(chats)]
+        )
+        boards = Board.objects.bulk_create([Board(title=f'Benchmark board {i}') for i in range(chats)])
+        BoardParticipant.objects.bulk_create(
+            [BoardParticipant(board=board, user=user) for board, user in zip(boards, users)]
+        )
+        categories = GoalCategory.objects.bulk_create(
+            [
+                GoalCategory(title=f'Benchmark category {i}', board=board, user=user)
+                for i, (board, user) in enumerate(zip(boards, users))
+            ]
+        )
+        Goal.objects.bulk_create(
+            (
+                Goal(title=f'Goal {n}', category=category, user=category.user, created=now, updated=now)
+                for category in categories
+                for n in range(goals_per_user)
+            ),
+            batch_size=5000,
+        )
+        TgUser.objects.bulk_create([TgUser(chat_id=FIRST_CHAT_ID + i, user=user) for i, user in enumerate(users)])
@@ -1,7 +1,13 @@
+import time
+from django.conf import settings
 from django.core.management import BaseCommand
+from django.db import transaction
+from bot.checkpoint import OffsetCheckpoint
 from bot.models import TgUser
+from bot.pagination import GoalsCursor, get_goals_page, format_goals_page, build_goals_keyboard
+from bot.reminders import send_due_reminders
 from bot.tg.client import TgClient, logger
-from bot.tg.schemas import Message
+from bot.tg.schemas import Message, CallbackQuery, UpdateObj
 from todolist.goals.models import Goal, GoalCategory
 
 
@@ -34,16 +40,68 @@ class Command(BaseCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.tg_client = TgClient()
+        self.checkpoint: OffsetCheckpoint | None = None
+        self.reminders_sent_at = 0.0
+        # неудачные попытки обработки по update_id
+        self.attempts: dict[int, int] = {}
 
     def handle(self, *args, **options):
-        offset = 0
-
-        logger.info('Bot start handling')
-        while True:
-            res = self.tg_client.get_updates(offset=offset)
-            for item in res.result:
-                offset = item.update_id + 1
-                self.handle_message(item.message)
+        # offset читается из базы при запуске, а не при создании команды
+        self.checkpoint = OffsetCheckpoint()
+        offset = self.checkpoint.offset
+
+        logger.info('Bot start handling from offset %s', offset)
+        try:
+            while True:
+                self.send_reminders()
+                offset = self.handle_updates(offset)
+        finally:
+            self.checkpoint.commit()
+
+    def handle_updates(self, offset: int) -> int:
+        """Получает и обрабатывает одну пачку обновлений, возвращает offset для следующего запроса.
+        Offset не сдвигается дальше обновления, обработка которого упала: оно и следующие за ним
+        будут получены и обработаны заново"""
+        res = self.tg_client.get_updates(offset=offset)
+        for item in res.result:
+            if not self.handle_update(item):
+                break
+            offset = item.update_id + 1
+        self.checkpoint.advance(offset)
+        return offset
+
+    def handle_update(self, item: UpdateObj) -> bool:
+        """Обрабатывает обновление один раз: отметка об обработке и изменения в базе фиксируются одной
+        транзакцией. Если обработка упала (ошибка базы, 429 от Telegram), изменения откатываются и возвращается
+        False - обновление нужно повторить. После BOT_UPDATE_MAX_ATTEMPTS неудач оно пишется в лог
+        и отмечается обработанным, чтобы не останавливать остальные"""
+        try:
+            with transaction.atomic():
+                if not self.checkpoint.mark_processed(item.update_id):
+                    logger.info('Update %s already processed', item.update_id)
+                    return True
+                if item.callback_query:
+                    self.handle_callback_query(item.callback_query)
+                elif item.message:
+                    self.handle_message(item.message)
+        except Exception:
+            attempts = self.attempts[item.update_id] = self.attempts.get(item.update_id, 0) + 1
+            if attempts < settings.BOT_UPDATE_MAX_ATTEMPTS:
+                logger.warning('Update %s failed, attempt %s', item.update_id, attempts, exc_info=True)
+                time.sleep(settings.BOT_UPDATE_RETRY_DELAY * 2 ** (attempts - 1))
+                return False
+            logger.exception('Update %s failed %s times and is skipped', item.update_id, attempts)
+            self.checkpoint.mark_processed(item.update_id)
+        self.attempts.pop(item.update_id, None)
+        return True
+
+    def send_reminders(self):
+        """Раз в BOT_REMINDERS_INTERVAL секунд рассылает напоминания о сроках целей, 0 - рассылка выключена"""
+        interval = settings.BOT_REMINDERS_INTERVAL
+        if not interval or time.monotonic() - self.reminders_sent_at < interval:
+            return
+        self.reminders_sent_at = time.monotonic()
+        send_due_reminders(self.tg_client)
 
     def handle_message(self, msg: Message):
         """Определяет авторизован ли пользователь"""
@@ -54,6 +112,31 @@ class Command(BaseCommand):
         else:
             self.handle_unauthorized_user(tg_user, msg)
 
+    def handle_callback_query(self, callback_query: CallbackQuery):
+        """Обрабатывает нажатия на кнопки листания и фильтров списка целей"""
+        self.tg_client.answer_callback_query(callback_query_id=callback_query.id)
+
+        msg = callback_query.message
+        cursor = GoalsCursor.from_callback_data(callback_query.data or '')
+        if not msg or not msg.message_id or not cursor:
+            return
+
+        tg_user = TgUser.objects.select_related('user').filter(chat_id=msg.chat.id).first()
+        if not tg_user or not tg_user.user:
+            return
+
+        page = get_goals_page(tg_user.user, cursor)
+        try:
+            self.tg_client.edit_message_text(
+                chat_id=msg.chat.id,
+                message_id=msg.message_id,
+                text=format_goals_page(page),
+                reply_markup=build_goals_keyboard(page),
+            )
+        except RuntimeError:
+            # Telegram отвечает ошибкой, если страница не изменилась (повторное нажатие того же фильтра)
+            pass
+
     def handle_authorized_user(self, tg_user: TgUser, msg: Message):
         """Обрабатывает запросы авторизованного пользователя"""
         if msg.text == '/goals':
@@ -78,23 +161,18 @@ class Command(BaseCommand):
         self.tg_client.send_message(chat_id=msg.chat.id, text=f'Hello! Verification code: {code}')
 
     def processing_request_goals(self, tg_user: TgUser, msg: Message):
-        """Выводит список целей пользователя из категорий на досках, где он является участником или владельцем"""
-        qs = (
-            Goal.objects.select_related('user')
-            .filter(user=tg_user.user, category__is_deleted=False)
-            .exclude(status=Goal.Status.archived)
-        )
+        """Выводит первую страницу целей пользователя из категорий на досках, где он является участником или
+        владельцем, с клавиатурой листания и фильтров"""
+        page = get_goals_page(tg_user.user, GoalsCursor())
 
-        goals = '\n'.join([f'# {goal.title}' for goal in qs])
-
-        self.tg_client.send_message(chat_id=msg.chat.id, text='No goals' if not goals else goals)
+        self.tg_client.send_message(
+            chat_id=msg.chat.id, text=format_goals_page(page), reply_markup=build_goals_keyboard(page)
+        )
 
     def processing_goal_creation(self, tg_user: TgUser, msg: Message):
         """Выводит список категорий пользователя с досок, где он является участником или владельцем и
         предлагает выбрать в которую внести следующую цель, переключая бота в статус выбора категории"""
-        qs = GoalCategory.objects.select_related('user').filter(
-            board__participants__user=tg_user.user, is_deleted=False
-        )
+        qs = GoalCategory.live.select_related('user').filter(board__participants__user=tg_user.user)
 
         categories = '\n'.join([f'-> {cat.title}' for cat in qs])
 
@@ -107,7 +185,7 @@ class Command(BaseCommand):
     def checking_selected_category(self, msg: Message):
         """Поверяет, что пользователь передал валидное значение категории и предлагает добавить новую цель в
         случае успешности проверки, переключая бота в статус создания цели и передавая ему id категории"""
-        cat = GoalCategory.objects.filter(title=msg.text)
+        cat = GoalCategory.live.filter(title=msg.text)
         if cat:
             self.tg_client.send_message(chat_id=msg.chat.id, text='Enter your new goal')
             BOT_STATUS.set_category_id(category_id=cat[0].id)
@@ -117,7 +195,7 @@ class Command(BaseCommand):
 
     def create_goal(self, msg, tg_user):
         """Сохраняет цель в категорию с id, хранящимся у бота, переключая его в статус отсутствия задач"""
-        cat = GoalCategory.objects.get(pk=BOT_STATUS.category_id)
+        cat = GoalCategory.live.get(pk=BOT_STATUS.category_id)
         goal = Goal.objects.create(
             title=msg.text,
             category=cat,
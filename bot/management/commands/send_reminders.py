@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+from bot.reminders import send_due_reminders
+from bot.tg.client import TgClient
+
+
+class Command(BaseCommand):
+    """Рассылка напоминаний о целях со сроком сегодня, завтра и просроченных, запускается по расписанию"""
+
+    help = 'Send Telegram reminders about due and overdue goals'
+
+    def handle(self, *args, **options):
+        sent = send_due_reminders(TgClient())
+        self.stdout.write(f'Reminders sent for {sent} goals')
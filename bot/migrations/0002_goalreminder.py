@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0007_goal_due_date_open_idx'),
+        ('bot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                (
+                    'kind',
+                    models.CharField(
+                        choices=[('tomorrow', 'Завтра'), ('today', 'Сегодня'), ('overdue', 'Просрочена')], max_length=8
+                    ),
+                ),
+                ('due_date', models.DateField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                (
+                    'goal',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='goals.goal'
+                    ),
+                ),
+                (
+                    'tg_user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='bot.tguser'
+                    ),
+                ),
+            ],
+            options={
+                'unique_together': {('tg_user', 'goal', 'kind', 'due_date')},
+            },
+        ),
+    ]
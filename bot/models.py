@@ -1,6 +1,7 @@
 from django.db import models
 from uuid import uuid4
 from core.models import User
+from todolist.goals.models import Goal
 
 
 class TgUser(models.Model):
@@ -11,3 +12,36 @@ class TgUser(models.Model):
     @staticmethod
     def generate_verification_code() -> str:
         return str(uuid4())
+
+
+class GoalReminder(models.Model):
+    """Отправленное напоминание о сроке цели, повторно то же напоминание не отправляется"""
+
+    class Kind(models.TextChoices):
+        tomorrow = 'tomorrow', 'Завтра'
+        today = 'today', 'Сегодня'
+        overdue = 'overdue', 'Просрочена'
+
+    tg_user = models.ForeignKey(TgUser, on_delete=models.CASCADE, related_name='reminders')
+    goal = models.ForeignKey(Goal, on_delete=models.CASCADE, related_name='reminders')
+    kind = models.CharField(max_length=8, choices=Kind.choices)
+    due_date = models.DateField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('tg_user', 'goal', 'kind', 'due_date')
+
+
+class UpdateCheckpoint(models.Model):
+    """Сохранённый offset getUpdates, с которого бот продолжает работу после перезапуска"""
+
+    name = models.CharField(max_length=50, unique=True)
+    offset = models.BigIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+
+class ProcessedUpdate(models.Model):
+    """Обработанное обновление, не даёт обработать повторно обновления, выданные после последнего checkpoint"""
+
+    update_id = models.BigIntegerField(unique=True)
+    created = models.DateTimeField(auto_now_add=True)
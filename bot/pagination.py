@@ -0,0 +1,110 @@
+from dataclasses import dataclass, replace
+
+from core.models import User
+from bot.tg.schemas import InlineKeyboardButton, InlineKeyboardMarkup
+from todolist.goals.models import Goal
+
+GOALS_PAGE_SIZE = 10
+CALLBACK_PREFIX = 'goals'
+
+
+@dataclass(frozen=True)
+class GoalsCursor:
+    """Положение страницы в списке целей и выбранные фильтры, упаковывается в callback_data кнопок"""
+
+    NEXT = 'n'
+    PREV = 'p'
+
+    direction: str = NEXT
+    goal_id: int = 0
+    status: int = 0
+    priority: int = 0
+
+    def to_callback_data(self) -> str:
+        return f'{CALLBACK_PREFIX}:{self.direction}:{self.goal_id}:{self.status}:{self.priority}'
+
+    @classmethod
+    def from_callback_data(cls, data: str) -> 'GoalsCursor | None':
+        """Разбирает callback_data, для чужих или испорченных данных возвращает None"""
+        try:
+            prefix, direction, goal_id, status, priority = data.split(':')
+            cursor = cls(direction, int(goal_id), int(status), int(priority))
+        except ValueError:
+            return None
+        if prefix != CALLBACK_PREFIX or direction not in (cls.NEXT, cls.PREV):
+            return None
+        return cursor
+
+
+@dataclass
+class GoalsPage:
+    """Страница целей пользователя"""
+
+    cursor: GoalsCursor
+    goals: list[dict]
+    has_prev: bool
+    has_next: bool
+
+
+def get_goals_page(user: User, cursor: GoalsCursor, page_size: int = GOALS_PAGE_SIZE) -> GoalsPage:
+    """Возвращает одну страницу целей пользователя, используя keyset-пагинацию по id.
+    Запрос выбирает не больше page_size + 1 строк по индексу (user, id) на неархивных целях"""
+    qs = Goal.live.filter(user=user, category__is_deleted=False)
+    if cursor.status:
+        qs = qs.filter(status=cursor.status)
+    if cursor.priority:
+        qs = qs.filter(priority=cursor.priority)
+
+    if cursor.direction == GoalsCursor.PREV:
+        goals = list(qs.filter(id__lt=cursor.goal_id).order_by('-id').values('id', 'title')[: page_size + 1])
+        has_prev = len(goals) > page_size
+        return GoalsPage(cursor=cursor, goals=goals[:page_size][::-1], has_prev=has_prev, has_next=True)
+
+    if cursor.goal_id:
+        qs = qs.filter(id__gt=cursor.goal_id)
+    goals = list(qs.order_by('id').values('id', 'title')[: page_size + 1])
+    has_next = len(goals) > page_size
+    return GoalsPage(cursor=cursor, goals=goals[:page_size], has_prev=bool(cursor.goal_id), has_next=has_next)
+
+
+def format_goals_page(page: GoalsPage) -> str:
+    """Текст сообщения со страницей целей"""
+    goals = '\n'.join([f'# {goal["title"]}' for goal in page.goals])
+    return goals or 'No goals'
+
+
+def build_goals_keyboard(page: GoalsPage) -> InlineKeyboardMarkup:
+    """Клавиатура листания страниц и фильтров по статусу и приоритету"""
+    cursor = page.cursor
+    navigation = []
+    if page.has_prev and page.goals:
+        prev_cursor = replace(cursor, direction=GoalsCursor.PREV, goal_id=page.goals[0]['id'])
+        navigation.append(InlineKeyboardButton(text='◀', callback_data=prev_cursor.to_callback_data()))
+    if page.has_next and page.goals:
+        next_cursor = replace(cursor, direction=GoalsCursor.NEXT, goal_id=page.goals[-1]['id'])
+        navigation.append(InlineKeyboardButton(text='▶', callback_data=next_cursor.to_callback_data()))
+
+    statuses = [(0, 'Все')] + [choice for choice in Goal.Status.choices if choice[0] in Goal.live_statuses]
+    priorities = [(0, 'Все')] + Goal.Priority.choices
+
+    status_row = [
+        InlineKeyboardButton(
+            text=_mark_selected(label, value == cursor.status),
+            callback_data=GoalsCursor(status=value, priority=cursor.priority).to_callback_data(),
+        )
+        for value, label in statuses
+    ]
+    priority_row = [
+        InlineKeyboardButton(
+            text=_mark_selected(label, value == cursor.priority),
+            callback_data=GoalsCursor(status=cursor.status, priority=value).to_callback_data(),
+        )
+        for value, label in priorities
+    ]
+
+    rows = [row for row in (navigation, status_row, priority_row) if row]
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def _mark_selected(label: str, selected: bool) -> str:
+    return f'• {label}' if selected else label
@@ -0,0 +1,102 @@
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db.models import Case, CharField, Exists, F, OuterRef, QuerySet, Value, When
+from django.utils import timezone
+
+from bot.models import GoalReminder
+from bot.tg.client import TgClient
+from todolist.goals.models import Goal
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_MAX_LENGTH = 4096
+REMINDER_HEADERS = {
+    GoalReminder.Kind.overdue: 'Overdue goals:',
+    GoalReminder.Kind.today: 'Goals due today:',
+    GoalReminder.Kind.tomorrow: 'Goals due tomorrow:',
+}
+
+
+def get_due_goals(today: date) -> QuerySet:
+    """Одним запросом по частичному индексу (due_date) открытых целей выбирает цели со сроком до завтра
+    включительно у пользователей с привязанным телеграмом, по которым напоминание ещё не отправлялось"""
+    already_sent = GoalReminder.objects.filter(
+        tg_user_id=OuterRef('tg_user_id'),
+        goal_id=OuterRef('pk'),
+        kind=OuterRef('kind'),
+        due_date=OuterRef('due_date'),
+    )
+    return (
+        Goal.objects.filter(
+            due_date__lte=today + timedelta(days=1), status__in=(Goal.Status.to_do, Goal.Status.in_progress)
+        )
+        .annotate(
+            tg_user_id=F('user__tguser__id'),
+            chat_id=F('user__tguser__chat_id'),
+            kind=Case(
+                When(due_date__lt=today, then=Value(GoalReminder.Kind.overdue)),
+                When(due_date=today, then=Value(GoalReminder.Kind.today)),
+                default=Value(GoalReminder.Kind.tomorrow),
+                output_field=CharField(),
+            ),
+        )
+        .filter(tg_user_id__isnull=False)
+        .filter(~Exists(already_sent))
+        .order_by('due_date', 'id')
+        .values('id', 'title', 'due_date', 'kind', 'tg_user_id', 'chat_id')
+    )
+
+
+def format_reminders(goals: list[dict]) -> list[str]:
+    """Собирает напоминания одного чата в сообщения, не превышающие лимит длины Telegram"""
+    lines = []
+    for kind, header in REMINDER_HEADERS.items():
+        kind_goals = [goal for goal in goals if goal['kind'] == kind]
+        if kind_goals:
+            lines.append(header)
+            lines.extend(f'# {goal["title"]} ({goal["due_date"]:%Y-%m-%d})' for goal in kind_goals)
+
+    messages, current = [], ''
+    for line in lines:
+        line = line[:MESSAGE_MAX_LENGTH]
+        if current and len(current) + len(line) + 1 > MESSAGE_MAX_LENGTH:
+            messages.append(current)
+            current = ''
+        current = f'{current}\n{line}' if current else line
+    if current:
+        messages.append(current)
+    return messages
+
+
+def send_due_reminders(tg_client: TgClient, today: date | None = None) -> int:
+    """Рассылает напоминания одним сообщением на чат и запоминает отправленные, повторный запуск
+    в тот же день ничего не отправит. Возвращает количество целей, по которым отправлено напоминание"""
+    today = today or timezone.localdate()
+
+    batches: dict[tuple[int, int], list[dict]] = defaultdict(list)
+    for goal in get_due_goals(today).iterator(chunk_size=2000):
+        batches[(goal['tg_user_id'], goal['chat_id'])].append(goal)
+
+    sent = 0
+    for (tg_user_id, chat_id), goals in batches.items():
+        try:
+            for text in format_reminders(goals):
+                tg_client.send_message(chat_id=chat_id, text=text)
+        except RuntimeError:
+            logger.warning('Failed to send reminders to chat %s', chat_id)
+            continue
+
+        GoalReminder.objects.bulk_create(
+            [
+                GoalReminder(tg_user_id=tg_user_id, goal_id=goal['id'], kind=goal['kind'], due_date=goal['due_date'])
+                for goal in goals
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        sent += len(goals)
+
+    logger.info('Reminders sent for %s goals to %s chats', sent, len(batches))
+    return sent
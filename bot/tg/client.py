@@ -1,7 +1,7 @@
 import logging
 from django.conf import settings
 from pydantic import ValidationError
-from bot.tg.schemas import GetUpdatesResponse, SendMessageResponse
+from bot.tg.schemas import GetUpdatesResponse, SendMessageResponse, InlineKeyboardMarkup
 import requests
 
 logger = logging.getLogger(__name__)
@@ -10,11 +10,12 @@ logger = logging.getLogger(__name__)
 class TgClient:
     """Обращение к боту"""
 
-    def __init__(self, token: str = settings.BOT_TOKEN):
+    def __init__(self, token: str = settings.BOT_TOKEN, api_url: str = settings.BOT_API_URL):
         self.token = token
+        self.api_url = api_url.rstrip('/')
 
     def get_url(self, method: str) -> str:
-        return f'https://api.telegram.org/bot{self.token}/{method}'
+        return f'{self.api_url}/bot{self.token}/{method}'
 
     def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
         data = self._get(method='getUpdates', offset=offset, timeout=timeout)
@@ -24,10 +25,28 @@ class TgClient:
             logger.warning(data)
             return GetUpdatesResponse(ok=False, result=[])
 
-    def send_message(self, chat_id: int, text: str) -> SendMessageResponse:
-        data = self._get(method='sendMessage', chat_id=chat_id, text=text)
+    def send_message(
+        self, chat_id: int, text: str, reply_markup: InlineKeyboardMarkup | None = None
+    ) -> SendMessageResponse:
+        params = {'chat_id': chat_id, 'text': text}
+        if reply_markup:
+            params['reply_markup'] = reply_markup.json()
+        data = self._get(method='sendMessage', **params)
         return SendMessageResponse(**data)
 
+    def edit_message_text(
+        self, chat_id: int, message_id: int, text: str, reply_markup: InlineKeyboardMarkup | None = None
+    ) -> dict:
+        """Заменяет текст и клавиатуру ранее отправленного сообщения"""
+        params = {'chat_id': chat_id, 'message_id': message_id, 'text': text}
+        if reply_markup:
+            params['reply_markup'] = reply_markup.json()
+        return self._get(method='editMessageText', **params)
+
+    def answer_callback_query(self, callback_query_id: str) -> dict:
+        """Подтверждает получение нажатия на кнопку инлайн-клавиатуры"""
+        return self._get(method='answerCallbackQuery', callback_query_id=callback_query_id)
+
     def _get(self, method: str, **params) -> dict:
         url: str = self.get_url(method)
         response = requests.get(url, params=params)
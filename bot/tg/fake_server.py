@@ -0,0 +1,216 @@
+"""Локальная замена Telegram Bot API для нагрузочного тестирования бота.
+
+Реализует getUpdates, sendMessage, editMessageText и answerCallbackQuery в том виде, в котором их использует
+TgClient, раздаёт заранее подготовленный поток обновлений и замеряет время от выдачи обновления боту
+до его ответа в тот же чат.
+
+Запуск отдельно от Django:
+    python -m bot.tg.fake_server --port 8081 --chats 1000
+    BOT_API_URL=http://127.0.0.1:8081 python manage.py runbot
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+GET_UPDATES_LIMIT = 100
+
+
+@dataclass
+class PendingUpdate:
+    """Обновление, выданное боту и ожидающее ответа"""
+
+    update_id: int
+    flow: str
+    delivered_at: float
+
+
+@dataclass
+class FakeTelegramState:
+    """Очередь обновлений и собранные замеры, общие для всех потоков сервера"""
+
+    updates: deque = field(default_factory=deque)
+    flows: dict[int, str] = field(default_factory=dict)
+    pending: dict[int, deque] = field(default_factory=lambda: defaultdict(deque))
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    requests: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    request_time: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    sent_messages: list[dict] = field(default_factory=list)
+    next_update_id: int = 1
+    next_message_id: int = 1
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class FakeTelegramServer:
+    """HTTP-сервер, имитирующий Telegram Bot API"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.state = FakeTelegramState()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'FakeTelegramServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def add_message(self, chat_id: int, text: str, flow: str = 'message') -> int:
+        """Ставит в очередь текстовое сообщение из чата, flow - имя сценария для группировки замеров"""
+        with self.state.lock:
+            update_id = self.state.next_update_id
+            self.state.next_update_id += 1
+            message = {'message_id': update_id, 'chat': {'id': chat_id}, 'text': text}
+            self.state.updates.append({'update_id': update_id, 'message': message})
+            self.state.flows[update_id] = flow
+        return update_id
+
+    def add_callback_query(self, chat_id: int, message_id: int, data: str, flow: str = 'callback') -> int:
+        """Ставит в очередь нажатие на кнопку инлайн-клавиатуры"""
+        with self.state.lock:
+            update_id = self.state.next_update_id
+            self.state.next_update_id += 1
+            callback_query = {
+                'id': str(update_id),
+                'message': {'message_id': message_id, 'chat': {'id': chat_id}},
+                'data': data,
+            }
+            self.state.updates.append({'update_id': update_id, 'callback_query': callback_query})
+            self.state.flows[update_id] = flow
+        return update_id
+
+    @property
+    def is_drained(self) -> bool:
+        """Все обновления выданы и на каждое получен ответ"""
+        with self.state.lock:
+            return not self.state.updates and not any(self.state.pending.values())
+
+    def stats(self) -> dict[str, list[float]]:
+        """Задержки ответов в секундах, сгруппированные по сценариям"""
+        with self.state.lock:
+            return {flow: list(values) for flow, values in self.state.latencies.items()}
+
+    def _get_updates(self, params: dict) -> list[dict]:
+        offset = int(params.get('offset', 0))
+        limit = min(int(params.get('limit', GET_UPDATES_LIMIT)), GET_UPDATES_LIMIT)
+        now = time.perf_counter()
+        state = self.state
+        with state.lock:
+            # Как и Telegram, offset подтверждает и удаляет все более ранние обновления
+            while state.updates and state.updates[0]['update_id'] < offset:
+                state.updates.popleft()
+            batch = [state.updates[i] for i in range(min(limit, len(state.updates)))]
+            for update in batch:
+                if update.get('_delivered'):
+                    continue
+                update['_delivered'] = True
+                chat_id = (update.get('message') or update['callback_query']['message'])['chat']['id']
+                state.pending[chat_id].append(PendingUpdate(update['update_id'], state.flows[update['update_id']], now))
+        return [{key: value for key, value in update.items() if key != '_delivered'} for update in batch]
+
+    def _reply(self, params: dict) -> dict:
+        chat_id = int(params['chat_id'])
+        now = time.perf_counter()
+        state = self.state
+        with state.lock:
+            if state.pending[chat_id]:
+                pending = state.pending[chat_id].popleft()
+                state.latencies[pending.flow].append(now - pending.delivered_at)
+            message_id = int(params.get('message_id') or state.next_message_id)
+            state.next_message_id += 1
+            message = {'message_id': message_id, 'chat': {'id': chat_id}, 'text': params.get('text')}
+            state.sent_messages.append(message)
+        return message
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                self._dispatch(dict(parse_qsl(urlsplit(self.path).query)))
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                params = dict(parse_qsl(urlsplit(self.path).query))
+                if body:
+                    params.update(json.loads(body))
+                self._dispatch(params)
+
+            def _dispatch(self, params: dict) -> None:
+                started = time.perf_counter()
+                method = urlsplit(self.path).path.rsplit('/', 1)[-1]
+                if method == 'getUpdates':
+                    result = server._get_updates(params)
+                elif method in ('sendMessage', 'editMessageText'):
+                    result = server._reply(params)
+                elif method == 'answerCallbackQuery':
+                    result = True
+                else:
+                    self._send(404, {'ok': False, 'description': f'Unknown method {method}'})
+                    return
+                self._send(200, {'ok': True, 'result': result})
+                with server.state.lock:
+                    server.state.requests[method] += 1
+                    server.state.request_time[method] += time.perf_counter() - started
+
+            def _send(self, code: int, payload: dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Перцентиль методом ближайшего ранга"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Fake Telegram Bot API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--chats', type=int, default=1000, help='number of chats sending /goals')
+    parser.add_argument('--first-chat-id', type=int, default=1)
+    args = parser.parse_args()
+
+    server = FakeTelegramServer(args.host, args.port)
+    for chat_id in range(args.first_chat_id, args.first_chat_id + args.chats):
+        server.add_message(chat_id, '/goals', flow='goals')
+    print(f'Serving fake Bot API on {server.url}, press Ctrl+C to stop')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    for flow, values in server.stats().items():
+        print(
+            f'{flow}: {len(values)} replies, p50 {percentile(values, 50) * 1000:.1f} ms, '
+            f'p99 {percentile(values, 99) * 1000:.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
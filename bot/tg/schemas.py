@@ -6,13 +6,21 @@ class Chat(BaseModel):
 
 
 class Message(BaseModel):
+    message_id: int | None = None
     chat: Chat
     text: str | None = None
 
 
+class CallbackQuery(BaseModel):
+    id: str
+    message: Message | None = None
+    data: str | None = None
+
+
 class UpdateObj(BaseModel):
     update_id: int
-    message: Message
+    message: Message | None = None
+    callback_query: CallbackQuery | None = None
 
 
 class GetUpdatesResponse(BaseModel):
@@ -23,3 +31,12 @@ class GetUpdatesResponse(BaseModel):
 class SendMessageResponse(BaseModel):
     ok: bool
     result: Message
+
+
+class InlineKeyboardButton(BaseModel):
+    text: str
+    callback_data: str
+
+
+class InlineKeyboardMarkup(BaseModel):
+    inline_keyboard: list[list[InlineKeyboardButton]]
@@ -5,3 +5,6 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Ядро'
+
+    def ready(self) -> None:
+        from core import user_cache  # noqa: F401 подключение сигналов сброса кеша пользователей
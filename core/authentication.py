@@ -0,0 +1,36 @@
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+
+from core.models import TokenUser
+from core.tokens import InvalidToken, verify_access_token
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """Аутентификация по подписанному access токену из заголовка Authorization: Bearer <token>"""
+
+    keyword = b'bearer'
+
+    def authenticate(self, request: Request) -> tuple[TokenUser, str] | None:
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword:
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed('Invalid token header')
+
+        token = auth[1].decode(errors='replace')
+        try:
+            return verify_access_token(token), token
+        except InvalidToken as e:
+            raise AuthenticationFailed(str(e))
+
+
+class SignedTokenScheme(OpenApiAuthenticationExtension):
+    """Описание схемы аутентификации для drf_spectacular"""
+
+    target_class = 'core.authentication.SignedTokenAuthentication'
+    name = 'signedToken'
+
+    def get_security_definition(self, auto_schema) -> dict:
+        return {'type': 'http', 'scheme': 'bearer'}
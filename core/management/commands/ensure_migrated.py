@@ -0,0 +1,102 @@
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+
+# Ключ pg_advisory_lock, под которым применяются миграции, чтобы несколько контейнеров не делали это одновременно
+MIGRATE_LOCK_ID = 7_210_436
+
+
+def build_fingerprint() -> dict:
+    """Снимок миграций в коде: список миграций графа (с заменяемыми для сжатых) и его хеш"""
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    migrations = sorted(
+        [app_label, name, sorted(map(list, loader.graph.nodes[app_label, name].replaces))]
+        for app_label, name in loader.graph.nodes
+    )
+    digest = hashlib.sha256(json.dumps(migrations).encode()).hexdigest()
+    return {'fingerprint': digest, 'migrations': migrations}
+
+
+def load_fingerprint(path: Path) -> dict:
+    """Снимок, сохранённый при сборке образа, без импорта модулей миграций. Без файла строится по коду"""
+    if path.is_file():
+        return json.loads(path.read_text())
+    return build_fingerprint()
+
+
+def pending_migrations(connection, fingerprint: dict) -> list[str]:
+    recorder = MigrationRecorder(connection)
+    applied = set(recorder.applied_migrations()) if recorder.has_table() else set()
+    return [
+        f'{app_label}.{name}'
+        for app_label, name, replaces in fingerprint['migrations']
+        if (app_label, name) not in applied and not (replaces and {tuple(key) for key in replaces} <= applied)
+    ]
+
+
+@contextmanager
+def migrate_lock(connection):
+    if connection.vendor != 'postgresql':
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_lock(%s)', [MIGRATE_LOCK_ID])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(%s)', [MIGRATE_LOCK_ID])
+
+
+class Command(BaseCommand):
+    """Быстрая проверка миграций при старте контейнера: одним запросом сравнивает применённые миграции
+    со снимком, сохранённым при сборке образа, и запускает migrate, только если база отстаёт"""
+
+    help = 'Apply migrations only when the database lags behind the migrations fingerprint of the build'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--write', action='store_true', help='write the migrations fingerprint file and exit')
+        parser.add_argument(
+            '--wait', type=float, default=0, help='wait up to N seconds for migrations applied by another container'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        path = Path(settings.MIGRATIONS_FINGERPRINT_FILE)
+        if options['write']:
+            fingerprint = build_fingerprint()
+            path.write_text(json.dumps(fingerprint))
+            self.stdout.write(f'Migrations fingerprint {fingerprint["fingerprint"][:12]} written to {path}')
+            return
+
+        fingerprint = load_fingerprint(path)
+        connection = connections[options['database']]
+        short = fingerprint['fingerprint'][:12]
+
+        if options['wait']:
+            deadline = time.monotonic() + options['wait']
+            while pending := pending_migrations(connection, fingerprint):
+                if time.monotonic() > deadline:
+                    raise CommandError(f'Migrations are not applied: {", ".join(pending)}')
+                time.sleep(1)
+            self.stdout.write(f'Migrations {short} are up to date')
+            return
+
+        if not pending_migrations(connection, fingerprint):
+            self.stdout.write(f'Migrations {short} are up to date')
+            return
+
+        with migrate_lock(connection):
+            # пока ждали блокировку, миграции мог применить другой контейнер
+            if pending_migrations(connection, fingerprint):
+                call_command('migrate', database=options['database'], interactive=False, verbosity=options['verbosity'])
+        self.stdout.write(f'Migrations {short} applied')
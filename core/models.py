@@ -22,3 +22,18 @@ class User(AbstractUser):
 
     sex = models.CharField(max_length=1, choices=SEX, default=MALE)
     role = models.CharField(max_length=8, choices=ROLE, default=UNKNOWN)
+    token_version = models.PositiveIntegerField(default=0)
+
+
+class TokenUser(User):
+    """Пользователь, аутентифицированный по токену. Создаётся без запроса к базе с одним загруженным id,
+    остальные поля подгружаются одним запросом при первом обращении к любому из них"""
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred_fields = self.get_deferred_fields()
+        if fields is not None and deferred_fields and set(fields) <= deferred_fields:
+            fields = list(deferred_fields)
+        super().refresh_from_db(using=using, fields=fields)
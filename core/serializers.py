@@ -36,6 +36,12 @@ class LoginSerializer(serializers.Serializer):
     password = PasswordField(required=True)
 
 
+class TokenRefreshSerializer(serializers.Serializer):
+    """Сериализатор обновления токенов"""
+
+    refresh = serializers.CharField(required=True)
+
+
 class UpdatePasswordSerializer(serializers.Serializer):
     """Сериализатор смены пароля пользователя"""
 
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import DEFERRED, F
+
+from core.models import User, TokenUser
+
+TOKEN_SALT = 'core.tokens'
+ACCESS = 'access'
+REFRESH = 'refresh'
+
+
+class InvalidToken(Exception):
+    """Токен повреждён, просрочен, отозван или другого типа"""
+
+
+def issue_tokens(user: User) -> dict:
+    """Выпускает пару access и refresh токенов с текущей версией токенов пользователя"""
+    return {
+        'access': _sign(user, ACCESS),
+        'refresh': _sign(user, REFRESH),
+        'expires_in': settings.ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def verify_access_token(token: str) -> TokenUser:
+    """Проверяет access токен без запросов к базе: подпись, срок и версия, которая берётся из кеша"""
+    payload = _unsign(token, ACCESS, settings.ACCESS_TOKEN_LIFETIME)
+    if payload['ver'] != get_token_version(payload['uid']):
+        raise InvalidToken('Token has been revoked')
+    return get_token_user(payload['uid'])
+
+
+def verify_refresh_token(token: str) -> User:
+    """Проверяет refresh токен, сверяя версию и активность пользователя по базе"""
+    payload = _unsign(token, REFRESH, settings.REFRESH_TOKEN_LIFETIME)
+    user = User.objects.filter(pk=payload['uid'], is_active=True).first()
+    if not user or user.token_version != payload['ver']:
+        raise InvalidToken('Token has been revoked')
+    return user
+
+
+def get_token_version(user_id: int) -> int | None:
+    """Версия токенов пользователя из кеша, при промахе читается из базы"""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(pk=user_id, is_active=True).values_list('token_version', flat=True).first()
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def revoke_tokens(user: User) -> None:
+    """Отзывает все выпущенные пользователю токены, увеличивая версию"""
+    User.objects.filter(pk=user.pk).update(token_version=F('token_version') + 1)
+    user.refresh_from_db(fields=['token_version'])
+    cache.set(_version_key(user.pk), user.token_version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+
+def get_token_user(user_id: int) -> TokenUser:
+    field_names = [field.attname for field in User._meta.concrete_fields]
+    values = [user_id if name == 'id' else DEFERRED for name in field_names]
+    return TokenUser.from_db('default', field_names, values)
+
+
+def _sign(user: User, token_type: str) -> str:
+    return signing.dumps({'uid': user.pk, 'ver': user.token_version, 'typ': token_type}, salt=TOKEN_SALT)
+
+
+def _unsign(token: str, token_type: str, max_age: int) -> dict:
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    except signing.SignatureExpired:
+        raise InvalidToken('Token has expired')
+    except signing.BadSignature:
+        raise InvalidToken('Invalid token')
+    if payload.get('typ') != token_type:
+        raise InvalidToken('Invalid token type')
+    return payload
+
+
+def _version_key(user_id: int) -> str:
+    return f'core:token_version:{user_id}'
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.http import HttpRequest
+from django.utils.crypto import constant_time_compare
+
+from core.models import User
+
+
+def get_cached_user(request: HttpRequest) -> User:
+    """Пользователь сессии из кеша. При промахе, смене бэкенда или несовпадении хеша сессии
+    управление передаётся стандартному django.contrib.auth.get_user"""
+    user_id = request.session.get(auth.SESSION_KEY)
+    if user_id is None:
+        return auth.get_user(request)
+
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+    backend_path = request.session.get(auth.BACKEND_SESSION_KEY)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if (
+        backend_path not in settings.AUTHENTICATION_BACKENDS
+        or not session_hash
+        or not constant_time_compare(session_hash, user.get_session_auth_hash())
+    ):
+        return auth.get_user(request)
+
+    user.backend = backend_path
+    return user
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    cache.delete(user_cache_key(user_id))
+
+
+def user_cache_key(user_id: int | str) -> str:
+    return f'core:user:{user_id}'
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_on_change(sender, instance: User, **kwargs) -> None:
+    """Сбрасывает кеш при любом сохранении пользователя: смена пароля, профиля, правки в админке"""
+    invalidate_user_cache(instance.pk)
+
+
+@receiver(user_logged_out)
+def invalidate_on_logout(sender, request: HttpRequest, user: User | None, **kwargs) -> None:
+    if user is not None:
+        invalidate_user_cache(user.pk)
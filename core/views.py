@@ -1,5 +1,6 @@
 from typing import Any
 from django.contrib.auth import authenticate, login, logout
+from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.generics import GenericAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.request import Request
@@ -8,7 +9,14 @@ from rest_framework.serializers import Serializer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import AuthenticationFailed
 from core.models import User
-from core.serializers import CreateUserSerializer, ProfileSerializer, LoginSerializer, UpdatePasswordSerializer
+from core.serializers import (
+    CreateUserSerializer,
+    ProfileSerializer,
+    LoginSerializer,
+    UpdatePasswordSerializer,
+    TokenRefreshSerializer,
+)
+from core.tokens import InvalidToken, issue_tokens, revoke_tokens, verify_refresh_token
 
 
 class SignUpView(GenericAPIView):
@@ -45,6 +53,52 @@ class LoginView(GenericAPIView):
         return Response(ProfileSerializer(user).data)
 
 
+class TokenView(GenericAPIView):
+    """Выдача access и refresh токенов для API клиентов, сессия не создаётся"""
+
+    serializer_class = LoginSerializer
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer: Serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = authenticate(
+            username=serializer.validated_data['username'], password=serializer.validated_data['password']
+        )
+        if not user:
+            raise AuthenticationFailed
+
+        return Response(issue_tokens(user))
+
+
+class TokenRefreshView(GenericAPIView):
+    """Обмен refresh токена на новую пару токенов"""
+
+    serializer_class = TokenRefreshSerializer
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer: Serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            user = verify_refresh_token(serializer.validated_data['refresh'])
+        except InvalidToken as e:
+            raise AuthenticationFailed(str(e))
+
+        return Response(issue_tokens(user))
+
+
+class TokenRevokeView(GenericAPIView):
+    """Отзыв всех выпущенных пользователю токенов"""
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=None, responses={status.HTTP_204_NO_CONTENT: None})
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        revoke_tokens(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class ProfileView(RetrieveUpdateDestroyAPIView):
     """Профиль пользователя (получение, удаление)"""
 
@@ -76,5 +130,6 @@ class UpdatePasswordView(GenericAPIView):
 
         user.set_password(serializer.validated_data['new_password'])
         user.save(update_fields=['password'])
+        revoke_tokens(user)
 
         return Response(serializer.data)
@@ -1,8 +1,32 @@
 #!/bin/bash
-python manage.py migrate --check
-status=$?
-if [[ $status != 0 ]]; then
-  python manage.py migrate
-fi
-python manage.py collectstatic -c --noinput
+# Роль контейнера задаётся переменной ROLE: api (по умолчанию), events, bot или worker
+set -e
+role=${ROLE:-api}
+
+case "$role" in
+  api)
+    python manage.py ensure_migrated
+    # Статика собрана при сборке образа; в общий с nginx том копируется, только если она собрана заново.
+    # Метка .collected с временем сборки пишется после collectstatic при любом хранилище статики,
+    # staticfiles.json есть только с STATIC_MANIFEST
+    static_root=${STATIC_ROOT:-static}
+    if [[ ! -f "$static_root/.collected" ]]; then
+      python manage.py collectstatic --noinput
+      date -u +%FT%T.%N > "$static_root/.collected"
+    fi
+    if [[ -n "$STATIC_VOLUME" && "$STATIC_VOLUME" != "$static_root" ]] \
+      && ! cmp -s "$static_root/.collected" "$STATIC_VOLUME/.collected"; then
+      cp -a "$static_root/." "$STATIC_VOLUME/"
+    fi
+    ;;
+  events|bot|worker)
+    # миграции применяет api, остальные роли дожидаются их
+    python manage.py ensure_migrated --wait "${MIGRATIONS_WAIT:-120}"
+    ;;
+  *)
+    echo "Unknown ROLE: $role" >&2
+    exit 1
+    ;;
+esac
+
 exec "$@"
@@ -0,0 +1,142 @@
+"""Настройки gunicorn для продакшена, подхватываются автоматически при запуске из корня проекта:
+    gunicorn todolist.wsgi
+Поток событий досок обслуживается отдельным ASGI сервисом, в котором клиент не занимает поток воркера:
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn todolist.asgi:application
+
+Число воркеров считается по доступным процессору и памяти с учётом ограничений cgroup контейнера
+и переопределяется переменными GUNICORN_WORKERS и GUNICORN_THREADS.
+"""
+import math
+import os
+
+from envparse import env
+
+WORKER_MEMORY_MB = env.int('GUNICORN_WORKER_MEMORY_MB', default=120)
+RESERVED_MEMORY_MB = env.int('GUNICORN_RESERVED_MEMORY_MB', default=150)
+
+
+def cpu_limit() -> int:
+    """Число доступных процессору ядер с учётом квоты cgroup v2"""
+    cpus = len(os.sched_getaffinity(0))
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as file:
+            quota, period = file.read().split()
+        if quota != 'max':
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def memory_limit_mb() -> int | None:
+    """Доступная память: лимит cgroup v2, иначе MemTotal"""
+    try:
+        with open('/sys/fs/cgroup/memory.max') as file:
+            limit = file.read().strip()
+        if limit != 'max':
+            return int(limit) // 2**20
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/proc/meminfo') as file:
+            for line in file:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def default_workers() -> int:
+    workers = 2 * cpu_limit() + 1
+    memory = memory_limit_mb()
+    if memory is not None:
+        workers = min(workers, (memory - RESERVED_MEMORY_MB) // WORKER_MEMORY_MB)
+    return max(1, workers)
+
+
+bind = env.str('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = env.int('GUNICORN_WORKERS', default=default_workers())
+# Потоки отдают воркер другим запросам, пока один ждёт базу. Их число не должно превышать POSTGRES_POOL_MAX_SIZE
+threads = env.int('GUNICORN_THREADS', default=2)
+worker_class = env.str('GUNICORN_WORKER_CLASS', default='gthread' if threads > 1 else 'sync')
+timeout = env.int('GUNICORN_TIMEOUT', default=30)
+graceful_timeout = 30
+keepalive = 5
+
+# Приложение импортируется один раз в мастере, воркеры делят его память через copy-on-write
+preload_app = env.bool('GUNICORN_PRELOAD', default=True)
+
+# Перезапуск воркера после max_requests запросов ограничивает рост памяти, разброс не даёт
+# всем воркерам перезапуститься одновременно
+max_requests = env.int('GUNICORN_MAX_REQUESTS', default=1000)
+max_requests_jitter = env.int('GUNICORN_MAX_REQUESTS_JITTER', default=100)
+
+accesslog = '-'
+errorlog = '-'
+
+
+# Кеш в памяти процесса: у каждого воркера свои сессии и кеш пользователей
+PROCESS_LOCAL_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+def check_shared_cache(workers: int) -> None:
+    """С несколькими воркерами кеш должен быть общим: иначе выход, смена пароля или блокировка пользователя
+    в одном воркере не сбрасывают его сессию и кеш в остальных до истечения USER_CACHE_TIMEOUT"""
+    if workers < 2:
+        return
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    from django.conf import settings
+
+    if settings.CACHES['default']['BACKEND'] == PROCESS_LOCAL_CACHE:
+        raise RuntimeError(
+            f'{workers} workers need a shared cache, set CACHE_BACKEND and CACHE_LOCATION (redis) '
+            'or GUNICORN_WORKERS=1'
+        )
+
+
+def on_starting(server):
+    check_shared_cache(server.cfg.workers)
+    # метрики прошлого запуска не должны попасть в счётчики нового
+    metrics_dir = os.environ.get('METRICS_DIR')
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for name in os.listdir(metrics_dir):
+            if name.startswith('metrics-'):
+                os.remove(os.path.join(metrics_dir, name))
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from todolist.warmup import warm_app
+
+        warm_app()
+
+
+def post_fork(server, worker):
+    from todolist.warmup import warm_app, warm_connections
+
+    if not server.cfg.preload_app:
+        warm_app()
+    # Соединения открываются в каждом воркере: сокеты мастера нельзя использовать после fork
+    warm_connections()
+
+
+def worker_exit(server, worker):
+    # последние метрики воркера сохраняются, чтобы счётчики не уменьшились после его перезапуска
+    from django.conf import settings
+
+    if settings.METRICS_DIR:
+        from todolist.metrics.collectors import REGISTRY
+        from todolist.metrics.registry import write_snapshot
+
+        write_snapshot(REGISTRY, settings.METRICS_DIR)
+
+
+def child_exit(server, worker):
+    # снимок завершившегося воркера, в том числе убитого по таймауту, переносится в общий снимок мастером
+    metrics_dir = os.environ.get('METRICS_DIR')
+    if metrics_dir:
+        from todolist.metrics.registry import fold_snapshot
+
+        fold_snapshot(metrics_dir, worker.pid)
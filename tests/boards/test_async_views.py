@@ -0,0 +1,76 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from rest_framework import status
+
+from core.tokens import issue_tokens
+from todolist.goals import async_views, views
+
+
+@pytest.mark.django_db()
+class TestAsyncReadViews:
+    @pytest.fixture(autouse=True)
+    def setup(self, board_participant, goal_category, goal_factory):
+        self.user = board_participant.user
+        self.board = board_participant.board
+        goal_category.board = self.board
+        goal_category.save()
+        self.goals = goal_factory.create_batch(3, user=self.user, category=goal_category)
+        self.factory = RequestFactory()
+        self.authorization = f'Bearer {issue_tokens(self.user)["access"]}'
+
+    def get(self, view_class, path: str, authorization: str | None = None, **kwargs):
+        request = self.factory.get(path, HTTP_AUTHORIZATION=authorization or self.authorization)
+        view = view_class.as_view()
+        if getattr(view_class, 'view_is_async', False):
+            response = async_to_sync(view)(request, **kwargs)
+        else:
+            response = view(request, **kwargs)
+        response.render()
+        return response
+
+    @pytest.mark.parametrize(
+        'sync_view, async_view, path',
+        [
+            (views.BoardListView, async_views.AsyncBoardListView, '/goals/board/list'),
+            (views.GoalListView, async_views.AsyncGoalListView, '/goals/goal/list?limit=2&offset=1'),
+            (views.GoalListView, async_views.AsyncGoalListView, '/goals/goal/list?ordering=-priority'),
+        ],
+        ids=['boards', 'goals_page', 'goals_ordering'],
+    )
+    def test_list_matches_sync_view(self, sync_view, async_view, path):
+        """Асинхронный список возвращает тот же ответ, что и синхронный."""
+        expected = self.get(sync_view, path)
+        response = self.get(async_view, path)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content) == json.loads(expected.content)
+
+    def test_board_detail_matches_sync_view(self):
+        """Асинхронный просмотр доски возвращает тот же ответ, что и синхронный."""
+        path = f'/goals/board/{self.board.pk}'
+        expected = self.get(views.BoardDetailView, path, pk=self.board.pk)
+        response = self.get(async_views.AsyncBoardDetailView, path, pk=self.board.pk)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content) == json.loads(expected.content)
+
+    def test_foreign_board_not_found(self, user_factory):
+        """Асинхронный просмотр чужой доски возвращает 404."""
+        another_user = user_factory.create()
+        response = self.get(
+            async_views.AsyncBoardDetailView,
+            f'/goals/board/{self.board.pk}',
+            authorization=f'Bearer {issue_tokens(another_user)["access"]}',
+            pk=self.board.pk,
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_auth_required(self):
+        """Неавторизованный пользователь получает ошибку и от асинхронной вью."""
+        response = self.get(async_views.AsyncGoalListView, '/goals/goal/list', authorization='Bearer broken')
+
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+@pytest.mark.django_db()
+class TestBoardCloneView:
+    @pytest.fixture(autouse=True)
+    def setup(self, user, user_factory, board_participant_factory, goal_factory, goal_comment_factory):
+        self.owner = user_factory.create()
+        participant = board_participant_factory(user=self.owner)
+        self.board = participant.board
+        board_participant_factory(user=user, board=self.board, role=BoardParticipant.Role.reader)
+        self.goals = goal_factory.create_batch(4, user=self.owner, category__board=self.board)
+        goal_factory(user=self.owner, category=self.goals[0].category, status=Goal.Status.archived)
+        self.comment = goal_comment_factory(goal=self.goals[0], user=self.owner)
+        self.url = reverse('todolist.goals:board_clone', args=[self.board.pk])
+
+    def test_clone_with_content(self, auth_client, user):
+        """Владелец копирует доску с целями, участниками и комментариями, внешние ключи указывают на копии,
+        ранги и порядок сохраняются, число запросов не зависит от размера доски."""
+        BoardParticipant.objects.filter(board=self.board, user=user).update(role=BoardParticipant.Role.owner)
+        data = {'title': 'Шаблон', 'goals': True, 'participants': True, 'comments': True}
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.post(self.url, data, format='json')
+        connection.check_constraints()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        clone_id = response.json()['id']
+        assert response.json()['title'] == 'Шаблон'
+        assert len([query for query in queries if query['sql'].startswith('INSERT')]) == 6
+        assert dict(BoardParticipant.objects.filter(board=clone_id).values_list('user', 'role')) == {
+            user.id: BoardParticipant.Role.owner,
+            self.owner.id: BoardParticipant.Role.writer,
+        }
+        source = Goal.live.filter(category__board=self.board).order_by('category__rank', 'rank')
+        copies = Goal.objects.filter(category__board=clone_id).order_by('category__rank', 'rank')
+        assert [(goal.title, goal.rank, goal.user_id) for goal in copies] == [
+            (goal.title, goal.rank, goal.user_id) for goal in source
+        ]
+        assert GoalCategory.objects.filter(board=clone_id).count() == 4
+        comment = GoalComment.objects.get(goal__category__board=clone_id)
+        assert (comment.text, comment.goal.title, comment.created) == (
+            self.comment.text,
+            self.goals[0].title,
+            self.comment.created,
+        )
+
+    def test_clone_categories(self, auth_client, user):
+        """По умолчанию копируются только категории, их автором становится копирующий пользователь."""
+        response = auth_client.post(self.url, {}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        clone_id = response.json()['id']
+        assert response.json()['title'] == self.board.title
+        assert set(GoalCategory.objects.filter(board=clone_id).values_list('user', flat=True)) == {user.id}
+        assert not Goal.objects.filter(category__board=clone_id).exists()
+        assert list(BoardParticipant.objects.filter(board=clone_id).values_list('user', flat=True)) == [user.id]
+
+    def test_reader_cannot_clone_participants(self, auth_client):
+        """Читатель может скопировать доску, но не её участников."""
+        boards = Board.objects.count()
+
+        response = auth_client.post(self.url, {'goals': True, 'participants': True}, format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert Board.objects.count() == boards
+
+    def test_comments_require_goals(self, auth_client):
+        """Комментарии без целей не копируются."""
+        response = auth_client.post(self.url, {'comments': True}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_foreign_board(self, client, user_factory):
+        """Доску, где пользователь не участвует, скопировать нельзя."""
+        client.force_login(user_factory.create())
+
+        response = client.post(self.url, {}, format='json')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
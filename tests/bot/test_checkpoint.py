@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from bot.checkpoint import OffsetCheckpoint
+from bot.management.commands.runbot import Command, BOT_STATUS, TgBotStatus
+from bot.models import TgUser, ProcessedUpdate, UpdateCheckpoint
+from bot.tg.schemas import UpdateObj
+from todolist.goals.models import Goal
+
+
+def make_update(update_id: int, chat_id: int, text: str) -> UpdateObj:
+    return UpdateObj(update_id=update_id, message={'message_id': update_id, 'chat': {'id': chat_id}, 'text': text})
+
+
+@pytest.mark.django_db()
+class TestOffsetCheckpoint:
+    def test_offset_is_saved_in_batches(self):
+        """Offset сохраняется только после накопления пачки обновлений."""
+        checkpoint = OffsetCheckpoint(batch_size=10, interval=3600)
+
+        checkpoint.advance(5)
+        assert not UpdateCheckpoint.objects.exists()
+
+        checkpoint.advance(11)
+        assert OffsetCheckpoint(batch_size=10, interval=3600).offset == 11
+
+    def test_commit_prunes_acknowledged_updates(self):
+        """После сохранения offset отметки о более ранних обновлениях удаляются."""
+        checkpoint = OffsetCheckpoint(batch_size=10, interval=3600)
+        for update_id in (1, 2, 3):
+            checkpoint.mark_processed(update_id)
+
+        checkpoint.advance(3)
+        checkpoint.commit()
+
+        assert list(ProcessedUpdate.objects.values_list('update_id', flat=True)) == [3]
+
+
+@pytest.mark.django_db()
+class TestUpdateDeduplication:
+    @pytest.fixture(autouse=True)
+    def setup(self, user, goal_category, board_participant_factory):
+        board_participant_factory.create(user=user, board=goal_category.board)
+        TgUser.objects.create(chat_id=7, user=user)
+        self.category = goal_category
+        self.bot = Command()
+        self.bot.tg_client = MagicMock()
+        self.bot.checkpoint = OffsetCheckpoint()
+        BOT_STATUS.set_status_b(TgBotStatus.STOK)
+
+    def test_replayed_update_does_not_duplicate_goal(self):
+        """Повторно выданное после перезапуска обновление не создаёт цель второй раз."""
+        self.bot.handle_update(make_update(1, 7, '/create'))
+        self.bot.handle_update(make_update(2, 7, self.category.title))
+        goal_update = make_update(3, 7, 'New goal')
+        self.bot.handle_update(goal_update)
+
+        BOT_STATUS.set_status_b(TgBotStatus.GOAL_CREATE)
+        restarted_bot = Command()
+        restarted_bot.tg_client = MagicMock()
+        restarted_bot.checkpoint = OffsetCheckpoint()
+        restarted_bot.handle_update(goal_update)
+
+        assert Goal.objects.filter(title='New goal').count() == 1
+
+    def test_failed_update_is_processed_again(self, settings):
+        """Если обработка упала, изменения откатываются, обновление не считается обработанным и при повторе
+        выполняется один раз."""
+        settings.BOT_UPDATE_RETRY_DELAY = 0
+        self.bot.handle_update(make_update(1, 7, '/create'))
+        self.bot.handle_update(make_update(2, 7, self.category.title))
+        self.bot.tg_client.send_message.side_effect = RuntimeError('429 Too Many Requests')
+        goal_update = make_update(3, 7, 'New goal')
+
+        assert not self.bot.handle_update(goal_update)
+        assert not Goal.objects.filter(title='New goal').exists()
+        assert not ProcessedUpdate.objects.filter(update_id=3).exists()
+
+        self.bot.tg_client.send_message.side_effect = None
+        assert self.bot.handle_update(goal_update)
+        assert Goal.objects.filter(title='New goal').count() == 1
+
+    def test_failing_update_is_skipped_after_max_attempts(self, settings):
+        """Обновление, которое падает каждый раз, пропускается после BOT_UPDATE_MAX_ATTEMPTS попыток,
+        offset не сдвигается дальше него, пока попытки не исчерпаны."""
+        settings.BOT_UPDATE_RETRY_DELAY = 0
+        settings.BOT_UPDATE_MAX_ATTEMPTS = 3
+        self.bot.tg_client.send_message.side_effect = RuntimeError
+        self.bot.tg_client.get_updates.return_value.result = [make_update(5, 7, '/goals')]
+
+        offsets = [self.bot.handle_updates(5) for _ in range(3)]
+
+        assert offsets == [5, 5, 6]
+        assert ProcessedUpdate.objects.filter(update_id=5).exists()
+        assert not self.bot.attempts
+
+    def test_command_does_not_query_on_init(self, django_assert_num_queries):
+        """Offset читается из базы при запуске команды, а не при её создании."""
+        with django_assert_num_queries(0):
+            Command()
@@ -0,0 +1,48 @@
+import pytest
+
+from bot.checkpoint import OffsetCheckpoint
+from bot.management.commands.runbot import Command
+from bot.models import TgUser
+from bot.tg.client import TgClient
+from bot.tg.fake_server import FakeTelegramServer, percentile
+
+
+@pytest.fixture()
+def fake_server():
+    server = FakeTelegramServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.django_db()
+class TestFakeTelegramServer:
+    def test_bot_replies_through_fake_api(self, fake_server, user, goal_factory):
+        """Бот забирает обновления у локального сервера и отвечает в тот же чат."""
+        goal = goal_factory.create(user=user)
+        TgUser.objects.create(chat_id=42, user=user)
+        fake_server.add_message(42, '/goals', flow='goals')
+        bot = Command()
+        bot.tg_client = TgClient(api_url=fake_server.url)
+        bot.checkpoint = OffsetCheckpoint()
+
+        offset = bot.handle_updates(0)
+        bot.handle_updates(offset)
+
+        assert fake_server.is_drained
+        assert len(fake_server.stats()['goals']) == 1
+        assert fake_server.state.sent_messages[0]['text'] == f'# {goal.title}'
+
+    def test_offset_acknowledges_updates(self, fake_server):
+        """Обновления с update_id меньше offset больше не выдаются."""
+        first = fake_server.add_message(1, '/goals')
+        fake_server.add_message(1, '/create')
+        client = TgClient(api_url=fake_server.url)
+
+        assert len(client.get_updates(offset=0).result) == 2
+        assert [item.update_id for item in client.get_updates(offset=first + 1).result] == [first + 1]
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 50) == 2.0
+    assert percentile([float(i) for i in range(1, 101)], 99) == 99.0
@@ -0,0 +1,56 @@
+import pytest
+
+from bot.pagination import GoalsCursor, get_goals_page, build_goals_keyboard
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestGoalsPagination:
+    @pytest.fixture(autouse=True)
+    def setup(self, user, goal_category, goal_factory):
+        self.goals = goal_factory.create_batch(5, user=user, category=goal_category)
+
+    def test_first_page(self, user):
+        """Первая страница содержит не больше page_size целей и ссылку на следующую."""
+        page = get_goals_page(user, GoalsCursor(), page_size=2)
+
+        assert [goal['id'] for goal in page.goals] == [goal.id for goal in self.goals[:2]]
+        assert page.has_next is True
+        assert page.has_prev is False
+
+    def test_next_and_prev_pages(self, user):
+        """Листание вперёд и назад возвращает соседние страницы."""
+        second = get_goals_page(user, GoalsCursor(goal_id=self.goals[1].id), page_size=2)
+        assert [goal['id'] for goal in second.goals] == [goal.id for goal in self.goals[2:4]]
+        assert second.has_prev is True
+
+        first = get_goals_page(user, GoalsCursor(GoalsCursor.PREV, goal_id=second.goals[0]['id']), page_size=2)
+        assert [goal['id'] for goal in first.goals] == [goal.id for goal in self.goals[:2]]
+        assert first.has_prev is False
+
+    def test_archived_goals_are_hidden(self, user):
+        """Архивные цели не попадают на страницы."""
+        Goal.objects.filter(id=self.goals[0].id).update(status=Goal.Status.archived)
+
+        page = get_goals_page(user, GoalsCursor())
+
+        assert self.goals[0].id not in [goal['id'] for goal in page.goals]
+
+    def test_filter_by_status(self, user):
+        """Фильтр по статусу оставляет только цели с этим статусом."""
+        Goal.objects.filter(id=self.goals[3].id).update(status=Goal.Status.done)
+
+        page = get_goals_page(user, GoalsCursor(status=Goal.Status.done))
+
+        assert [goal['id'] for goal in page.goals] == [self.goals[3].id]
+
+    def test_keyboard_callback_data_round_trip(self, user):
+        """callback_data кнопок разбирается обратно в курсор и укладывается в лимит Telegram."""
+        page = get_goals_page(user, GoalsCursor(), page_size=2)
+        keyboard = build_goals_keyboard(page)
+
+        for row in keyboard.inline_keyboard:
+            for button in row:
+                assert len(button.callback_data.encode()) <= 64
+                assert GoalsCursor.from_callback_data(button.callback_data) is not None
+        assert GoalsCursor.from_callback_data('foo:bar') is None
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from django.utils import timezone
+
+from bot.models import TgUser, GoalReminder
+from bot.reminders import send_due_reminders
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestSendDueReminders:
+    @pytest.fixture(autouse=True)
+    def setup(self, user, goal_category, goal_factory):
+        self.today = timezone.localdate()
+        self.tg_user = TgUser.objects.create(chat_id=100, user=user)
+        self.overdue = goal_factory.create(user=user, category=goal_category, due_date=self.today - timedelta(days=3))
+        self.due_today = goal_factory.create(user=user, category=goal_category, due_date=self.today)
+        self.due_tomorrow = goal_factory.create(user=user, category=goal_category, due_date=self.today + timedelta(1))
+        self.later = goal_factory.create(user=user, category=goal_category, due_date=self.today + timedelta(days=5))
+        self.tg_client = MagicMock()
+
+    def test_one_message_per_chat(self):
+        """Все напоминания пользователя уходят одним сообщением в его чат."""
+        sent = send_due_reminders(self.tg_client, today=self.today)
+
+        assert sent == 3
+        self.tg_client.send_message.assert_called_once()
+        text = self.tg_client.send_message.call_args.kwargs['text']
+        assert self.overdue.title in text
+        assert self.due_tomorrow.title in text
+        assert self.later.title not in text
+
+    def test_rerun_is_idempotent(self):
+        """Повторный запуск не отправляет уже отправленные напоминания."""
+        send_due_reminders(self.tg_client, today=self.today)
+        self.tg_client.reset_mock()
+
+        assert send_due_reminders(self.tg_client, today=self.today) == 0
+        self.tg_client.send_message.assert_not_called()
+        assert GoalReminder.objects.count() == 3
+
+    def test_next_day_sends_new_kind(self):
+        """На следующий день цель со сроком «завтра» получает напоминание «сегодня»."""
+        send_due_reminders(self.tg_client, today=self.today)
+
+        send_due_reminders(self.tg_client, today=self.today + timedelta(days=1))
+
+        assert GoalReminder.objects.filter(goal=self.due_tomorrow).count() == 2
+
+    def test_closed_goals_are_skipped(self):
+        """Выполненные и архивные цели не напоминаются."""
+        Goal.objects.filter(id=self.overdue.id).update(status=Goal.Status.done)
+        Goal.objects.filter(id=self.due_today.id).update(status=Goal.Status.archived)
+
+        assert send_due_reminders(self.tg_client, today=self.today) == 1
+
+    def test_failed_delivery_is_retried(self):
+        """Если сообщение не доставлено, напоминание не считается отправленным."""
+        self.tg_client.send_message.side_effect = RuntimeError
+
+        assert send_due_reminders(self.tg_client, today=self.today) == 0
+        assert not GoalReminder.objects.exists()
@@ -1,9 +1,17 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 pytest_plugins = 'tests.factories'
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кеш общий и переживает тестовую базу: закешированные пользователи и сессии прошлых тестов
+    не должны попадать в следующие"""
+    cache.clear()
+
+
 @pytest.fixture()
 def client() -> APIClient:
     return APIClient()
@@ -0,0 +1,82 @@
+import importlib.util
+
+import pytest
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.core.cache import cache, caches
+from django.urls import reverse
+from rest_framework import status
+
+from core.user_cache import user_cache_key
+
+
+@pytest.mark.django_db()
+class TestCachedSessionUser:
+    url = reverse('core:profile')
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def test_warm_request_does_not_query_session_and_user(self, auth_client, django_assert_num_queries):
+        """После первого запроса сессия и пользователь берутся из кеша."""
+        auth_client.get(self.url)
+
+        with django_assert_num_queries(0):
+            response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_profile_update_invalidates_cached_user(self, auth_client):
+        """Изменения профиля сразу видны в следующих запросах."""
+        auth_client.get(self.url)
+
+        response = auth_client.patch(self.url, data={'first_name': 'Ivan'})
+        assert response.status_code == status.HTTP_200_OK
+
+        assert auth_client.get(self.url).json()['first_name'] == 'Ivan'
+
+    def test_password_change_ends_cached_session(self, client, user_factory):
+        """После смены пароля закешированная сессия перестаёт работать."""
+        user = user_factory.create(password='Super-secret-42')
+        client.force_login(user)
+        client.get(self.url)
+
+        user.set_password('Another-secret-43')
+        user.save(update_fields=['password'])
+
+        assert client.get(self.url).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_logout_drops_session(self, auth_client):
+        """После выхода сессия не восстанавливается из кеша."""
+        auth_client.get(self.url)
+
+        assert auth_client.delete(self.url).status_code == status.HTTP_204_NO_CONTENT
+
+        assert auth_client.get(self.url).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_invalidation_visible_to_other_workers(self, auth_client, user):
+        """Сессия и пользователь, сброшенные при выходе, пропадают и из отдельного экземпляра кеша,
+        как у другого воркера."""
+        other_worker = caches.create_connection('default')
+        auth_client.get(self.url)
+        session = SessionStore(auth_client.cookies[settings.SESSION_COOKIE_NAME].value)
+        assert other_worker.get(user_cache_key(user.id)) is not None
+        assert other_worker.get(session.cache_key) is not None
+
+        auth_client.delete(self.url)
+
+        assert other_worker.get(user_cache_key(user.id)) is None
+        assert other_worker.get(session.cache_key) is None
+
+
+def test_gunicorn_requires_shared_cache(settings):
+    """gunicorn не запускает несколько воркеров с кешем в памяти процесса."""
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', settings.BASE_DIR / 'gunicorn.conf.py')
+    gunicorn_conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gunicorn_conf)
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+    gunicorn_conf.check_shared_cache(1)
+    with pytest.raises(RuntimeError, match='shared cache'):
+        gunicorn_conf.check_shared_cache(2)
@@ -0,0 +1,49 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from core.management.commands.ensure_migrated import build_fingerprint, pending_migrations
+
+
+@pytest.mark.django_db()
+class TestEnsureMigrated:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        self.path = tmp_path / 'migrations.lock'
+        settings.MIGRATIONS_FINGERPRINT_FILE = str(self.path)
+
+    def test_up_to_date(self, monkeypatch):
+        """Если все миграции из снимка применены, migrate не запускается."""
+        call_command('ensure_migrated', '--write', stdout=StringIO())
+        monkeypatch.setattr('core.management.commands.ensure_migrated.call_command', pytest.fail, raising=True)
+
+        out = StringIO()
+        call_command('ensure_migrated', stdout=out)
+
+        assert 'up to date' in out.getvalue()
+
+    def test_pending_migration(self):
+        """Миграция из снимка, отсутствующая в базе, считается неприменённой."""
+        fingerprint = build_fingerprint()
+        fingerprint['migrations'].append(['goals', '9999_future', []])
+
+        assert pending_migrations(connection, fingerprint) == ['goals.9999_future']
+
+    def test_squashed_migration_applied_by_replaced(self):
+        """Сжатая миграция считается применённой, если применены все заменённые ею."""
+        fingerprint = build_fingerprint()
+        fingerprint['migrations'].append(['goals', '0001_squashed', [['goals', '0001_initial']]])
+
+        assert pending_migrations(connection, fingerprint) == []
+
+    def test_wait_timeout(self):
+        """Роли без права миграции падают, если миграции так и не применены."""
+        fingerprint = build_fingerprint()
+        fingerprint['migrations'].append(['goals', '9999_future', []])
+        self.path.write_text(json.dumps(fingerprint))
+
+        with pytest.raises(CommandError, match='goals.9999_future'):
+            call_command('ensure_migrated', '--wait', '0.01', stdout=StringIO())
@@ -0,0 +1,56 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.schema import get_code_version
+
+
+@pytest.mark.django_db()
+class TestSchemaView:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        cache.clear()
+        self.url = reverse('schema')
+
+    def test_schema_built_once(self, client):
+        """Повторный запрос отдаёт ту же схему из кеша с тем же ETag."""
+        first = client.get(self.url)
+        second = client.get(self.url)
+
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert first.content == second.content
+        assert first['ETag'] == second['ETag']
+        assert b'/goals/goal/list' in first.content
+
+    def test_not_modified(self, client):
+        """Запрос с актуальным ETag получает 304 без тела."""
+        etag = client.get(self.url)['ETag']
+
+        response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+
+    def test_json_format(self, client):
+        """Схема в JSON кешируется отдельно от YAML."""
+        yaml_etag = client.get(self.url)['ETag']
+
+        response = client.get(self.url, HTTP_ACCEPT='application/vnd.oai.openapi+json')
+
+        assert response.json()['openapi'].startswith('3.')
+        assert response['ETag'] != yaml_etag
+
+    def test_cache_headers(self, client):
+        """Адрес с версией кода кешируется навсегда, без версии - только с проверкой ETag."""
+        assert 'no-cache' in client.get(self.url)['Cache-Control']
+
+        response = client.get(self.url, {'v': get_code_version()})
+
+        assert 'immutable' in response['Cache-Control']
+
+    def test_swagger_uses_versioned_url(self, client):
+        """Swagger UI запрашивает схему по адресу с версией кода."""
+        response = client.get(reverse('swagger-ui'))
+
+        assert f'/api/schema/?v\\u003D{get_code_version()}' in response.content.decode()
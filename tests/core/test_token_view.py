@@ -0,0 +1,86 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from core.tokens import verify_access_token
+
+
+@pytest.fixture()
+def password() -> str:
+    return 'Super-secret-42'
+
+
+@pytest.fixture()
+def token_user(user_factory, password):
+    return user_factory.create(password=password)
+
+
+@pytest.fixture()
+def tokens(client, token_user, password) -> dict:
+    response = client.post(reverse('core:token'), data={'username': token_user.username, 'password': password})
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+@pytest.mark.django_db()
+class TestTokenView:
+    profile_url = reverse('core:profile')
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def test_wrong_password(self, client, token_user):
+        """С неверным паролем токены не выдаются."""
+        response = client.post(
+            reverse('core:token'), data={'username': token_user.username, 'password': 'Wrong-password-1'}
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_access_token_authenticates_without_session(self, client, tokens, token_user):
+        """Access токен аутентифицирует запрос, сессия при этом не создаётся."""
+        response = client.get(self.profile_url, HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['username'] == token_user.username
+        assert 'sessionid' not in response.cookies
+
+    def test_authentication_does_not_query_database(self, tokens, token_user, django_assert_num_queries):
+        """Проверка токена с прогретым кешем версии не обращается к базе."""
+        verify_access_token(tokens['access'])
+
+        with django_assert_num_queries(0):
+            user = verify_access_token(tokens['access'])
+
+        assert user.pk == token_user.pk
+        assert user.is_authenticated
+
+    def test_revoked_access_token_is_rejected(self, client, tokens):
+        """После отзыва старые токены перестают работать."""
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {tokens["access"]}'}
+        assert client.post(reverse('core:token_revoke'), **headers).status_code == status.HTTP_204_NO_CONTENT
+
+        assert client.get(self.profile_url, **headers).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_refresh_issues_new_pair(self, client, tokens):
+        """Refresh токен обменивается на новую пару, access токеном обменять нельзя."""
+        response = client.post(reverse('core:token_refresh'), data={'refresh': tokens['refresh']})
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()) == {'access', 'refresh', 'expires_in'}
+
+        response = client.post(reverse('core:token_refresh'), data={'refresh': tokens['access']})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_password_change_revokes_tokens(self, client, tokens, password):
+        """Смена пароля отзывает выпущенные токены."""
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {tokens["access"]}'}
+        response = client.put(
+            reverse('core:update_password'),
+            data={'old_password': password, 'new_password': 'Another-secret-43'},
+            **headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        assert client.get(self.profile_url, **headers).status_code == status.HTTP_403_FORBIDDEN
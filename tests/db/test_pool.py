@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+from django.db import connection
+
+from todolist.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.rolled_back = False
+        self.in_transaction = False
+        self.healthy = True
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        self.rolled_back = True
+        self.in_transaction = False
+
+    def get_transaction_status(self):
+        return 2 if self.in_transaction else 0
+
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def execute(self, sql):
+                if not conn.healthy:
+                    raise RuntimeError('connection lost')
+
+        return Cursor()
+
+
+class TestConnectionPool:
+    def test_connection_is_reused(self):
+        """Возвращённое соединение выдаётся повторно без открытия нового."""
+        pool = ConnectionPool(FakeConnection)
+
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        assert pool.getconn() is conn
+        assert pool.stats['created'] == 1
+        assert pool.stats['checkouts'] == 2
+
+    def test_open_transaction_is_rolled_back(self):
+        pool = ConnectionPool(FakeConnection)
+        conn = pool.getconn()
+        conn.in_transaction = True
+
+        pool.putconn(conn)
+
+        assert conn.rolled_back is True
+
+    def test_unhealthy_connection_is_replaced(self):
+        """Соединение, не прошедшее проверку, закрывается и заменяется новым."""
+        pool = ConnectionPool(FakeConnection, check_interval=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.healthy = False
+
+        new_conn = pool.getconn()
+
+        assert new_conn is not conn
+        assert conn.closed
+        assert pool.stats['health_check_failures'] == 1
+        assert pool.size == 1
+
+    def test_expired_connection_is_closed(self):
+        pool = ConnectionPool(FakeConnection, max_lifetime=0)
+        conn = pool.getconn()
+
+        pool.putconn(conn)
+
+        assert conn.closed
+        assert pool.size == 0
+
+    def test_checkout_waits_for_free_connection(self):
+        """При исчерпании пула запрос ждёт возврата соединения или падает по таймауту."""
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.05)
+        conn = pool.getconn()
+
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+
+        pool.timeout = 5
+        threading.Timer(0.05, pool.putconn, args=(conn,)).start()
+        assert pool.getconn() is conn
+        assert pool.stats['waits'] == 2
+        assert pool.stats['errors'] == 1
+
+    def test_idle_connections_above_min_size_are_closed(self):
+        pool = ConnectionPool(FakeConnection, min_size=1, max_idle=0)
+        first, second = pool.getconn(), pool.getconn()
+        pool.putconn(first)
+        pool.putconn(second)
+
+        pool.getconn()
+
+        assert first.closed
+        assert pool.size == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_django_connection_returns_to_pool():
+    """Закрытие соединения Django возвращает его в пул."""
+    connection.ensure_connection()
+    raw = connection.connection
+    pool = connection.pool
+
+    connection.close()
+    assert not raw.closed
+
+    connection.ensure_connection()
+    assert connection.connection is raw
+    assert pool.stats['checkouts'] >= 2
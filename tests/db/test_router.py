@@ -0,0 +1,95 @@
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.contrib.sessions.models import Session
+from django.test import RequestFactory
+
+from core.models import User
+from todolist.db.middleware import PIN_COOKIE_NAME, ReplicaRoutingMiddleware
+from todolist.db.routers import ReplicaRouter, replica_reads_allowed
+from todolist.goals.models import Goal
+
+
+@pytest.fixture()
+def router(settings, monkeypatch) -> ReplicaRouter:
+    settings.DATABASE_REPLICAS = ['replica_0']
+    router = ReplicaRouter()
+    monkeypatch.setattr(router, 'replica_lag', lambda alias: 0.0)
+    return router
+
+
+@pytest.fixture()
+def replica_reads():
+    token = replica_reads_allowed.set(True)
+    yield
+    replica_reads_allowed.reset(token)
+
+
+class TestReplicaRouter:
+    def test_reads_go_to_primary_by_default(self, router):
+        """Без разрешения middleware чтения идут в основную базу."""
+        assert router.db_for_read(Goal) == 'default'
+
+    def test_allowed_reads_go_to_replica(self, router, replica_reads):
+        assert router.db_for_read(Goal) == 'replica_0'
+        assert router.db_for_read(User) == 'replica_0'
+        assert router.db_for_read(Session) == 'default'
+        assert router.db_for_write(Goal) == 'default'
+
+    def test_lagging_replica_is_skipped(self, router, replica_reads, monkeypatch):
+        """Отстающая или недоступная реплика исключается из чтения."""
+        monkeypatch.setattr(router, 'replica_lag', lambda alias: 60.0)
+        assert router.db_for_read(Goal) == 'default'
+
+        monkeypatch.setattr(router, 'replica_lag', lambda alias: None)
+        router._lag_checked_at.clear()
+        assert router.db_for_read(Goal) == 'default'
+
+    def test_migrations_only_on_primary(self, router):
+        assert router.allow_migrate('default', 'goals') is True
+        assert router.allow_migrate('replica_0', 'goals') is False
+
+
+class TestReplicaRoutingMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.seen = []
+
+        def view(request):
+            self.seen.append(replica_reads_allowed.get())
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        self.middleware = ReplicaRoutingMiddleware(view)
+        self.factory = RequestFactory()
+
+    def test_client_sticks_to_primary_after_write(self):
+        """После изменения клиент читает из основной базы, другие клиенты - из реплики."""
+        first, second = RequestFactory(), RequestFactory()
+        self.middleware(first.get('/'))
+        response = self.middleware(first.post('/'))
+        first.cookies[PIN_COOKIE_NAME] = response.cookies[PIN_COOKIE_NAME].value
+        self.middleware(first.get('/'))
+        self.middleware(second.get('/'))
+
+        assert self.seen == [True, False, False, True]
+        assert response.cookies[PIN_COOKIE_NAME]['max-age'] == settings.REPLICA_STICKY_SECONDS
+        assert replica_reads_allowed.get() is False
+
+    def test_pin_expires(self, settings):
+        """Закрепление действует REPLICA_STICKY_SECONDS секунд, поддельная cookie не учитывается."""
+        response = self.middleware(self.factory.post('/'))
+        pin = response.cookies[PIN_COOKIE_NAME].value
+
+        self.middleware(self.factory.get('/', HTTP_COOKIE=f'{PIN_COOKIE_NAME}={pin}'))
+        settings.REPLICA_STICKY_SECONDS = -1
+        self.middleware(self.factory.get('/', HTTP_COOKIE=f'{PIN_COOKIE_NAME}={pin}'))
+        settings.REPLICA_STICKY_SECONDS = 5
+        self.middleware(self.factory.get('/', HTTP_COOKIE=f'{PIN_COOKIE_NAME}=1'))
+
+        assert self.seen == [False, False, True, True]
+
+    def test_failed_write_does_not_pin(self):
+        """Запрос, завершившийся ошибкой, не закрепляет клиента."""
+        middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse(status=400))
+
+        assert PIN_COOKIE_NAME not in middleware(self.factory.post('/')).cookies
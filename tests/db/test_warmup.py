@@ -0,0 +1,18 @@
+import pytest
+from django.db import connection
+
+from todolist.warmup import warm_app, warm_connections
+
+
+def test_warm_app_does_not_touch_database():
+    """Прогрев в мастер-процессе не открывает соединений с базой."""
+    warm_app()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_warm_connections_fills_pool():
+    """Прогрев воркера оставляет соединения в пуле свободными."""
+    warm_connections()
+
+    assert connection.connection is None
+    assert connection.pool.idle >= connection.pool.min_size
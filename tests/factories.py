@@ -2,7 +2,7 @@ import factory
 from django.utils import timezone
 from pytest_factoryboy import register
 from core.models import User
-from todolist.goals.models import Board, BoardParticipant, GoalCategory
+from todolist.goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
 
 
 @register
@@ -57,3 +57,23 @@ class CategoryFactory(DatesFactoryMixin):
 
     class Meta:
         model = GoalCategory
+
+
+@register
+class GoalFactory(DatesFactoryMixin):
+    title = factory.Faker('sentence')
+    user = factory.SubFactory(UserFactory)
+    category = factory.SubFactory(CategoryFactory)
+
+    class Meta:
+        model = Goal
+
+
+@register
+class GoalCommentFactory(DatesFactoryMixin):
+    text = factory.Faker('sentence')
+    user = factory.SubFactory(UserFactory)
+    goal = factory.SubFactory(GoalFactory)
+
+    class Meta:
+        model = GoalComment
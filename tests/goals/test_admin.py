@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from bot.models import TgUser
+from todolist.db.counts import estimate_count
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestLargeTableAdmin:
+    @pytest.fixture(autouse=True)
+    def setup(self, client, user_factory):
+        client.force_login(user_factory(is_staff=True, is_superuser=True))
+
+    def create_rows(self, count: int, goal_comment_factory) -> None:
+        for comment in goal_comment_factory.create_batch(count):
+            TgUser.objects.create(chat_id=comment.pk, user=comment.user)
+
+    @pytest.mark.parametrize(
+        'changelist',
+        [
+            'admin:goals_goal_changelist',
+            'admin:goals_goalcategory_changelist',
+            'admin:goals_goalcomment_changelist',
+            'admin:bot_tguser_changelist',
+        ],
+    )
+    def test_queries_do_not_depend_on_rows(self, client, goal_comment_factory, changelist):
+        """Связанные объекты из list_display выбираются в запросе списка, а не отдельным запросом на строку,
+        без соединения с остальными связанными таблицами, которое Django делает по умолчанию."""
+        # первый запрос загружает сессию и пользователя в кеш
+        client.get(reverse(changelist))
+        counts = []
+        for rows in (1, 3):
+            self.create_rows(rows, goal_comment_factory)
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(reverse(changelist))
+            assert response.status_code == status.HTTP_200_OK
+            counts.append(len(queries))
+
+        assert counts[0] == counts[1]
+        assert not [item for item in queries if '"goals_board"' in item['sql']]
+
+    def test_estimated_count(self, settings, client, goal_factory):
+        """Выше порога число строк берётся из статистики, в том числе для отфильтрованного списка,
+        ниже порога считается точно."""
+        goal_factory.create_batch(3)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE goals_goal')
+        changelist = reverse('admin:goals_goal_changelist')
+
+        settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 1
+        for query in ({}, {'status__exact': Goal.Status.to_do}, {'q': 'title'}):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(changelist, query)
+            assert response.status_code == status.HTTP_200_OK
+            assert not [item for item in queries if 'COUNT(' in item['sql']]
+        assert estimate_count(Goal.objects.all()) == 3
+
+        settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 1000
+        with CaptureQueriesContext(connection) as queries:
+            client.get(changelist)
+        assert [item for item in queries if 'COUNT(' in item['sql']]
+
+    def test_search_uses_index(self):
+        """Поиск в админке (icontains) использует триграммный индекс по UPPER(title)."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            if cursor.fetchone() is None:
+                pytest.skip('pg_trgm is not available')
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+        plan = Goal.objects.filter(title__icontains='benchmark').explain()
+
+        assert 'goal_title_search_idx' in plan
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from bot.models import GoalReminder, TgUser
+from todolist.goals.models import ArchivedGoal, Board, ArchivedGoalComment, Goal, GoalComment
+
+
+@pytest.mark.django_db()
+class TestGoalArchive:
+    def test_archive_goals(self, auth_client, user, board_participant_factory, goal_factory, goal_comment_factory):
+        """Цели удалённой доски с комментариями переносятся в архив пачками, напоминания по ним удаляются,
+        живые цели остаются на месте."""
+        participant = board_participant_factory(user=user)
+        archived = goal_factory.create_batch(3, user=user, category__board=participant.board)
+        comment = goal_comment_factory(goal=archived[0], user=user)
+        live = goal_factory(user=user)
+        tg_user = TgUser.objects.create(chat_id=1, user=user)
+        GoalReminder.objects.create(tg_user=tg_user, goal=archived[0], kind='today', due_date='2026-10-19')
+
+        auth_client.delete(reverse('todolist.goals:board', args=[participant.board_id]))
+        call_command('archive_goals', batch_size=2, stdout=None)
+        connection.check_constraints()
+
+        assert list(Goal.objects.values_list('pk', flat=True)) == [live.pk]
+        assert sorted(ArchivedGoal.objects.values_list('pk', flat=True)) == [goal.pk for goal in archived]
+        assert ArchivedGoalComment.objects.get().text == comment.text
+        assert not GoalComment.objects.exists()
+        assert not GoalReminder.objects.exists()
+
+    def test_admin_restore(self, client, user_factory, goal_factory, goal_comment_factory):
+        """Архивные цели видны в админке и восстанавливаются действием с комментариями и прежними id."""
+        goal = goal_factory(status=Goal.Status.archived)
+        goal_comment_factory(goal=goal)
+        call_command('archive_goals', stdout=None)
+        client.force_login(user_factory(is_staff=True, is_superuser=True))
+        changelist = reverse('admin:goals_archivedgoal_changelist')
+
+        assert goal.title in client.get(changelist).content.decode()
+        response = client.post(changelist, {'action': 'restore', '_selected_action': [goal.pk]})
+        connection.check_constraints()
+
+        assert response.status_code == status.HTTP_302_FOUND
+        restored = Goal.objects.get()
+        assert (restored.pk, restored.title, restored.status) == (goal.pk, goal.title, Goal.Status.to_do)
+        assert GoalComment.objects.get().goal_id == goal.pk
+        assert not ArchivedGoal.objects.exists()
+        assert not ArchivedGoalComment.objects.exists()
+
+    def test_admin_restore_deleted_board(self, client, user_factory, goal_factory):
+        """Цель удалённой доски не восстанавливается, а остаётся в архиве с предупреждением."""
+        goal = goal_factory(status=Goal.Status.archived)
+        kept = goal_factory(status=Goal.Status.archived)
+        call_command('archive_goals', stdout=None)
+        Board.objects.filter(pk=goal.category.board_id).update(is_deleted=True)
+        client.force_login(user_factory(is_staff=True, is_superuser=True))
+        changelist = reverse('admin:goals_archivedgoal_changelist')
+
+        response = client.post(changelist, {'action': 'restore', '_selected_action': [goal.pk, kept.pk]}, follow=True)
+
+        assert list(Goal.objects.values_list('pk', flat=True)) == [kept.pk]
+        assert list(ArchivedGoal.objects.values_list('pk', flat=True)) == [goal.pk]
+        assert [str(message) for message in response.context['messages']] == [
+            'Восстановлено целей: 1',
+            'Цели удалённых категорий и досок остались в архиве: 1',
+        ]
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from todolist.benchmark.report import compare
+from todolist.benchmark.scenarios import SCENARIOS
+from todolist.goals.management.commands.endpoint_benchmark import uncovered_url_names
+
+
+def test_all_urls_covered():
+    """Для каждого адреса goals и core есть сценарий."""
+    assert uncovered_url_names() == set()
+
+
+def test_compare():
+    """Регрессией считается рост p95 сверх порога и абсолютного минимума или рост числа запросов."""
+    baseline = {'results': {'a': {'p95_ms': 10, 'queries': 2}, 'b': {'p95_ms': 0.1, 'queries': 2}}}
+    current = {'results': {'a': {'p95_ms': 15, 'queries': 3}, 'b': {'p95_ms': 0.5, 'queries': 2}}}
+
+    regressions = compare(baseline, current, threshold=0.2, min_delta_ms=1)
+
+    assert [(regression.scenario, regression.metric) for regression in regressions] == [
+        ('a', 'p95_ms'),
+        ('a', 'queries'),
+    ]
+
+
+@pytest.mark.django_db()
+def test_benchmark_run(tmp_path):
+    """Команда создаёт набор данных, выполняет все сценарии и падает при регрессии относительно baseline."""
+    output = tmp_path / 'results.json'
+    call_command(
+        'endpoint_benchmark', '--seed', '--preset', 'tiny', '--requests', '1', '--warmup', '0', '--output', output
+    )
+
+    results = json.loads(output.read_text())['results']
+    assert set(results) == {scenario.name for scenario in SCENARIOS}
+
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({'results': {'profile': {'p95_ms': 0, 'queries': 0}}}))
+    with pytest.raises(CommandError, match='profile: queries 0 -> 1'):
+        call_command(
+            'endpoint_benchmark', '--only', 'profile', '--requests', '1', '--warmup', '0', '--baseline', baseline
+        )
@@ -0,0 +1,152 @@
+import threading
+import time
+
+import pytest
+from django.urls import reverse
+
+from todolist.goals import events
+from todolist.goals.events import EventHub, Subscription, hub
+from todolist.goals.models import Goal
+
+
+def event(board: int, entity: str = 'goal', op: str = 'update', **extra) -> dict:
+    return {'board': board, 'entity': entity, 'id': 1, 'op': op, 'version': 1} | extra
+
+
+def test_dispatch(monkeypatch):
+    """События доставляются подпискам на их доски, добавление пользователя в доску расширяет его подписки,
+    удаление - сужает."""
+    monkeypatch.setattr(EventHub, 'run', lambda self: self._listening.set())
+    events_hub = EventHub()
+    subscription = Subscription(user_id=1, board_ids={10})
+    events_hub.subscribe(subscription)
+
+    events_hub.dispatch(event(10))
+    events_hub.dispatch(event(20))
+    events_hub.dispatch(event(20, 'participant', 'create', user=1))
+    events_hub.dispatch(event(20, id=2))
+    events_hub.dispatch(event(10, 'participant', 'delete', user=1))
+    events_hub.dispatch(event(10))
+
+    received = []
+    while (item := subscription.get(timeout=0)) is not None:
+        received.append((item['board'], item['entity'], item['op']))
+    assert received == [
+        (10, 'goal', 'update'),
+        (20, 'participant', 'create'),
+        (20, 'goal', 'update'),
+        (10, 'participant', 'delete'),
+    ]
+
+
+def test_listener_restarts_after_errors(monkeypatch):
+    """Слушатель переподключается после любой ошибки, а не только ошибки соединения, и завершается,
+    когда подписок не остаётся."""
+    calls = []
+
+    def listen(self):
+        calls.append(self)
+        if len(calls) == 1:
+            raise OSError('select failed')
+        self._listening.set()
+        while not self.stop_if_idle():
+            time.sleep(0.01)
+
+    monkeypatch.setattr(EventHub, 'listen', listen)
+    monkeypatch.setattr(events, 'RECONNECT_DELAY', 0)
+    events_hub = EventHub()
+    subscription = Subscription(user_id=1, board_ids={10})
+    events_hub.subscribe(subscription)
+    thread = events_hub._thread
+
+    assert len(calls) == 2
+    events_hub.unsubscribe(subscription)
+    thread.join(5)
+    assert not thread.is_alive()
+    assert events_hub._thread is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_notify_on_commit(user, board_participant_factory, category_factory, goal_factory):
+    """Изменения строк публикуются после коммита, удаление флагом и перенос цели в архив - как delete."""
+    participant = board_participant_factory(user=user)
+    category = category_factory(user=user, board=participant.board)
+    subscription = Subscription(user.id, {participant.board_id})
+    hub.subscribe(subscription)
+    try:
+        goal = goal_factory(user=user, category=category)
+        goal.status = Goal.Status.archived
+        goal.save()
+        category.is_deleted = True
+        category.save()
+
+        received = [subscription.get(timeout=5) for _ in range(3)]
+    finally:
+        hub.unsubscribe(subscription)
+
+    assert [(item['entity'], item['id'], item['op']) for item in received] == [
+        ('goal', goal.id, 'create'),
+        ('goal', goal.id, 'delete'),
+        ('category', category.id, 'delete'),
+    ]
+    assert {item['board'] for item in received} == {participant.board_id}
+    assert received[0]['version'] < received[1]['version'] < received[2]['version']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_notify_goal_moved(user, board_participant_factory, category_factory, goal_factory):
+    """Цель, перенесённая в категорию другой доски, публикуется как delete для прежней доски."""
+    source, target = board_participant_factory.create_batch(2, user=user)
+    goal = goal_factory(user=user, category=category_factory(user=user, board=source.board))
+    category = category_factory(user=user, board=target.board)
+    subscription = Subscription(user.id, {source.board_id, target.board_id})
+    hub.subscribe(subscription)
+    try:
+        goal.category = category
+        goal.save()
+
+        received = [subscription.get(timeout=5) for _ in range(2)]
+    finally:
+        hub.unsubscribe(subscription)
+
+    assert [(item['board'], item['entity'], item['id'], item['op']) for item in received] == [
+        (source.board_id, 'goal', goal.id, 'delete'),
+        (target.board_id, 'goal', goal.id, 'update'),
+    ]
+
+
+@pytest.mark.django_db()
+def test_event_stream(auth_client, user, board_participant_factory):
+    """Поток отдаёт события досок пользователя в формате text/event-stream и закрывается через timeout."""
+    participant = board_participant_factory(user=user)
+    threading.Timer(0.2, hub.dispatch, [event(participant.board_id, version=7)]).start()
+
+    response = auth_client.get(reverse('todolist.goals:events'), {'timeout': 1}, HTTP_ACCEPT='text/event-stream')
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/event-stream'
+    body = b''.join(response).decode()
+    assert body.startswith('retry: ')
+    assert 'id: 7\nevent: goal\ndata: {"board": %d, ' % participant.board_id in body
+
+
+@pytest.mark.django_db()
+def test_event_stream_limit(settings, auth_client, user, board_participant_factory):
+    """Под WSGI потоков в процессе не больше EVENTS_MAX_STREAMS, сверх предела отдаётся 503 с Retry-After,
+    место освобождается при закрытии ответа."""
+    settings.ASYNC_READ_VIEWS = False
+    settings.EVENTS_MAX_STREAMS = 1
+    board_participant_factory(user=user)
+    url = reverse('todolist.goals:events')
+
+    first = auth_client.get(url, {'timeout': 0}, HTTP_ACCEPT='text/event-stream')
+    rejected = auth_client.get(url, {'timeout': 0}, HTTP_ACCEPT='text/event-stream')
+    b''.join(first)
+    again = auth_client.get(url, {'timeout': 0}, HTTP_ACCEPT='text/event-stream')
+    b''.join(again)
+
+    assert first.status_code == 200
+    assert rejected.status_code == 503
+    assert rejected['Retry-After'] == '3'
+    assert again.status_code == 200
+    assert hub._streams == 0
@@ -0,0 +1,71 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from todolist.fastjson import FastJSONParser, FastJSONRenderer
+
+PAYLOADS = {
+    'dates': {
+        'created': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'updated': timezone.localtime(timezone.now()),
+        'naive': datetime.datetime(2024, 5, 1, 12, 30),
+        'due_date': datetime.date(2024, 5, 2),
+        'time': datetime.time(8, 15),
+        'duration': datetime.timedelta(hours=1, seconds=3),
+    },
+    'decimals': [decimal.Decimal('12.50'), decimal.Decimal('0.1'), decimal.Decimal('-3')],
+    'unicode': {'title': 'Цель №1 — купить 🍎', 'separators': 'a\u2028b\u2029c', 'quote': '"\\/'},
+    'mixed': ReturnDict(
+        {'id': 1, 'uuid': uuid.UUID(int=1), 'lazy': gettext_lazy('Архив'), 'none': None, 'flag': True, 1: 'int key'},
+        serializer=None,
+    ),
+}
+
+
+@pytest.mark.parametrize('data', PAYLOADS.values(), ids=PAYLOADS.keys())
+def test_renderer_matches_drf(data):
+    """Рендерер даёт те же байты, что и стандартный JSONRenderer DRF."""
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_renderer_indent_falls_back():
+    """Запрос с отступами обрабатывается стандартным рендерером."""
+    data = {'title': 'Цель'}
+    media_type = 'application/json; indent=4'
+
+    assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+
+
+@pytest.mark.parametrize(
+    'body',
+    [b'{"title":"\\u0426\\u0435\\u043b\\u044c","priority":2,"due_date":null}', '{"t":"Цель 🍎"}'.encode(), b'[1.5,2]'],
+    ids=['escaped', 'utf8', 'list'],
+)
+def test_parser_matches_drf(body):
+    """Парсер возвращает те же данные, что и стандартный JSONParser DRF."""
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.parametrize('body', [b'{"title":', b'[NaN]'], ids=['broken', 'nan'])
+def test_parser_errors(body):
+    """Некорректный JSON даёт ParseError, как и у DRF."""
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.django_db()
+def test_api_uses_fast_parser(auth_client, board_participant):
+    """API принимает и отдаёт JSON через быстрые рендерер и парсер."""
+    response = auth_client.post('/goals/board/create', {'title': 'Доска 🍎'}, format='json')
+
+    assert response.json()['title'] == 'Доска 🍎'
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
@@ -0,0 +1,104 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count
+
+from todolist.benchmark.dataset import DatasetGenerator
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalComment
+
+SIZES = ('--users', '10', '--boards', '5', '--goals', '200', '--comments', '500')
+
+
+def goals_of(prefix: str) -> list[tuple]:
+    return list(
+        Goal.objects.filter(user__username__startswith=prefix)
+        .annotate(comments_count=Count('comments'))
+        .order_by('pk')
+        .values_list('title', 'status', 'priority', 'user__username', 'comments_count')
+    )
+
+
+def table_definitions() -> set[tuple]:
+    """Индексы и внешние ключи таблиц целей"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) FROM pg_index
+            WHERE indrelid = 'goals_goal'::regclass
+            UNION ALL
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = 'goals_goal'::regclass AND contype = 'f'
+            """
+        )
+        return set(cursor.fetchall())
+
+
+# загруженные строки остаются в индексах и после отката транзакции и меняют планы запросов в других тестах,
+# очистка таблиц после теста пересоздаёт индексы пустыми
+@pytest.mark.django_db(transaction=True)
+class TestGenerateData:
+    def test_rows_and_distributions(self):
+        """Создаётся заданное число строк, у каждой доски один владелец, доли статусов задаются параметром."""
+        call_command('generate_data', *SIZES, '--prefix', 'gen_', '--status-mix', 'done=1', '--due-date-share', '0')
+
+        assert Goal.objects.count() == 200
+        assert GoalComment.objects.count() == 500
+        owners = BoardParticipant.objects.filter(role=BoardParticipant.Role.owner)
+        assert owners.values('board').distinct().count() == owners.count() == Board.objects.count() == 5
+        assert set(Goal.objects.values_list('status', flat=True)) == {Goal.Status.done}
+        assert not Goal.objects.filter(due_date__isnull=False).exists()
+
+    def test_deterministic(self):
+        """С одинаковым seed данные совпадают."""
+        call_command('generate_data', *SIZES, '--prefix', 'a_', '--seed', '7')
+        call_command('generate_data', *SIZES, '--prefix', 'b_', '--seed', '7')
+
+        first, second = goals_of('a_'), goals_of('b_')
+        assert [goal[:3] + goal[4:] for goal in first] == [goal[:3] + goal[4:] for goal in second]
+        assert [goal[3].removeprefix('a_') for goal in first] == [goal[3].removeprefix('b_') for goal in second]
+
+    def test_indexes_kept_by_default(self, monkeypatch):
+        """Без --drop-indexes индексы и внешние ключи не снимаются, таблицы остаются доступны для чтения."""
+
+        def drop_indexes_and_foreign_keys(self):
+            pytest.fail('Indexes are dropped without --drop-indexes')
+
+        monkeypatch.setattr(DatasetGenerator, 'drop_indexes_and_foreign_keys', drop_indexes_and_foreign_keys)
+
+        call_command('generate_data', *SIZES, '--prefix', 'gen_')
+
+        assert Goal.objects.count() == 200
+
+    def test_drop_indexes(self):
+        """С --drop-indexes снятые индексы и внешние ключи создаются заново."""
+        before = table_definitions()
+        assert before
+
+        call_command('generate_data', *SIZES, '--prefix', 'gen_', '--drop-indexes')
+
+        assert Goal.objects.count() == 200
+        assert table_definitions() == before
+
+    def test_prefix_in_use(self):
+        """Повторная генерация с тем же префиксом запрещена."""
+        call_command('generate_data', '--preset', 'tiny', '--prefix', 'gen_')
+
+        with pytest.raises(CommandError, match='already exist'):
+            call_command('generate_data', '--preset', 'tiny', '--prefix', 'gen_')
+
+    @pytest.mark.parametrize(
+        'args',
+        [
+            ('--members-per-board', '0'),
+            ('--categories-per-board', '0'),
+            ('--status-mix', 'to_do=0,done=0'),
+            ('--priority-mix', 'low=0'),
+            ('--priority-mix', 'low=-1,medium=2'),
+        ],
+    )
+    def test_invalid_sizes(self, args):
+        """Доски без участников и категорий, а также смеси без положительных весов отклоняются до генерации."""
+        with pytest.raises(CommandError):
+            call_command('generate_data', '--preset', 'tiny', '--prefix', 'gen_', *args)
+
+        assert not Board.objects.exists()
@@ -0,0 +1,36 @@
+import pytest
+from django.db import connection
+
+from todolist.goals.models import Board, Goal, GoalCategory
+
+
+@pytest.mark.django_db()
+class TestLiveManagers:
+    def test_live_rows(self, board_factory, category_factory, goal_factory):
+        """live отбирает только неудалённые доски и категории и неархивные цели, objects - все строки."""
+        deleted_board = board_factory(is_deleted=True)
+        deleted_category = category_factory(is_deleted=True)
+        goals = [goal_factory(status=status) for status in Goal.Status.values]
+
+        assert deleted_board not in Board.live.all() and deleted_board in Board.objects.all()
+        assert deleted_category not in GoalCategory.live.all() and deleted_category in GoalCategory.objects.all()
+        assert list(Goal.live.order_by('pk')) == goals[:3]
+        assert Goal.objects.count() == 4
+
+    @pytest.mark.parametrize(
+        ('queryset', 'index'),
+        [
+            (lambda: Board.live.filter(pk=1), 'board_live_idx'),
+            (lambda: GoalCategory.live.filter(board_id=1), 'goal_category_board_live_idx'),
+            (lambda: Goal.live.filter(category_id=1), 'goal_category_live_idx'),
+            (lambda: Goal.live.filter(user_id=1).order_by('id'), 'goal_user_live_idx'),
+        ],
+    )
+    def test_partial_index_matches(self, queryset, index):
+        """Условие менеджера совпадает с условием частичного индекса, планировщик может его использовать."""
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_bitmapscan = off')
+            plan = queryset().explain()
+
+        assert index in plan
@@ -0,0 +1,126 @@
+import random
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal
+from todolist.goals.ranking import RANK_MAX_LENGTH, rank_between, spread_ranks
+
+
+def test_rank_between():
+    """Случайные вставки дают упорядоченные ключи без завершающего нуля."""
+    rng, keys = random.Random(0), []
+    for _ in range(500):
+        position = rng.randint(0, len(keys))
+        before = keys[position - 1] if position else ''
+        after = keys[position] if position < len(keys) else None
+        key = rank_between(before, after)
+        assert before < key and (after is None or key < after) and not key.endswith('0')
+        keys.insert(position, key)
+
+    assert spread_ranks(1000) == sorted(set(spread_ranks(1000)))
+    with pytest.raises(ValueError):
+        rank_between('V', 'V')
+
+
+@pytest.mark.django_db()
+class TestGoalReorder:
+    @pytest.fixture(autouse=True)
+    def setup(self, user, board_participant_factory, goal_factory):
+        participant = board_participant_factory(user=user)
+        self.goals = goal_factory.create_batch(3, user=user, category__board=participant.board)
+        self.category_id = self.goals[0].category_id
+        Goal.objects.filter(pk__in=[goal.pk for goal in self.goals[1:]]).update(category_id=self.category_id)
+
+    def ordered(self, auth_client) -> list[int]:
+        response = auth_client.get(reverse('todolist.goals:goal_list'), {'ordering': 'rank'})
+        return [goal['id'] for goal in response.json()]
+
+    def reorder(self, auth_client, goal: Goal, after: Goal | None):
+        url = reverse('todolist.goals:goal_reorder', args=[goal.pk])
+        return auth_client.post(url, {'after': after and after.pk}, format='json')
+
+    def test_reorder_updates_one_row(self, auth_client):
+        """Перемещение в начало и между соседями меняет ранг только у перемещаемой цели."""
+        first, second, third = sorted(self.goals, key=lambda goal: goal.pk)
+        Goal.objects.filter(pk=first.pk).update(rank='1')
+        Goal.objects.filter(pk=second.pk).update(rank='2')
+        Goal.objects.filter(pk=third.pk).update(rank='3')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.reorder(auth_client, third, None)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(updates) == 1
+        assert self.ordered(auth_client) == [third.pk, first.pk, second.pk]
+
+        self.reorder(auth_client, first, second)
+        assert self.ordered(auth_client) == [third.pk, second.pk, first.pk]
+
+    def test_reorder_equal_ranks(self, auth_client):
+        """Если между соседями нет места, категория перебалансируется."""
+        Goal.objects.update(rank='')
+        first, second, third = sorted(self.goals, key=lambda goal: goal.pk)
+
+        self.reorder(auth_client, third, first)
+
+        assert self.ordered(auth_client) == [first.pk, third.pk, second.pk]
+
+    def test_reorder_to_front_repeatedly(self, auth_client):
+        """Повторные перемещения в начало не удлиняют ранги сверх RANK_MAX_LENGTH: группа перебалансируется."""
+        order = self.ordered(auth_client)
+        for _ in range(100):
+            order.insert(0, order.pop())
+            response = self.reorder(auth_client, Goal.objects.get(pk=order[0]), None)
+            assert response.status_code == status.HTTP_200_OK
+
+        assert self.ordered(auth_client) == order
+        assert max(len(rank) for rank in Goal.objects.values_list('rank', flat=True)) <= RANK_MAX_LENGTH
+
+    def test_after_from_another_category(self, auth_client, user, goal_factory):
+        """Цель можно поставить только после цели из той же категории."""
+        other = goal_factory(user=user, category__board=self.goals[0].category.board)
+
+        response = self.reorder(auth_client, self.goals[0], other)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_new_goal_appended(self, auth_client):
+        """Новая цель добавляется в конец категории."""
+        call_command('rebalance_ranks', max_length=0, stdout=None)
+
+        response = auth_client.post(
+            reverse('todolist.goals:create_goal'), {'title': 'Last', 'category': self.category_id}
+        )
+
+        assert self.ordered(auth_client)[-1] == response.json()['id']
+
+    def test_rebalance_ranks(self, auth_client):
+        """Команда переписывает длинные ранги короткими, сохраняя порядок."""
+        long_ranks = ['1zzzzzzzzzzzzz1', '1zzzzzzzzzzzzz2', '2']
+        for goal, rank in zip(sorted(self.goals, key=lambda goal: goal.pk), long_ranks):
+            Goal.objects.filter(pk=goal.pk).update(rank=rank)
+        before = self.ordered(auth_client)
+
+        call_command('rebalance_ranks', stdout=None)
+
+        assert self.ordered(auth_client) == before
+        assert max(len(rank) for rank in Goal.objects.values_list('rank', flat=True)) == 1
+
+
+@pytest.mark.django_db()
+def test_category_reorder(auth_client, user, board_participant_factory, category_factory):
+    """Категории перемещаются внутри доски."""
+    board = board_participant_factory(user=user).board
+    first, second = category_factory.create_batch(2, user=user, board=board)
+
+    response = auth_client.post(reverse('todolist.goals:category_reorder', args=[second.pk]), {}, format='json')
+    categories = auth_client.get(reverse('todolist.goals:category_list'), {'board': board.pk, 'ordering': 'rank'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [category['id'] for category in categories.json()] == [second.pk, first.pk]
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from bot.models import GoalReminder, TgUser
+from todolist.db import routers
+from todolist.goals import retention
+from todolist.goals.models import ArchivedGoal, Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+@pytest.mark.django_db()
+class TestPurgeDeleted:
+    def test_purge(self, auth_client, user, board_participant_factory, goal_factory, goal_comment_factory):
+        """Доска, удалённая раньше срока хранения, удаляется со всем содержимым, недавно удалённая категория
+        и живые данные остаются."""
+        expired = board_participant_factory(user=user)
+        expired_goal = goal_factory(user=user, category__board=expired.board)
+        goal_comment_factory(goal=expired_goal, user=user)
+        tg_user = TgUser.objects.create(chat_id=1, user=user)
+        GoalReminder.objects.create(tg_user=tg_user, goal=expired_goal, kind='today', due_date='2026-10-19')
+        live = board_participant_factory(user=user)
+        recent_goal = goal_factory(user=user, category__board=live.board)
+        live_goal = goal_factory(user=user, category__board=live.board)
+        auth_client.delete(reverse('todolist.goals:board', args=[expired.board_id]))
+        auth_client.delete(reverse('todolist.goals:goal_category', args=[recent_goal.category_id]))
+        old = timezone.now() - timedelta(days=31)
+        Board.objects.filter(pk=expired.board_id).update(deleted=old)
+        GoalCategory.objects.filter(board=expired.board_id).update(deleted=old)
+
+        call_command('purge_deleted', days=30, batch_size=1, pause=0, stdout=None)
+        connection.check_constraints()
+
+        assert not Board.objects.filter(pk=expired.board_id).exists()
+        assert not BoardParticipant.objects.filter(board=expired.board_id).exists()
+        assert not GoalCategory.objects.filter(board=expired.board_id).exists()
+        assert not GoalComment.objects.exists()
+        assert not GoalReminder.objects.exists()
+        assert sorted(Goal.objects.values_list('pk', flat=True)) == [recent_goal.pk, live_goal.pk]
+        assert GoalCategory.objects.get(pk=recent_goal.category_id).deleted is not None
+
+    def test_purge_archive(self, goal_factory):
+        """Архивные цели удаляются через срок хранения после переноса в архив."""
+        goals = goal_factory.create_batch(2, status=Goal.Status.archived)
+        call_command('archive_goals', stdout=None)
+        ArchivedGoal.objects.filter(pk=goals[0].pk).update(archived=timezone.now() - timedelta(days=31))
+
+        deleted = retention.Purger(pause=0).purge(timezone.now() - timedelta(days=30))
+
+        assert deleted == {ArchivedGoal: 1}
+        assert list(ArchivedGoal.objects.values_list('pk', flat=True)) == [goals[1].pk]
+
+    def test_throttle_waits_for_replicas(self, monkeypatch):
+        """Пока отставание реплик больше допустимого, удаление приостанавливается."""
+        lags = iter([10.0, 3.0, 0.5])
+        sleeps = []
+        monkeypatch.setattr(retention.Purger, 'replica_lag', staticmethod(lambda: next(lags)))
+        monkeypatch.setattr(retention.time, 'sleep', sleeps.append)
+
+        retention.Purger(pause=0.1, max_replica_lag=2).throttle()
+
+        assert sleeps == [0.1, 1, 1]
+
+    def test_throttle_ignores_idle_replica(self, settings, monkeypatch):
+        """Простаивающая реплика, применившая весь WAL, не отстаёт, хотя последняя транзакция была давно."""
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def execute(self, sql):
+                pass
+
+            def fetchone(self):
+                return True, True, 3600.0
+
+        class Connection:
+            def cursor(self):
+                return Cursor()
+
+        settings.DATABASE_REPLICAS = ['replica_0']
+        monkeypatch.setattr(routers, 'connections', {'replica_0': Connection()})
+
+        def sleep(seconds):
+            pytest.fail('Purge waits for an idle replica')
+
+        monkeypatch.setattr(retention.time, 'sleep', sleep)
+
+        retention.Purger(pause=0, max_replica_lag=2).throttle()
+
+    def test_replica_lag_on_primary(self):
+        """Для primary запрос отставания возвращает ноль."""
+        assert routers.replica_lag('default') == 0.0
@@ -0,0 +1,67 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from todolist.goals.fast_serializers import (
+    board_values_serializer,
+    goal_category_values_serializer,
+    goal_values_serializer,
+    goal_comment_values_serializer,
+)
+from todolist.goals.models import Board, GoalCategory, Goal, GoalComment
+
+
+@pytest.mark.django_db()
+class TestValuesSerializer:
+    @pytest.fixture(autouse=True)
+    def setup(self, goal_factory, goal_category, user, board_participant_factory):
+        board_participant_factory.create(board=goal_category.board, user=user)
+        goal_factory.create(category=goal_category, user=user, description=None, due_date=None)
+        goal = goal_factory.create(
+            category=goal_category,
+            user=user,
+            description='Описание',
+            due_date=datetime.date(2030, 1, 2),
+            status=Goal.Status.in_progress,
+        )
+        GoalComment.objects.create(goal=goal, user=user, text='Комментарий')
+
+    @pytest.mark.parametrize(
+        'values_serializer, model',
+        [
+            (board_values_serializer, Board),
+            (goal_category_values_serializer, GoalCategory),
+            (goal_values_serializer, Goal),
+            (goal_comment_values_serializer, GoalComment),
+        ],
+        ids=['boards', 'categories', 'goals', 'comments'],
+    )
+    def test_output_matches_drf(self, values_serializer, model):
+        """Быстрый путь даёт побайтово тот же JSON, что и сериализатор DRF."""
+        queryset = model.objects.order_by('pk')
+        expected = values_serializer.serializer_class(queryset, many=True).data
+
+        data = values_serializer.serialize(values_serializer.values(queryset))
+
+        assert JSONRenderer().render(data) == JSONRenderer().render(expected)
+
+    def test_list_view_uses_values(self, auth_client, django_assert_num_queries):
+        """Список целей строится одним запросом без дочитывания пользователей."""
+        auth_client.get('/goals/goal/list')  # пользователь сессии попадает в кеш
+
+        with django_assert_num_queries(1):
+            response = auth_client.get('/goals/goal/list')
+
+        assert len(response.json()) == 2
+
+    def test_current_timezone_respected(self):
+        """Даты выводятся в текущей временной зоне, как и у DRF."""
+        queryset = Goal.objects.order_by('pk')
+        with timezone.override('Asia/Vladivostok'):
+            expected = goal_values_serializer.serializer_class(queryset, many=True).data
+            data = goal_values_serializer.serialize(goal_values_serializer.values(queryset))
+
+        assert data == expected
+        assert data[0]['created'].endswith('+10:00')
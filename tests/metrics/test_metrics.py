@@ -0,0 +1,124 @@
+import os
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.metrics.collectors import REGISTRY
+from todolist.metrics.registry import (
+    DEAD_SNAPSHOT,
+    Registry,
+    fold_snapshot,
+    merge,
+    read_snapshots,
+    render,
+    write_snapshot,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    REGISTRY.clear()
+
+
+def test_histogram_render():
+    """Гистограмма выводится с накопленными интервалами, суммой и количеством."""
+    registry = Registry()
+    histogram = registry.histogram('latency_seconds', 'Latency', ('view',), buckets=(0.1, 1))
+    histogram.observe(('goal_list',), 0.05)
+    histogram.observe(('goal_list',), 0.5)
+    histogram.observe(('goal_list',), 5)
+
+    text = render(registry.snapshot())
+
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{view="goal_list",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{view="goal_list",le="1"} 2' in text
+    assert 'latency_seconds_bucket{view="goal_list",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{view="goal_list"} 5.55' in text
+    assert 'latency_seconds_count{view="goal_list"} 3' in text
+
+
+def test_snapshots_merge(tmp_path):
+    """Метрики процессов из каталога складываются."""
+    registry = Registry()
+    counter = registry.counter('requests_total', 'Requests', ('view',))
+    counter.inc(('board',), 2)
+    write_snapshot(registry, str(tmp_path))
+
+    merged = merge([registry.snapshot(), *read_snapshots(str(tmp_path))])
+
+    assert 'requests_total{view="board"} 4' in render(merged)
+
+
+def test_fold_snapshot(tmp_path):
+    """Снимки завершившихся воркеров складываются в один файл, их собственные файлы удаляются."""
+    registry = Registry()
+    counter = registry.counter('requests_total', 'Requests', ('view',))
+    counter.inc(('board',), 2)
+    for _ in range(2):
+        write_snapshot(registry, str(tmp_path))
+        fold_snapshot(str(tmp_path), os.getpid())
+    fold_snapshot(str(tmp_path), 0)
+
+    assert [path.name for path in tmp_path.iterdir()] == [DEAD_SNAPSHOT]
+    assert 'requests_total{view="board"} 4' in render(merge(read_snapshots(str(tmp_path))))
+
+
+@pytest.mark.django_db()
+class TestMetricsEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.METRICS_TOKEN = 'secret'
+
+    def get_metrics(self, client) -> str:
+        return client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret').content.decode()
+
+    def test_request_metrics(self, auth_client, client):
+        """После запроса к списку целей /metrics содержит его длительность, число SQL запросов и размер ответа."""
+        auth_client.get(reverse('todolist.goals:goal_list'))
+
+        text = self.get_metrics(client)
+
+        assert 'todolist_http_requests_total{view="goal_list",method="GET",status="200"} 1' in text
+        assert 'todolist_http_request_duration_seconds_count{view="goal_list",method="GET"} 1' in text
+        assert 'todolist_http_db_queries_count{view="goal_list",method="GET"} 1' in text
+        assert 'todolist_http_db_queries_bucket{view="goal_list",method="GET",le="0"} 0' in text
+        assert 'todolist_http_response_size_bytes_count{view="goal_list",method="GET"} 1' in text
+
+    def test_sampling_disabled(self, settings, auth_client, client):
+        """Без выборки считаются только запросы и их длительность."""
+        settings.METRICS_SAMPLE_RATE = 0
+
+        auth_client.get(reverse('todolist.goals:goal_list'))
+        text = self.get_metrics(client)
+
+        assert 'todolist_http_request_duration_seconds_count{view="goal_list",method="GET"} 1' in text
+        assert 'todolist_http_db_queries_count{view="goal_list"' not in text
+
+    def test_token_required(self, client):
+        """При заданном METRICS_TOKEN метрики отдаются только с ним."""
+        assert client.get(reverse('metrics')).status_code == status.HTTP_403_FORBIDDEN
+        response = client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_closed_without_token(self, settings, client):
+        """Без METRICS_TOKEN метрики закрыты, кроме режима отладки."""
+        settings.METRICS_TOKEN = ''
+
+        assert client.get(reverse('metrics')).status_code == status.HTTP_403_FORBIDDEN
+        settings.DEBUG = True
+        assert client.get(reverse('metrics')).status_code == status.HTTP_200_OK
+
+    def test_execute_wrapper_stack(self, auth_client):
+        """Обёртка метрик, подключённая во время запроса, не мешает снять обёртку connection.execute_wrapper()."""
+
+        def wrapper(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        connection.execute_wrappers.clear()
+        with connection.execute_wrapper(wrapper):
+            auth_client.get(reverse('todolist.goals:goal_list'))
+
+        assert wrapper not in connection.execute_wrappers
@@ -0,0 +1,93 @@
+import pytest
+from django.core.signals import request_finished
+from django.db import close_old_connections, connection
+from django.http import HttpResponse
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal
+from todolist.slowlog.middleware import SlowQueryMiddleware
+from todolist.slowlog.models import SlowQuery
+
+
+@pytest.fixture()
+def slow_log(settings):
+    """Порог меньше длительности любого запроса, EXPLAIN для каждого запроса к API"""
+    settings.SLOW_QUERY_THRESHOLD_MS = 0.001
+    settings.SLOW_QUERY_EXPLAIN_RATE = 1
+    return settings
+
+
+@pytest.mark.django_db()
+class TestSlowQueryLog:
+    def test_disabled_by_default(self, auth_client):
+        """Без порога журнал не ведётся."""
+        auth_client.get(reverse('todolist.goals:goal_list'))
+
+        assert not SlowQuery.objects.exists()
+
+    def test_goal_list_logged_with_plan(self, slow_log, auth_client):
+        """Запросы списка целей попадают в журнал с вью, адресом и параметрами, самый долгий SELECT - с планом.
+        Значения параметров строки запроса и строковые параметры SQL скрыты."""
+        auth_client.get(reverse('todolist.goals:goal_list'), {'search': 'abc', 'limit': 5})
+
+        entries = SlowQuery.objects.filter(view='todolist.goals:goal_list')
+        assert entries.exists()
+        assert all(entry.method == 'GET' and entry.path.endswith('?search=***&limit=***') for entry in entries)
+        assert any('<str>' in (entry.params or []) for entry in entries)
+        assert not any('abc' in str(entry.params) for entry in entries)
+        explained = [entry for entry in entries if entry.plan]
+        assert len(explained) == 1
+        assert 'actual time' in explained[0].plan
+        assert explained[0].sql.lstrip().upper().startswith('SELECT')
+
+    def test_recorded_after_response(self, slow_log, rf):
+        """Журнал и EXPLAIN пишутся при закрытии ответа, а не до его возврата."""
+
+        def view(request):
+            list(Goal.objects.all())
+            return HttpResponse()
+
+        response = SlowQueryMiddleware(view)(rf.get('/goals/goal/list'))
+
+        assert not SlowQuery.objects.exists()
+        # close_old_connections закрыл бы соединение с транзакцией теста
+        request_finished.disconnect(close_old_connections)
+        try:
+            response.close()
+        finally:
+            request_finished.connect(close_old_connections)
+        assert SlowQuery.objects.filter(path='/goals/goal/list').exists()
+
+    def test_ring_buffer(self, slow_log, auth_client):
+        """Хранятся только последние SLOW_QUERY_LOG_SIZE записей."""
+        slow_log.SLOW_QUERY_LOG_SIZE = 3
+        for _ in range(3):
+            auth_client.get(reverse('todolist.goals:goal_list'))
+
+        assert SlowQuery.objects.count() == 3
+
+    def test_execute_wrapper_stack(self, slow_log, auth_client):
+        """Обёртка журнала, подключённая во время запроса, не мешает снять обёртку connection.execute_wrapper()."""
+
+        def wrapper(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        connection.execute_wrappers.clear()
+        with connection.execute_wrapper(wrapper):
+            auth_client.get(reverse('todolist.goals:goal_list'))
+
+        assert wrapper not in connection.execute_wrappers
+
+    def test_admin(self, client, user_factory):
+        """Журнал доступен персоналу в админке только для просмотра."""
+        entry = SlowQuery.objects.create(duration_ms=150, database='default', sql='SELECT 1', plan='Result')
+        client.force_login(user_factory(is_staff=True, is_superuser=True))
+
+        changelist = client.get(reverse('admin:slowlog_slowquery_changelist'))
+        detail = client.get(reverse('admin:slowlog_slowquery_change', args=[entry.pk]))
+
+        assert changelist.status_code == status.HTTP_200_OK
+        assert detail.status_code == status.HTTP_200_OK
+        assert '<pre>Result</pre>' in detail.content.decode()
+        assert client.get(reverse('admin:slowlog_slowquery_add')).status_code == status.HTTP_403_FORBIDDEN
@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+# Под ASGI списки и детальный просмотр досок и поток событий обслуживаются асинхронными вью, например:
+# GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn todolist.asgi:application
+# (сервис events в deploy/docker-compose.yaml)
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -0,0 +1,342 @@
+import datetime
+import io
+import itertools
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from core.models import User
+from todolist.goals.events import suppress_events
+from todolist.goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
+from todolist.goals.ranking import spread_rank
+
+MODELS = (User, Board, BoardParticipant, GoalCategory, Goal, GoalComment)
+USERNAME_PREFIX = 'bench_'
+PASSWORD = 'Benchmark-password-1'
+# строк в одной команде COPY
+COPY_BATCH_SIZE = 50_000
+# выборка целей для комментариев делается пачками, чтобы не держать в памяти все номера сразу
+CHOICES_BATCH_SIZE = 50_000
+
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+STATUS_MIX = {
+    Goal.Status.to_do: 40,
+    Goal.Status.in_progress: 30,
+    Goal.Status.done: 20,
+    Goal.Status.archived: 10,
+}
+PRIORITY_MIX = {
+    Goal.Priority.low: 20,
+    Goal.Priority.medium: 50,
+    Goal.Priority.hight: 20,
+    Goal.Priority.critical: 10,
+}
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Размер и распределения набора данных.
+
+    Число участников и категорий доски равномерно от 1 до удвоенного среднего. Владельцы и участники досок,
+    категории для целей и цели для комментариев выбираются по закону Ципфа с показателями *_skew: немногие
+    пользователи состоят в большинстве досок, немногие цели собирают большинство комментариев.
+    Даты создания равномерно распределены по последним days дням и растут вместе с id"""
+
+    users: int
+    boards: int
+    goals: int
+    comments: int
+    members_per_board: int = 3
+    categories_per_board: int = 5
+    membership_skew: float = 1.1
+    goal_skew: float = 1.1
+    comment_skew: float = 1.1
+    status_mix: dict[int, float] = field(default_factory=lambda: dict(STATUS_MIX))
+    priority_mix: dict[int, float] = field(default_factory=lambda: dict(PRIORITY_MIX))
+    due_date_share: float = 0.5
+    days: int = 365
+    username_prefix: str = USERNAME_PREFIX
+
+
+PRESETS = {
+    'tiny': DatasetSpec(users=20, boards=10, goals=500, comments=1000),
+    'small': DatasetSpec(users=1000, boards=2000, goals=100_000, comments=500_000),
+    'large': DatasetSpec(users=10_000, boards=5000, goals=1_000_000, comments=5_000_000),
+}
+
+
+def dataset_exists(username_prefix: str = USERNAME_PREFIX) -> bool:
+    return User.objects.filter(username__startswith=username_prefix).exists()
+
+
+def zipf_weights(size: int, skew: float) -> list[float]:
+    """Накопленные веса для random.choices: вес i-го элемента 1 / (i + 1) ** skew"""
+    return list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(size)))
+
+
+def seed_dataset(
+    spec: DatasetSpec,
+    seed: int = 0,
+    log: Callable[[str], None] = lambda message: None,
+    drop_indexes: bool = False,
+) -> dict:
+    """Создаёт набор данных командами COPY в одной транзакции, возвращает число строк по моделям.
+    При одинаковом seed совпадает всё, кроме значений id и дат, которые отсчитываются от текущего момента"""
+    return DatasetGenerator(spec, seed, log, drop_indexes).run()
+
+
+class DatasetGenerator:
+    """Загрузка набора данных. Таблицы заблокированы для записи до конца транзакции, чтение не блокируется.
+
+    С drop_indexes на время загрузки с таблиц снимаются внешние ключи и индексы, кроме первичных и уникальных,
+    и создаются заново в конце: построение индекса и проверка ключа одним запросом быстрее обновления их
+    на каждую строку. Таблицы при этом заблокированы и для чтения, поэтому только для базы без нагрузки"""
+
+    def __init__(self, spec: DatasetSpec, seed: int, log: Callable[[str], None], drop_indexes: bool = False):
+        self.spec = spec
+        self.drop_indexes = drop_indexes
+        self.rng = random.Random(seed)
+        self.log = log
+        self.now = timezone.now()
+        self.rows: dict[str, int] = {}
+
+    def run(self) -> dict:
+        with transaction.atomic(), connection.cursor() as cursor:
+            self.cursor = cursor
+            cursor.execute("SET LOCAL maintenance_work_mem = '256MB'")
+            # без уведомления на каждую загруженную строку
+            suppress_events()
+            restore = self.drop_indexes_and_foreign_keys() if self.drop_indexes else []
+            self.generate()
+            if restore:
+                started = time.perf_counter()
+                for sql in restore:
+                    cursor.execute(sql)
+                self.log(f'Indexes and foreign keys: {len(restore)} in {time.perf_counter() - started:.1f} s')
+
+        # статистика планировщика для только что загруженных таблиц
+        with connection.cursor() as cursor:
+            for model in MODELS:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        return self.rows
+
+    def generate(self) -> None:
+        spec, rng = self.spec, self.rng
+
+        # соль фиксирована, чтобы хеш пароля не зависел от запуска
+        password = copy_text(make_password(PASSWORD, salt='benchmarkdataset'))
+        prefix = copy_text(spec.username_prefix)
+        user_ids = self.copy(
+            User,
+            spec.users,
+            ('username', 'password', 'date_joined'),
+            (f'{prefix}{i}\t{password}\t{created}' for i, created in self.timeline(spec.users)),
+        )
+        board_ids = self.copy(
+            Board,
+            spec.boards,
+            ('title', 'created', 'updated'),
+            (f'Board {i}\t{created}\t{created}' for i, created in self.timeline(spec.boards)),
+        )
+
+        user_weights = zipf_weights(len(user_ids), spec.membership_skew)
+        members = []
+        for board_id in board_ids:
+            size = rng.randint(1, 2 * spec.members_per_board - 1)
+            for index, user_id in enumerate(dict.fromkeys(rng.choices(user_ids, cum_weights=user_weights, k=size))):
+                role = BoardParticipant.Role.owner if index == 0 else rng.choice(BoardParticipant.editable_roles)[0]
+                members.append((board_id, user_id, int(role)))
+        board_owner = {board_id: user_id for board_id, user_id, role in members if role == BoardParticipant.Role.owner}
+        self.copy(
+            BoardParticipant,
+            len(members),
+            ('board_id', 'user_id', 'role', 'created', 'updated'),
+            (
+                '{}\t{}\t{}\t{created}\t{created}'.format(*members[i], created=created)
+                for i, created in self.timeline(len(members))
+            ),
+        )
+
+        category_boards = [
+            board_id for board_id in board_ids for _ in range(rng.randint(1, 2 * spec.categories_per_board - 1))
+        ]
+        category_ranks = ranks(category_boards)
+        category_ids = self.copy(
+            GoalCategory,
+            len(category_boards),
+            ('board_id', 'user_id', 'title', 'rank', 'created', 'updated'),
+            (
+                f'{category_boards[i]}\t{board_owner[category_boards[i]]}\tCategory {i}\t{next(category_ranks)}\t'
+                f'{created}\t{created}'
+                for i, created in self.timeline(len(category_boards))
+            ),
+        )
+        category_owner = dict(zip(category_ids, (board_owner[board_id] for board_id in category_boards)))
+
+        today = timezone.localdate()
+        due_dates = [(today + datetime.timedelta(days=days)).isoformat() for days in range(-60, 61)]
+        goal_categories = list(self.skewed(category_ids, spec.goal_skew, spec.goals))
+        goal_ranks = ranks(goal_categories)
+        goal_categories = iter(goal_categories)
+        statuses = self.mixed(spec.status_mix, spec.goals)
+        priorities = self.mixed(spec.priority_mix, spec.goals)
+        goal_users = []
+
+        def goals() -> Iterable[str]:
+            for i, created in self.timeline(spec.goals):
+                category_id = next(goal_categories)
+                user_id = category_owner[category_id]
+                goal_users.append(user_id)
+                due_date = rng.choice(due_dates) if rng.random() < spec.due_date_share else '\\N'
+                yield (
+                    f'Benchmark goal {i}\tDescription of benchmark goal {i}\t{category_id}\t{user_id}\t'
+                    f'{next(statuses)}\t{next(priorities)}\t{due_date}\t{next(goal_ranks)}\t{created}\t{created}'
+                )
+
+        goal_ids = self.copy(
+            Goal,
+            spec.goals,
+            (
+                'title',
+                'description',
+                'category_id',
+                'user_id',
+                'status',
+                'priority',
+                'due_date',
+                'rank',
+                'created',
+                'updated',
+            ),
+            goals(),
+        )
+
+        comment_goals = self.skewed(range(len(goal_ids)), spec.comment_skew, spec.comments)
+        self.copy(
+            GoalComment,
+            spec.comments,
+            ('goal_id', 'user_id', 'text', 'created', 'updated'),
+            (
+                f'{goal_ids[index]}\t{goal_users[index]}\tBenchmark comment {i}\t{created}\t{created}'
+                for (i, created), index in zip(self.timeline(spec.comments), comment_goals)
+            ),
+        )
+
+    def timeline(self, total: int) -> Iterable[tuple[int, str]]:
+        """Номера строк с датами создания, равномерно растущими за последние spec.days дней"""
+        start = self.now - datetime.timedelta(days=self.spec.days)
+        step = datetime.timedelta(days=self.spec.days) / max(total, 1)
+        for i in range(total):
+            yield i, (start + step * i).isoformat()
+
+    def skewed(self, population: Iterable, skew: float, total: int) -> Iterator:
+        """total элементов population по закону Ципфа, порядок рангов перемешан"""
+        population = list(population)
+        self.rng.shuffle(population)
+        return self.choices(population, zipf_weights(len(population), skew), total)
+
+    def mixed(self, mix: dict[int, float], total: int) -> Iterator:
+        """total значений с долями из mix"""
+        return self.choices([int(value) for value in mix], list(itertools.accumulate(mix.values())), total)
+
+    def choices(self, population: list, cum_weights: list[float], total: int) -> Iterator:
+        for start in range(0, total, CHOICES_BATCH_SIZE):
+            yield from self.rng.choices(population, cum_weights=cum_weights, k=min(CHOICES_BATCH_SIZE, total - start))
+
+    def drop_indexes_and_foreign_keys(self) -> list[str]:
+        """Удаляет внешние ключи и индексы, не связанные с ограничениями, возвращает команды их восстановления"""
+        tables = [model._meta.db_table for model in MODELS]
+        self.cursor.execute(
+            """
+            SELECT 'ALTER TABLE ' || conrelid::regclass || ' DROP CONSTRAINT ' || quote_ident(conname),
+                'ALTER TABLE ' || conrelid::regclass || ' ADD CONSTRAINT ' || quote_ident(conname) || ' '
+                    || pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = ANY(%s::regclass[])
+            """,
+            [tables],
+        )
+        foreign_keys = self.cursor.fetchall()
+        self.cursor.execute(
+            """
+            SELECT 'DROP INDEX ' || indexrelid::regclass, pg_get_indexdef(indexrelid)
+            FROM pg_index
+            WHERE indrelid = ANY(%s::regclass[])
+                AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = indexrelid AND contype IN ('p', 'u', 'x'))
+            """,
+            [tables],
+        )
+        indexes = self.cursor.fetchall()
+        for drop, _ in foreign_keys + indexes:
+            self.cursor.execute(drop)
+        return [create for _, create in indexes + foreign_keys]
+
+    def reserve_ids(self, model: type[models.Model], count: int) -> range:
+        """Занимает count подряд идущих значений последовательности id. Таблица заблокирована для записи до конца
+        транзакции, поэтому параллельные вставки не получат номера из этого диапазона"""
+        table = model._meta.db_table
+        self.cursor.execute(f'LOCK TABLE {connection.ops.quote_name(table)} IN EXCLUSIVE MODE')
+        self.cursor.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id'))", [table])
+        first = self.cursor.fetchone()[0]
+        self.cursor.execute("SELECT setval(pg_get_serial_sequence(%s, 'id'), %s)", [table, first + count - 1])
+        return range(first, first + count)
+
+    def copy(self, model: type[models.Model], count: int, columns: tuple[str, ...], rows: Iterable[str]) -> range:
+        """Загружает count строк командой COPY, id назначаются подряд. Строки rows - значения полей columns
+        в текстовом формате COPY через табуляцию. Остальные поля модели заполняются значениями по умолчанию"""
+        started = time.perf_counter()
+        fields = {field.attname: field for field in model._meta.concrete_fields if not field.primary_key}
+        defaults = [field for attname, field in fields.items() if attname not in columns]
+        suffix = ''.join('\t' + copy_text(field.get_default()) for field in defaults)
+        sql = 'COPY {} ({}) FROM STDIN'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(
+                connection.ops.quote_name(field.column)
+                for field in [model._meta.pk, *(fields[attname] for attname in columns), *defaults]
+            ),
+        )
+
+        ids = self.reserve_ids(model, count) if count else range(0)
+        buffer = io.StringIO()
+        for pk, row in zip(ids, rows):
+            buffer.write(f'{pk}\t{row}{suffix}\n')
+            if (pk - ids.start + 1) % COPY_BATCH_SIZE == 0:
+                self.flush(sql, buffer)
+                buffer = io.StringIO()
+        self.flush(sql, buffer)
+
+        self.rows[model.__name__] = count
+        self.log(f'{model.__name__}: {count} rows in {time.perf_counter() - started:.1f} s')
+        return ids
+
+    def flush(self, sql: str, buffer: io.StringIO) -> None:
+        buffer.seek(0)
+        self.cursor.cursor.copy_expert(sql, buffer)
+
+
+def ranks(scopes: list) -> Iterator[str]:
+    """Ранги ручной сортировки для строк с группами scopes в порядке следования внутри каждой группы"""
+    counts, positions = Counter(scopes), Counter()
+    for scope in scopes:
+        yield spread_rank(positions[scope], counts[scope])
+        positions[scope] += 1
+
+
+def copy_text(value: Any) -> str:
+    """Значение в текстовом формате COPY"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
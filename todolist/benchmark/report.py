@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Regression:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        return f'{self.scenario}: {self.metric} {self.baseline} -> {self.current}'
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float) -> list[Regression]:
+    """Сценарии, у которых p95 вырос больше чем на threshold (доля) и больше чем на min_delta_ms,
+    или выросло число SQL запросов. Сценарии, которых нет в одном из результатов, не сравниваются"""
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        delta = result['p95_ms'] - base['p95_ms']
+        if delta > base['p95_ms'] * threshold and delta > min_delta_ms:
+            regressions.append(Regression(name, 'p95_ms', base['p95_ms'], result['p95_ms']))
+        if result['queries'] > base['queries']:
+            regressions.append(Regression(name, 'queries', base['queries'], result['queries']))
+    return regressions
@@ -0,0 +1,125 @@
+import json
+import math
+import statistics
+import time
+from contextlib import ExitStack
+from dataclasses import replace
+from urllib.parse import urlencode
+
+from django.contrib.auth.hashers import make_password
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, connections, transaction
+from django.test import RequestFactory
+from django.urls import reverse
+
+from core.models import User
+from core.tokens import issue_tokens
+from todolist.benchmark.dataset import PASSWORD
+from todolist.benchmark.scenarios import FRESH, HEAVY, Persona, Scenario
+
+HOST = 'benchmark.local'
+
+
+class QueryCounter:
+    """Считает SQL запросы во всех базах, выполненные внутри блока"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> 'QueryCounter':
+        self.count = 0
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+
+class Runner:
+    """Выполняет сценарии через WSGIHandler, как сервер приложений. Каждый запрос выполняется в транзакции,
+    которая затем откатывается, поэтому изменяющие запросы не меняют набор данных"""
+
+    def __init__(self, personas: dict[str, Persona]):
+        self.handler = WSGIHandler()
+        self.factory = RequestFactory()
+        self.personas = {name: self.with_tokens(persona) for name, persona in personas.items()}
+        self.password_hash = make_password(PASSWORD)
+
+    @staticmethod
+    def with_tokens(persona: Persona) -> Persona:
+        tokens = issue_tokens(persona.user)
+        return replace(persona, access=tokens['access'], refresh=tokens['refresh'])
+
+    def run(self, scenario: Scenario, requests: int, warmup: int) -> dict:
+        if scenario.max_requests:
+            requests = min(requests, scenario.max_requests)
+        latencies, queries = [], []
+        # Соединение не должно закрываться между запросами внутри транзакции
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            for iteration in range(warmup + requests):
+                latency, query_count = self.request(scenario)
+                if iteration >= warmup:
+                    latencies.append(latency)
+                    queries.append(query_count)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+        return summary(latencies, queries)
+
+    def request(self, scenario: Scenario) -> tuple[float, int]:
+        with transaction.atomic():
+            persona = self.persona(scenario.persona)
+            environ = self.environ(scenario, persona)
+            status = []
+            with QueryCounter() as counter:
+                started = time.perf_counter()
+                response = self.handler(environ, lambda code, headers: status.append(code))
+                body = b''.join(response)
+                response.close()
+                latency = time.perf_counter() - started
+            transaction.set_rollback(True)
+        if int(status[0].split()[0]) != scenario.status:
+            raise RuntimeError(f'{scenario.name}: {status[0]} instead of {scenario.status}: {body[:500]!r}')
+        return latency, counter.count
+
+    def persona(self, name: str) -> Persona:
+        if name != FRESH:
+            return self.personas[name]
+        user = User.objects.create(username='benchmark_fresh', password=self.password_hash)
+        return self.with_tokens(replace(self.personas[HEAVY], user=user))
+
+    def environ(self, scenario: Scenario, persona: Persona) -> dict:
+        path = reverse(scenario.url_name, kwargs=scenario.url_kwargs(persona) if scenario.url_kwargs else None)
+        if scenario.query:
+            path += '?' + urlencode(scenario.query(persona))
+        extra = {'SERVER_NAME': HOST}
+        if scenario.authenticated:
+            extra['HTTP_AUTHORIZATION'] = f'Bearer {persona.access}'
+        data = json.dumps(scenario.data(persona)) if scenario.data else ''
+        request = self.factory.generic(scenario.method, path, data, content_type='application/json', **extra)
+        return request.environ
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Перцентиль методом ближайшего ранга"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summary(latencies: list[float], queries: list[int]) -> dict:
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'queries': max(queries),
+    }
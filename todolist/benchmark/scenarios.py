@@ -0,0 +1,228 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from django.db.models import Count, Q
+
+from core.models import User
+from todolist.benchmark.dataset import PASSWORD, USERNAME_PREFIX
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalComment
+
+HEAVY = 'heavy'
+TYPICAL = 'typical'
+# пользователь, создаваемый для каждого запроса: смена пароля и отзыв токенов не должны затрагивать остальных
+FRESH = 'fresh'
+
+
+@dataclass
+class Persona:
+    """Пользователь набора данных и объекты на самой большой из его досок, к которым обращаются сценарии"""
+
+    user: User
+    board_id: int
+    category_id: int
+    goal_id: int
+    comment_id: int | None
+    participants: list[dict] = field(default_factory=list)
+    access: str = ''
+    refresh: str = ''
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Запрос к одному адресу API. Функции url_kwargs, query и data получают Persona, от имени которой
+    он выполняется. Без authenticated запрос отправляется без токена"""
+
+    name: str
+    url_name: str
+    method: str = 'GET'
+    url_kwargs: Callable[[Persona], dict] | None = None
+    query: Callable[[Persona], dict] | None = None
+    data: Callable[[Persona], dict] | None = None
+    persona: str = HEAVY
+    authenticated: bool = True
+    status: int = 200
+    # запросы с хешированием пароля выполняются дольше остальных на порядки
+    max_requests: int | None = None
+
+
+def find_personas() -> dict[str, Persona]:
+    """Самый активный пользователь набора данных и пользователь с медианным числом досок"""
+    owners = (
+        User.objects.filter(username__startswith=USERNAME_PREFIX)
+        .annotate(
+            boards=Count('participants'),
+            owned=Count('participants', filter=Q(participants__role=BoardParticipant.Role.owner)),
+        )
+        .filter(owned__gt=0)
+        .order_by('-boards', 'pk')
+    )
+    users = list(owners)
+    if not users:
+        raise LookupError('Benchmark dataset not found, run with --seed')
+    return {HEAVY: _persona(users[0]), TYPICAL: _persona(users[len(users) // 2])}
+
+
+def _persona(user: User) -> Persona:
+    goal = (
+        Goal.live.filter(
+            category__board__participants__user=user,
+            category__board__participants__role=BoardParticipant.Role.owner,
+            category__board__is_deleted=False,
+        )
+        .annotate(comments_count=Count('comments'))
+        .order_by('-comments_count', 'pk')
+        .select_related('category')
+        .first()
+    )
+    if goal is None:
+        raise LookupError(f'User {user.username} has no goals on owned boards')
+    board = Board.objects.get(pk=goal.category.board_id)
+    return Persona(
+        user=user,
+        board_id=board.pk,
+        category_id=goal.category_id,
+        goal_id=goal.pk,
+        comment_id=GoalComment.objects.filter(goal=goal).order_by('pk').values_list('pk', flat=True).first(),
+        participants=[
+            {'user': participant.user.username, 'role': participant.role}
+            for participant in board.participants.select_related('user').exclude(user=user)
+        ],
+    )
+
+
+def _board(persona: Persona) -> dict[str, Any]:
+    return {'pk': persona.board_id}
+
+
+def _category(persona: Persona) -> dict[str, Any]:
+    return {'pk': persona.category_id}
+
+
+def _goal(persona: Persona) -> dict[str, Any]:
+    return {'pk': persona.goal_id}
+
+
+def _comment(persona: Persona) -> dict[str, Any]:
+    return {'pk': persona.comment_id}
+
+
+def _page(persona: Persona) -> dict[str, Any]:
+    return {'limit': 50}
+
+
+SCENARIOS = [
+    # todolist/goals/urls.py
+    Scenario('board create', 'todolist.goals:create-board', 'POST', data=lambda p: {'title': 'Benchmark'}, status=201),
+    Scenario('board list', 'todolist.goals:board-list'),
+    Scenario('board list typical', 'todolist.goals:board-list', persona=TYPICAL),
+    Scenario('board', 'todolist.goals:board', url_kwargs=_board),
+    Scenario(
+        'board update',
+        'todolist.goals:board',
+        'PUT',
+        url_kwargs=_board,
+        data=lambda p: {'title': 'Benchmark', 'participants': p.participants},
+    ),
+    Scenario('board delete', 'todolist.goals:board', 'DELETE', url_kwargs=_board, status=204),
+    Scenario(
+        'board clone',
+        'todolist.goals:board_clone',
+        'POST',
+        url_kwargs=_board,
+        data=lambda p: {'goals': True, 'participants': True, 'comments': True},
+        status=201,
+    ),
+    Scenario(
+        'category create',
+        'todolist.goals:create_category',
+        'POST',
+        data=lambda p: {'title': 'Benchmark', 'board': p.board_id},
+        status=201,
+    ),
+    Scenario('category list', 'todolist.goals:category_list', query=_page),
+    Scenario('category list board', 'todolist.goals:category_list', query=lambda p: {'limit': 50, 'board': p.board_id}),
+    Scenario('category', 'todolist.goals:goal_category', url_kwargs=_category),
+    Scenario(
+        'category update', 'todolist.goals:goal_category', 'PATCH', url_kwargs=_category, data=lambda p: {'title': 'B'}
+    ),
+    Scenario('category reorder', 'todolist.goals:category_reorder', 'POST', url_kwargs=_category, data=lambda p: {}),
+    Scenario('category delete', 'todolist.goals:goal_category', 'DELETE', url_kwargs=_category, status=204),
+    Scenario(
+        'goal create',
+        'todolist.goals:create_goal',
+        'POST',
+        data=lambda p: {'title': 'Benchmark', 'category': p.category_id},
+        status=201,
+    ),
+    Scenario('goal list', 'todolist.goals:goal_list', query=_page),
+    Scenario('goal list typical', 'todolist.goals:goal_list', query=_page, persona=TYPICAL),
+    Scenario(
+        'goal list search',
+        'todolist.goals:goal_list',
+        query=lambda p: {
+            'limit': 50,
+            'search': 'goal 1',
+            'status__in': '1,2',
+            'priority__in': '3,4',
+            'ordering': '-created',
+        },
+    ),
+    Scenario('goal list offset', 'todolist.goals:goal_list', query=lambda p: {'limit': 50, 'offset': 5000}),
+    Scenario('goal', 'todolist.goals:goal', url_kwargs=_goal),
+    Scenario('goal update', 'todolist.goals:goal', 'PATCH', url_kwargs=_goal, data=lambda p: {'title': 'Benchmark'}),
+    Scenario('goal reorder', 'todolist.goals:goal_reorder', 'POST', url_kwargs=_goal, data=lambda p: {}),
+    Scenario('goal delete', 'todolist.goals:goal', 'DELETE', url_kwargs=_goal, status=204),
+    Scenario(
+        'comment create',
+        'todolist.goals:create_comment',
+        'POST',
+        data=lambda p: {'goal': p.goal_id, 'text': 'Benchmark'},
+        status=201,
+    ),
+    Scenario('comment list', 'todolist.goals:comments_list', query=_page),
+    Scenario('comment list goal', 'todolist.goals:comments_list', query=lambda p: {'limit': 50, 'goal': p.goal_id}),
+    Scenario('comment', 'todolist.goals:comment', url_kwargs=_comment),
+    Scenario('comment update', 'todolist.goals:comment', 'PATCH', url_kwargs=_comment, data=lambda p: {'text': 'B'}),
+    Scenario('comment delete', 'todolist.goals:comment', 'DELETE', url_kwargs=_comment, status=204),
+    # поток закрывается сразу: измеряется подписка без ожидания событий
+    Scenario('events', 'todolist.goals:events', query=lambda p: {'timeout': 0}),
+    # core/urls.py
+    Scenario(
+        'signup',
+        'core:signup',
+        'POST',
+        data=lambda p: {'username': 'benchmark_signup', 'password': PASSWORD, 'password_repeat': PASSWORD},
+        authenticated=False,
+        status=201,
+        max_requests=20,
+    ),
+    Scenario(
+        'login',
+        'core:login',
+        'POST',
+        data=lambda p: {'username': p.user.username, 'password': PASSWORD},
+        authenticated=False,
+        max_requests=20,
+    ),
+    Scenario('profile', 'core:profile'),
+    Scenario('profile update', 'core:profile', 'PATCH', data=lambda p: {'first_name': 'Benchmark'}),
+    Scenario('profile delete', 'core:profile', 'DELETE', status=204),
+    Scenario(
+        'update password',
+        'core:update_password',
+        'PUT',
+        data=lambda p: {'old_password': PASSWORD, 'new_password': 'Benchmark-password-2'},
+        persona=FRESH,
+        max_requests=20,
+    ),
+    Scenario(
+        'token',
+        'core:token',
+        'POST',
+        data=lambda p: {'username': p.user.username, 'password': PASSWORD},
+        authenticated=False,
+        max_requests=20,
+    ),
+    Scenario('token refresh', 'core:token_refresh', 'POST', data=lambda p: {'refresh': p.refresh}, authenticated=False),
+    Scenario('token revoke', 'core:token_revoke', 'POST', persona=FRESH, status=204),
+]
@@ -0,0 +1,65 @@
+import os
+import threading
+
+from django.db.backends.postgresql import base
+
+from todolist.db.backends.postgresql_pool.creation import DatabaseCreation
+from todolist.db.pool import ConnectionPool
+
+_pools: dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pools() -> dict[tuple, ConnectionPool]:
+    return dict(_pools)
+
+
+def close_pools() -> None:
+    """Закрывает свободные соединения всех пулов процесса"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _forget_pools_after_fork() -> None:
+    # Соединения родителя нельзя ни использовать, ни закрывать в дочернем процессе
+    _pools.clear()
+
+
+os.register_at_fork(after_in_child=_forget_pools_after_fork)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Бэкенд PostgreSQL, берущий соединения из общего для процесса пула и возвращающий их туда вместо закрытия.
+
+    Настройки пула задаются ключом POOL в DATABASES: MIN_SIZE, MAX_SIZE, TIMEOUT, MAX_LIFETIME, MAX_IDLE,
+    CHECK_INTERVAL. За pgbouncer в режиме transaction нужно включить DISABLE_SERVER_SIDE_CURSORS"""
+
+    creation_class = DatabaseCreation
+
+    def get_new_connection(self, conn_params: dict):
+        self.pool = self.get_pool(conn_params)
+        return self.pool.getconn()
+
+    def get_pool(self, conn_params: dict) -> ConnectionPool:
+        key = (self.alias, tuple(sorted((name, str(value)) for name, value in conn_params.items())))
+        with _pools_lock:
+            if key not in _pools:
+                options = self.settings_dict.get('POOL', {})
+                _pools[key] = ConnectionPool(
+                    connect=lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                    min_size=options.get('MIN_SIZE', 1),
+                    max_size=options.get('MAX_SIZE', 10),
+                    timeout=options.get('TIMEOUT', 10),
+                    max_lifetime=options.get('MAX_LIFETIME', 30 * 60),
+                    max_idle=options.get('MAX_IDLE', 10 * 60),
+                    check_interval=options.get('CHECK_INTERVAL', 30),
+                )
+            return _pools[key]
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,11 @@
+from django.db.backends.postgresql import creation
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """Перед удалением тестовой базы закрывает соединения пула, иначе DROP DATABASE не выполнится"""
+
+    def _destroy_test_db(self, test_database_name: str, verbosity: int) -> None:
+        from todolist.db.backends.postgresql_pool.base import close_pools
+
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,68 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from todolist.db.routers import replica_reads_allowed
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Подписанная cookie с временем последнего изменения. Закрепление хранится у клиента, а не в кеше процесса,
+# поэтому видно всем воркерам и серверам и не требует обращения к кешу на каждый запрос
+PIN_COOKIE_NAME = 'primary_pin'
+
+
+class ReplicaRoutingMiddleware:
+    """Разрешает чтение из реплик для GET запросов. После успешного изменяющего запроса клиент
+    на REPLICA_STICKY_SECONDS секунд читает только из основной базы"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = replica_reads_allowed.set(self.replica_allowed(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads_allowed.reset(token)
+        self.pin(request, response)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        token = replica_reads_allowed.set(self.replica_allowed(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_reads_allowed.reset(token)
+        self.pin(request, response)
+        return response
+
+    @staticmethod
+    def replica_allowed(request: HttpRequest) -> bool:
+        if request.method not in SAFE_METHODS:
+            return False
+        pinned = request.get_signed_cookie(PIN_COOKIE_NAME, default=None, max_age=settings.REPLICA_STICKY_SECONDS)
+        return pinned is None
+
+    @staticmethod
+    def pin(request: HttpRequest, response: HttpResponse) -> None:
+        """Закрепляет клиента за основной базой, если запрос что-то изменил"""
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+        response.set_signed_cookie(
+            PIN_COOKIE_NAME,
+            str(int(time.time())),
+            max_age=settings.REPLICA_STICKY_SECONDS,
+            secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True,
+            samesite='Lax',
+        )
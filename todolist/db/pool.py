@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_STATUS_IDLE = 0  # psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+class PoolTimeout(Exception):
+    """Не удалось получить соединение из пула за отведённое время"""
+
+
+class ConnectionPool:
+    """Потокобезопасный пул DB-API соединений.
+
+    Соединение, пролежавшее в пуле дольше check_interval секунд, перед выдачей проверяется запросом SELECT 1,
+    соединения старше max_lifetime секунд закрываются. Свободные соединения сверх min_size закрываются после
+    max_idle секунд простоя. Счётчики checkouts, waits, errors, created, closed доступны в stats"""
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        max_lifetime: float = 30 * 60,
+        max_idle: float = 10 * 60,
+        check_interval: float = 30.0,
+    ):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.check_interval = check_interval
+
+        self._idle: deque[tuple[Any, float]] = deque()
+        self._created_at: dict[Any, float] = {}
+        self._size = 0
+        self._condition = threading.Condition()
+        self.stats: Counter = Counter()
+
+    @property
+    def size(self) -> int:
+        """Количество открытых соединений, выданных и свободных"""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def warm(self) -> None:
+        """Открывает соединения до min_size"""
+        conns = [self.getconn() for _ in range(max(0, self.min_size - self._size))]
+        for conn in conns:
+            self.putconn(conn)
+
+    def getconn(self) -> Any:
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            with self._condition:
+                expired = self._pop_expired()
+                conn, returned_at = self._idle.pop() if self._idle else (None, None)
+                if conn is None and self._size >= self.max_size and not expired:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats['errors'] += 1
+                        raise PoolTimeout(f'No free connection in pool of {self.max_size} after {self.timeout}s')
+                    if not waited:
+                        waited = True
+                        self.stats['waits'] += 1
+                    self._condition.wait(remaining)
+                    continue
+                if conn is None:
+                    self._size += 1
+                self.stats['checkouts'] += 1
+
+            for expired_conn in expired:
+                self._close(expired_conn)
+            if conn is None:
+                return self._open()
+            if self._is_healthy(conn, returned_at):
+                return conn
+            self._close(conn)
+            with self._condition:
+                self._size += 1
+            return self._open()
+
+    def putconn(self, conn: Any, discard: bool = False) -> None:
+        """Возвращает соединение в пул, незавершённая транзакция откатывается"""
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                logger.warning('Failed to reset pooled connection', exc_info=True)
+                discard = True
+
+        now = time.monotonic()
+        if discard or conn.closed or now - self._created_at.get(conn, now) >= self.max_lifetime:
+            self._close(conn)
+            return
+
+        with self._condition:
+            self._idle.append((conn, now))
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Закрывает все свободные соединения"""
+        with self._condition:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            self._close(conn)
+
+    def _pop_expired(self) -> list:
+        """Забирает из начала очереди свободные соединения, простаивающие дольше max_idle, сверх min_size"""
+        now = time.monotonic()
+        expired = []
+        while len(self._idle) > self.min_size and now - self._idle[0][1] >= self.max_idle:
+            expired.append(self._idle.popleft()[0])
+        return expired
+
+    def _is_healthy(self, conn: Any, returned_at: float) -> bool:
+        now = time.monotonic()
+        if conn.closed or now - self._created_at.get(conn, now) >= self.max_lifetime:
+            return False
+        if now - returned_at < self.check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            with self._condition:
+                self.stats['health_check_failures'] += 1
+            return False
+        return True
+
+    def _open(self) -> Any:
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self.stats['errors'] += 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created_at[conn] = time.monotonic()
+            self.stats['created'] += 1
+        return conn
+
+    def _close(self, conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._created_at.pop(conn, None)
+            self.stats['closed'] += 1
+            self._condition.notify()
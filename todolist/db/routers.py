@@ -0,0 +1,75 @@
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Выставляется ReplicaRoutingMiddleware: чтение из реплики разрешено только для GET запросов клиента,
+# который недавно ничего не изменял
+replica_reads_allowed: ContextVar[bool] = ContextVar('replica_reads_allowed', default=False)
+
+# Время с последней применённой транзакции растёт и на простаивающей реплике, поэтому реплика, которая применила
+# весь полученный WAL, считается догнавшей primary
+REPLICA_LAG_SQL = (
+    'SELECT pg_is_in_recovery(), pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), '
+    'EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())'
+)
+
+
+class ReplicaRouter:
+    """Направляет чтения приложений goals, core и bot в реплики из DATABASE_REPLICAS, все записи - в default.
+    Реплика с отставанием больше REPLICA_MAX_LAG секунд или недоступная временно исключается"""
+
+    route_app_labels = {'goals', 'core', 'bot'}
+
+    def __init__(self):
+        self.replicas: list[str] = list(getattr(settings, 'DATABASE_REPLICAS', []))
+        self._lag_checked_at: dict[str, float] = {}
+        self._healthy: dict[str, bool] = {}
+
+    def db_for_read(self, model, **hints) -> str | None:
+        if not self.replicas or not replica_reads_allowed.get() or model._meta.app_label not in self.route_app_labels:
+            return 'default'
+        replicas = [alias for alias in self.replicas if self.is_healthy(alias)]
+        return random.choice(replicas) if replicas else 'default'
+
+    def db_for_write(self, model, **hints) -> str:
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name: str | None = None, **hints) -> bool:
+        return db not in self.replicas
+
+    def is_healthy(self, alias: str) -> bool:
+        """Результат проверки отставания кешируется на REPLICA_LAG_CHECK_INTERVAL секунд"""
+        now = time.monotonic()
+        if now - self._lag_checked_at.get(alias, float('-inf')) >= settings.REPLICA_LAG_CHECK_INTERVAL:
+            self._lag_checked_at[alias] = now
+            lag = self.replica_lag(alias)
+            self._healthy[alias] = lag is not None and lag <= settings.REPLICA_MAX_LAG
+            if not self._healthy[alias]:
+                logger.warning('Replica %s is excluded from reads, lag: %s', alias, lag)
+        return self._healthy[alias]
+
+    def replica_lag(self, alias: str) -> float | None:
+        return replica_lag(alias)
+
+
+def replica_lag(alias: str) -> float | None:
+    """Отставание реплики в секундах, None если реплика недоступна"""
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            in_recovery, caught_up, since_replay = cursor.fetchone()
+    except Exception:
+        logger.exception('Failed to check replica %s lag', alias)
+        return None
+    if not in_recovery or caught_up or since_replay is None:
+        return 0.0
+    return float(since_replay)
@@ -1,29 +1,81 @@
-from django.contrib import admin
-from todolist.goals.models import GoalCategory, Goal, GoalComment
+from typing import Any
+
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from todolist.db.counts import LargeTableAdmin
+from todolist.goals.archive import restore_goals
+from todolist.goals.models import ArchivedGoal, ArchivedGoalComment, GoalCategory, Goal, GoalComment
 
 
 @admin.register(GoalCategory)
-class GoalCategoryAdmin(admin.ModelAdmin):
+class GoalCategoryAdmin(LargeTableAdmin):
     """Настройка категорий в админ панели"""
 
     list_display = ('title', 'user', 'created', 'updated')
+    list_select_related = ('user',)
     search_fields = ('title',)
     list_filter = ('is_deleted',)
 
 
 @admin.register(Goal)
-class GoalAdmin(admin.ModelAdmin):
+class GoalAdmin(LargeTableAdmin):
     """Настройка целей в админ панели"""
 
     list_display = ('title', 'user', 'created', 'updated')
+    list_select_related = ('user',)
     search_fields = ('title', 'description')
     list_filter = ('status', 'priority')
 
 
 @admin.register(GoalComment)
-class GoalCommentAdmin(admin.ModelAdmin):
+class GoalCommentAdmin(LargeTableAdmin):
     """Настройка комментариев в админ панели"""
 
     list_display = ('user', 'text', 'created', 'updated', 'goal')
+    list_select_related = ('user', 'goal')
     search_fields = ('text',)
     list_filter = ('created', 'updated')
+
+
+class ArchiveReadOnlyAdmin(LargeTableAdmin):
+    """Архивные строки только просматриваются, вернуть их можно действием восстановления"""
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: Any = None) -> bool:
+        return False
+
+
+@admin.register(ArchivedGoal)
+class ArchivedGoalAdmin(ArchiveReadOnlyAdmin):
+    """Настройка архивных целей в админ панели"""
+
+    list_display = ('title', 'user', 'category', 'created', 'archived')
+    list_select_related = ('user', 'category')
+    search_fields = ('title', 'description')
+    list_filter = ('priority', 'archived')
+    actions = ('restore',)
+
+    @admin.action(description='Восстановить выбранные цели', permissions=('delete',))
+    def restore(self, request: HttpRequest, queryset: QuerySet) -> None:
+        ids = list(queryset.values_list('pk', flat=True))
+        restored = restore_goals(ids)
+        self.message_user(request, f'Восстановлено целей: {restored}', messages.SUCCESS)
+        if restored < len(ids):
+            self.message_user(
+                request,
+                f'Цели удалённых категорий и досок остались в архиве: {len(ids) - restored}',
+                messages.WARNING,
+            )
+
+
+@admin.register(ArchivedGoalComment)
+class ArchivedGoalCommentAdmin(ArchiveReadOnlyAdmin):
+    """Настройка архивных комментариев в админ панели"""
+
+    list_display = ('user', 'text', 'created', 'goal')
+    list_select_related = ('user', 'goal')
+    search_fields = ('text',)
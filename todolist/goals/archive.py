@@ -0,0 +1,83 @@
+import logging
+from typing import Any, Iterable
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from todolist.goals.events import suppress_events
+from todolist.goals.models import ArchivedGoal, ArchivedGoalComment, Goal, GoalComment
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def move_rows(
+    source: type[models.Model], target: type[models.Model], where: str, params: list, extra: dict[str, Any] = None
+) -> int:
+    """Одним запросом DELETE ... RETURNING / INSERT ... SELECT переносит строки между таблицами с одинаковыми
+    колонками. extra - значения колонок целевой таблицы, которых нет в исходной или которые надо заменить"""
+    extra = extra or {}
+    qn = connection.ops.quote_name
+    target_columns = {field.column for field in target._meta.concrete_fields}
+    columns = [field.column for field in source._meta.concrete_fields if field.column in target_columns]
+    copied = [column for column in columns if column not in extra]
+    sql = (
+        f'WITH moved AS (DELETE FROM {qn(source._meta.db_table)} WHERE {where} '
+        f'RETURNING {", ".join(qn(column) for column in copied)}) '
+        f'INSERT INTO {qn(target._meta.db_table)} ({", ".join(qn(column) for column in [*copied, *extra])}) '
+        f'SELECT {", ".join([*(qn(column) for column in copied), *("%s" for _ in extra)])} FROM moved'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, *extra.values()])
+        return cursor.rowcount
+
+
+def delete_goal_dependents(ids: list[int]) -> None:
+    """Удаляет строки других приложений, ссылающиеся на цели с on_delete=CASCADE (отправленные напоминания бота),
+    комментарии переносятся отдельно"""
+    for relation in Goal._meta.related_objects:
+        if relation.related_model is GoalComment or relation.on_delete is not models.CASCADE:
+            continue
+        relation.related_model._base_manager.filter(**{f'{relation.field.name}__in': ids}).delete()
+
+
+def archive_goals(batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Переносит цели в статусе archived вместе с комментариями в архивные таблицы пачками по batch_size,
+    каждая пачка в своей транзакции. Цели, заблокированные другими транзакциями, пропускаются до следующего запуска.
+    Возвращает количество перенесённых целей"""
+    total = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Goal.objects.filter(status=Goal.Status.archived)
+                .select_for_update(skip_locked=True)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            # клиенты получили delete при смене статуса на archived
+            suppress_events()
+            delete_goal_dependents(ids)
+            # внешние ключи отложенные, поэтому порядок переноса целей и комментариев внутри транзакции не важен
+            moved = move_rows(Goal, ArchivedGoal, 'id = ANY(%s)', [ids], {'archived': timezone.now()})
+            comments = move_rows(GoalComment, ArchivedGoalComment, 'goal_id = ANY(%s)', [ids])
+        total += moved
+        logger.info('Archived %s goals and %s comments', moved, comments)
+    return total
+
+
+def restore_goals(ids: Iterable[int], status: int = Goal.Status.to_do) -> int:
+    """Возвращает архивные цели с комментариями в рабочие таблицы с указанным статусом, id сохраняются.
+    Цели удалённых категорий и досок остаются в архиве: в рабочих таблицах их бы никто не увидел.
+    Возвращает количество восстановленных целей"""
+    with transaction.atomic():
+        ids = list(
+            ArchivedGoal.objects.filter(
+                pk__in=list(ids), category__is_deleted=False, category__board__is_deleted=False
+            ).values_list('pk', flat=True)
+        )
+        restored = move_rows(ArchivedGoal, Goal, 'id = ANY(%s)', [ids], {'status': status})
+        move_rows(ArchivedGoalComment, GoalComment, 'goal_id = ANY(%s)', [ids])
+    return restored
@@ -0,0 +1,113 @@
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpRequest
+from django.views import View
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from todolist.goals import views
+
+
+class AsyncReadView(View):
+    """Асинхронный GET поверх синхронной DRF вью из sync_view_class, остальные методы передаются ей же.
+
+    Аутентификация, проверка прав и разбор фильтров выполняются синхронным кодом вью в потоке, основные запросы
+    к данным - через асинхронный ORM. Пока ответ отдаётся медленному клиенту, воркер обслуживает другие запросы.
+    Ответ совпадает с ответом синхронной вью"""
+
+    sync_view_class: type[GenericAPIView]
+
+    @classmethod
+    def as_view(cls, **initkwargs: Any):
+        view = super().as_view(**initkwargs)
+        # CSRF проверяет SessionAuthentication, как и у вью DRF
+        view.csrf_exempt = True
+        # схема API строится по синхронной вью
+        view.cls = cls.sync_view_class
+        view.initkwargs = initkwargs
+        return view
+
+    async def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
+        if request.method in ('GET', 'HEAD'):
+            return await self.get(request, *args, **kwargs)
+        return await sync_to_async(self.sync_view_class.as_view())(request, *args, **kwargs)
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
+        view = self.sync_view_class()
+        view.setup(request, *args, **kwargs)
+        view.format_kwarg = None
+        drf_request = view.initialize_request(request, *args, **kwargs)
+        view.request = drf_request
+        view.headers = view.default_response_headers
+
+        try:
+            await sync_to_async(view.initial)(drf_request, *args, **kwargs)
+            response = Response(await self.get_data(view))
+        except Exception as exc:
+            response = await sync_to_async(view.handle_exception)(exc)
+
+        return view.finalize_response(drf_request, response, *args, **kwargs)
+
+    async def get_data(self, view: GenericAPIView) -> Any:
+        raise NotImplementedError
+
+
+class AsyncListView(AsyncReadView):
+    """Асинхронный список с той же фильтрацией, сортировкой и пагинацией limit/offset, что у синхронной вью"""
+
+    async def get_data(self, view: GenericAPIView) -> Any:
+        # Фильтры могут обращаться к базе при валидации (выбор категории), поэтому разбираются в потоке
+        queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+        values_serializer = getattr(view, 'values_serializer', None)
+        if values_serializer is not None:
+            queryset = values_serializer.values(queryset)
+
+        def serialize(objs: list) -> Any:
+            if values_serializer is not None:
+                return values_serializer.serialize(objs)
+            return view.get_serializer(objs, many=True).data
+
+        paginator = view.paginator
+        limit = paginator.get_limit(view.request) if paginator else None
+        if limit is None:
+            return serialize([obj async for obj in queryset])
+
+        paginator.request = view.request
+        paginator.limit = limit
+        paginator.offset = paginator.get_offset(view.request)
+        paginator.count = await queryset.acount()
+        if paginator.count == 0 or paginator.offset > paginator.count:
+            page = []
+        else:
+            page = [obj async for obj in queryset[paginator.offset : paginator.offset + paginator.limit]]
+        return paginator.get_paginated_response(serialize(page)).data
+
+
+class AsyncDetailView(AsyncReadView):
+    """Асинхронное детальное отображение объекта"""
+
+    async def get_data(self, view: GenericAPIView) -> Any:
+        queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        obj = await queryset.filter(**{view.lookup_field: view.kwargs[lookup_url_kwarg]}).afirst()
+        if obj is None:
+            raise Http404
+        await sync_to_async(view.check_object_permissions)(view.request, obj)
+        return view.get_serializer(obj).data
+
+
+class AsyncBoardListView(AsyncListView):
+    sync_view_class = views.BoardListView
+
+
+class AsyncBoardDetailView(AsyncDetailView):
+    sync_view_class = views.BoardDetailView
+
+
+class AsyncGoalListView(AsyncListView):
+    sync_view_class = views.GoalListView
+
+
+class AsyncGoalCommentListView(AsyncListView):
+    sync_view_class = views.GoalCommentListView
@@ -0,0 +1,119 @@
+"""Копирование доски как шаблона.
+
+Строки копируются запросами INSERT ... SELECT, по одному на таблицу, независимо от числа категорий, целей
+и комментариев. Новые id категорий и целей заранее берутся из последовательностей таблиц, соответствие старых
+и новых id передаётся в запрос массивами и соединяется через unnest, так внешние ключи копий указывают на копии.
+Ранги копируются как есть: группы сортировки переносятся целиком, поэтому порядок в них сохраняется.
+"""
+from typing import Any
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from core.models import User
+from todolist.goals.events import suppress_events
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+def allocate_ids(model: type[models.Model], count: int) -> list[int]:
+    """count новых id из последовательности таблицы, безопасно при параллельных вставках"""
+    if not count:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def copy_rows(
+    model: type[models.Model], source: str, params: list, expressions: dict[str, str], values: dict[str, Any]
+) -> int:
+    """INSERT INTO <таблица model> SELECT ... FROM <source>. source - таблица модели под псевдонимом s вместе
+    с соединениями и условиями, expressions - SQL выражения колонок, values - значения колонок, остальные
+    колонки копируются из s как есть. id копируется только из expressions, иначе назначается базой"""
+    qn = connection.ops.quote_name
+    pk = model._meta.pk.column
+    columns = [field.column for field in model._meta.concrete_fields if field.column != pk or pk in expressions]
+    select, select_params = [], []
+    for column in columns:
+        if column in expressions:
+            select.append(expressions[column])
+        elif column in values:
+            select.append('%s')
+            select_params.append(values[column])
+        else:
+            select.append(f's.{qn(column)}')
+    sql = 'INSERT INTO {} ({}) SELECT {} FROM {}'.format(
+        qn(model._meta.db_table), ', '.join(qn(column) for column in columns), ', '.join(select), source
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*select_params, *params])
+        return cursor.rowcount
+
+
+def clone_board(
+    board: Board,
+    user: User,
+    title: str | None = None,
+    goals: bool = False,
+    participants: bool = False,
+    comments: bool = False,
+) -> Board:
+    """Копия доски board, владельцем которой становится user. Копируются неудалённые категории, с goals -
+    цели в работе, с comments - их комментарии, с participants - остальные участники (владельцы становятся
+    редакторами). Без participants автором всех копий становится user: чужие цели на доске, где их авторы
+    не участвуют, попадали бы в их списки в боте. Комментарии сохраняют даты, чтобы не менялся их порядок"""
+    qn = connection.ops.quote_name
+    now = timezone.now()
+    author = {} if participants else {'user_id': user.id}
+    with transaction.atomic():
+        clone = Board.objects.create(title=title or board.title)
+        BoardParticipant.objects.create(board=clone, user=user, role=BoardParticipant.Role.owner)
+        if participants:
+            owner, writer = int(BoardParticipant.Role.owner), int(BoardParticipant.Role.writer)
+            copy_rows(
+                BoardParticipant,
+                f'{qn(BoardParticipant._meta.db_table)} s WHERE s.board_id = %s AND s.user_id <> %s',
+                [board.id, user.id],
+                {'role': f'CASE WHEN s.role = {owner} THEN {writer} ELSE s.role END'},
+                {'created': now, 'updated': now, 'board_id': clone.id},
+            )
+        # доска и участники опубликованы, содержимое клиенты читают после события создания доски
+        suppress_events()
+
+        category_ids = list(GoalCategory.live.filter(board=board).values_list('id', flat=True))
+        new_category_ids = allocate_ids(GoalCategory, len(category_ids))
+        copy_rows(
+            GoalCategory,
+            f'{qn(GoalCategory._meta.db_table)} s '
+            'JOIN unnest(%s::bigint[], %s::bigint[]) AS m(old_id, new_id) ON s.id = m.old_id',
+            [category_ids, new_category_ids],
+            {'id': 'm.new_id'},
+            {'created': now, 'updated': now, 'board_id': clone.id, **author},
+        )
+        if not goals:
+            return clone
+
+        goal_ids = list(Goal.live.filter(category__board=board).values_list('id', flat=True))
+        new_goal_ids = allocate_ids(Goal, len(goal_ids))
+        copy_rows(
+            Goal,
+            f'{qn(Goal._meta.db_table)} s '
+            'JOIN unnest(%s::bigint[], %s::bigint[]) AS m(old_id, new_id) ON s.id = m.old_id '
+            'JOIN unnest(%s::bigint[], %s::bigint[]) AS c(old_id, new_id) ON s.category_id = c.old_id',
+            [goal_ids, new_goal_ids, category_ids, new_category_ids],
+            {'id': 'm.new_id', 'category_id': 'c.new_id'},
+            {'created': now, 'updated': now, **author},
+        )
+        if comments:
+            copy_rows(
+                GoalComment,
+                f'{qn(GoalComment._meta.db_table)} s '
+                'JOIN unnest(%s::bigint[], %s::bigint[]) AS m(old_id, new_id) ON s.goal_id = m.old_id',
+                [goal_ids, new_goal_ids],
+                {'goal_id': 'm.new_id'},
+                author,
+            )
+    return clone
@@ -0,0 +1,280 @@
+"""Поток изменений досок через LISTEN/NOTIFY PostgreSQL.
+
+Триггеры на таблицах досок, участников, категорий, целей и комментариев (миграция 0012_events) при каждом изменении
+строки отправляют pg_notify в канал CHANNEL с JSON {"board", "entity", "id", "op", "version"}, у участников ещё
+"user". Уведомление доставляется только после коммита транзакции, откаченные изменения не публикуются.
+Удаление доски или категории флагом is_deleted и перенос цели в архив публикуются как op="delete",
+для содержимого удалённой доски или категории отдельные события не отправляются. Перенос цели или категории
+в другую доску публикуется ещё и как op="delete" для прежней доски (миграция 0015_events_moved).
+
+В каждом процессе одно соединение слушает канал в фоновом потоке EventHub и раздаёт события подпискам
+в памяти, поэтому число соединений с базой не зависит от числа подключённых клиентов. Соединение открывается
+при первой подписке и закрывается, когда подписок не остаётся. События не хранятся: после переподключения
+клиент перечитывает данные через API.
+
+Под WSGI поток занимает поток воркера, пока клиент подключён, поэтому число таких потоков в процессе
+ограничено EVENTS_MAX_STREAMS, сверх него клиент получает 503 и переподключается позже.
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+import time
+from collections import defaultdict, deque
+from typing import AsyncIterator, Iterator
+
+import psycopg2
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'goals_events'
+# Настройка сессии, отключающая триггеры событий до конца транзакции
+SKIP_SETTING = 'todolist.skip_events'
+# Как часто поток слушателя проверяет, остались ли подписки
+POLL_INTERVAL = 1.0
+# Пауза перед повторным подключением после ошибки
+RECONNECT_DELAY = 1.0
+# Через сколько миллисекунд клиент переподключается после закрытия потока
+RETRY_MS = 3000
+
+
+def suppress_events() -> None:
+    """Отключает публикацию событий до конца текущей транзакции: массовая загрузка и перенос строк, которые
+    клиенты уже видят удалёнными (архивирование, очистка), не должны отправлять уведомление на каждую строку"""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT set_config(%s, %s, true)', [SKIP_SETTING, 'on'])
+
+
+def format_event(event: dict) -> str:
+    """Событие в формате text/event-stream, id - версия события"""
+    return f'id: {event["version"]}\nevent: {event["entity"]}\ndata: {json.dumps(event)}\n\n'
+
+
+class Subscription:
+    """Очередь событий досок board_ids одного клиента. Доски, в которые пользователь user_id добавлен или из
+    которых удалён после подписки, добавляются и удаляются по событиям участников.
+    При переполнении очереди новые события отбрасываются и выставляется overflowed, поток клиента завершается"""
+
+    def __init__(self, user_id: int, board_ids: set[int], maxsize: int = settings.EVENTS_QUEUE_SIZE):
+        self.user_id = user_id
+        self.board_ids = set(board_ids)
+        self.maxsize = maxsize
+        self.overflowed = False
+        self._events: deque = deque()
+        self._condition = threading.Condition()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def put(self, event: dict) -> None:
+        """Вызывается из потока слушателя"""
+        with self._condition:
+            if len(self._events) >= self.maxsize:
+                self.overflowed = True
+            else:
+                self._events.append(event)
+            self._condition.notify()
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def get(self, timeout: float) -> dict | None:
+        """Следующее событие или None, если за timeout секунд событий не было или очередь переполнилась"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._events or self.overflowed, timeout)
+            return self._events.popleft() if self._events else None
+
+    async def aget(self, timeout: float) -> dict | None:
+        """Асинхронный get для потоков, которые отдаёт ASGI сервер"""
+        with self._condition:
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+                self._wakeup = asyncio.Event()
+            if self._events or self.overflowed:
+                return self._events.popleft() if self._events else None
+            self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._condition:
+            return self._events.popleft() if self._events else None
+
+
+class EventHub:
+    """Слушатель канала CHANNEL, один на процесс, и раздача событий подпискам по доскам"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_board: dict[int, set[Subscription]] = defaultdict(set)
+        self._by_user: dict[int, set[Subscription]] = defaultdict(set)
+        self._thread: threading.Thread | None = None
+        self._listening = threading.Event()
+        self._streams = 0
+
+    def subscribe(self, subscription: Subscription, timeout: float = 5) -> None:
+        """Регистрирует подписку и ждёт до timeout секунд, пока слушатель не выполнит LISTEN"""
+        with self._lock:
+            for board_id in subscription.board_ids:
+                self._by_board[board_id].add(subscription)
+            self._by_user[subscription.user_id].add(subscription)
+            if self._thread is None:
+                self._listening.clear()
+                self._thread = threading.Thread(target=self.run, name='goals-events', daemon=True)
+                self._thread.start()
+            listening = self._listening
+        listening.wait(timeout)
+
+    def acquire_stream(self, limit: int) -> bool:
+        """Занимает место потока WSGI, если их меньше limit"""
+        with self._lock:
+            if self._streams >= limit:
+                return False
+            self._streams += 1
+            return True
+
+    def release_stream(self) -> None:
+        with self._lock:
+            self._streams -= 1
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for board_id in subscription.board_ids:
+                self._discard(self._by_board, board_id, subscription)
+            self._discard(self._by_user, subscription.user_id, subscription)
+
+    @staticmethod
+    def _discard(index: dict, key: int, subscription: Subscription) -> None:
+        subscribers = index.get(key)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del index[key]
+
+    def dispatch(self, event: dict) -> None:
+        """Передаёт событие подпискам на его доску. Событие участника также меняет набор досок подписок
+        этого пользователя"""
+        board_id = event['board']
+        with self._lock:
+            subscribers = set(self._by_board.get(board_id, ()))
+            if event['entity'] == 'participant':
+                members = self._by_user.get(event['user'], set())
+                subscribers |= members
+                for subscription in members:
+                    if event['op'] == 'delete':
+                        subscription.board_ids.discard(board_id)
+                        self._discard(self._by_board, board_id, subscription)
+                    else:
+                        subscription.board_ids.add(board_id)
+                        self._by_board[board_id].add(subscription)
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def run(self) -> None:
+        """Поток слушателя: переподключается после любых ошибок и завершается, когда подписок не остаётся.
+        Если поток всё же завершился иначе, следующая подписка запустит новый"""
+        try:
+            while True:
+                try:
+                    self.listen()
+                    return
+                except Exception:
+                    logger.exception('Events listener failed')
+                    self._listening.clear()
+                    time.sleep(RECONNECT_DELAY)
+                if self.stop_if_idle():
+                    return
+        finally:
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def listen(self) -> None:
+        params = connections['default'].get_connection_params() | {
+            'host': settings.EVENTS_LISTEN_HOST,
+            'port': settings.EVENTS_LISTEN_PORT,
+        }
+        conn = psycopg2.connect(**params)
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL}')
+            self._listening.set()
+            while not self.stop_if_idle():
+                if select.select([conn], [], [], POLL_INTERVAL) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        self.dispatch(json.loads(notify.payload))
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning('Malformed event %r', notify.payload)
+        finally:
+            conn.close()
+
+    def stop_if_idle(self) -> bool:
+        with self._lock:
+            if self._by_user:
+                return False
+            self._thread = None
+            return True
+
+    def reset(self) -> None:
+        # Поток слушателя не переживает fork, в дочернем процессе он запускается заново при первой подписке
+        self.__init__()
+
+
+hub = EventHub()
+os.register_at_fork(after_in_child=hub.reset)
+
+
+def stream(subscription: Subscription, timeout: float, keepalive: float = settings.EVENTS_KEEPALIVE) -> Iterator[str]:
+    """Поток text/event-stream для WSGI: события подписки в течение timeout секунд, при простое - комментарии
+    keepalive, чтобы прокси не закрывали соединение. Занимает поток воркера, пока клиент подключён"""
+    hub.subscribe(subscription)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        deadline = time.monotonic() + timeout
+        while not subscription.overflowed and (remaining := deadline - time.monotonic()) > 0:
+            event = subscription.get(min(keepalive, remaining))
+            yield format_event(event) if event else ': keepalive\n\n'
+    finally:
+        hub.unsubscribe(subscription)
+
+
+class BoundedStream:
+    """Поток stream, занявший место через hub.acquire_stream. Django вызывает close() при закрытии ответа,
+    в том числе когда клиент отключился до начала потока и код генератора не выполнялся"""
+
+    def __init__(self, iterator: Iterator[str]):
+        self._iterator = iterator
+        self._closed = False
+
+    def __iter__(self) -> Iterator[str]:
+        return self._iterator
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._iterator.close()
+            hub.release_stream()
+
+
+async def astream(
+    subscription: Subscription, timeout: float, keepalive: float = settings.EVENTS_KEEPALIVE
+) -> AsyncIterator[str]:
+    """Поток text/event-stream для ASGI: ожидание событий не занимает потоков, поэтому подключённых клиентов
+    может быть намного больше, чем потоков воркера"""
+    await sync_to_async(hub.subscribe, thread_sensitive=False)(subscription)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        deadline = time.monotonic() + timeout
+        while not subscription.overflowed and (remaining := deadline - time.monotonic()) > 0:
+            event = await subscription.aget(min(keepalive, remaining))
+            yield format_event(event) if event else ': keepalive\n\n'
+    finally:
+        hub.unsubscribe(subscription)
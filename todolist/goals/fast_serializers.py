@@ -0,0 +1,114 @@
+import datetime
+from functools import cached_property, partial
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from todolist.goals.serializers import GoalSerializer, GoalCategorySerializer, GoalCommentSerializer, BoardSerializer
+
+# Поля, у которых значение из .values() уже совпадает с представлением DRF и не требует преобразования
+IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _field_to_representation(field: serializers.Field, value: Any, tz: datetime.tzinfo | None) -> Any:
+    return field.to_representation(value)
+
+
+def _datetime_to_iso(field: serializers.DateTimeField, value: Any, tz: datetime.tzinfo | None) -> Any:
+    """DateTimeField.to_representation без поиска текущей временной зоны для каждого значения"""
+    if tz is None or not isinstance(value, datetime.datetime) or value.utcoffset() is None:
+        return field.to_representation(value)
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class ValuesSerializer:
+    """Быстрая сериализация списков только для чтения.
+
+    Из полей DRF сериализатора один раз строится план: имя поля в ответе, путь для .values() и функция
+    преобразования значения. Строки .values() превращаются в словари по этому плану без создания моделей
+    и полей DRF, результат совпадает с сериализатором DRF"""
+
+    def __init__(self, serializer_class: type[serializers.Serializer]):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def plan(self) -> list[tuple[str, str, Callable | None, list | None]]:
+        return self._compile(self.serializer_class(), prefix='')
+
+    @cached_property
+    def lookups(self) -> list[str]:
+        lookups = []
+
+        def collect(plan: list) -> None:
+            for _, lookup, _, nested in plan:
+                if nested is None:
+                    lookups.append(lookup)
+                else:
+                    collect(nested)
+
+        collect(self.plan)
+        return lookups
+
+    def values(self, queryset: QuerySet) -> QuerySet:
+        return queryset.values(*self.lookups)
+
+    def serialize(self, rows: Iterable[dict]) -> list[dict]:
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        return [self._build(self.plan, row, tz) for row in rows]
+
+    def _build(self, plan: list, row: dict, tz: datetime.tzinfo | None) -> dict:
+        data = {}
+        for name, lookup, convert, nested in plan:
+            if nested is not None:
+                # Вложенный объект отсутствует, если пуст его первичный ключ
+                data[name] = None if row[lookup] is None else self._build(nested, row, tz)
+                continue
+            value = row[lookup]
+            data[name] = value if value is None or convert is None else convert(value, tz)
+        return data
+
+    def _compile(self, serializer: serializers.Serializer, prefix: str) -> list:
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only or isinstance(field, serializers.HiddenField):
+                continue
+            if field.source == '*' or '.' in field.source or isinstance(field, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(f'{serializer.__class__.__name__}.{name} is not supported by .values()')
+
+            lookup = prefix + field.source
+            if isinstance(field, serializers.Serializer):
+                pk_name = field.Meta.model._meta.pk.name
+                plan.append((name, f'{lookup}__{pk_name}', None, self._compile(field, prefix=f'{lookup}__')))
+            elif isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+                raise ImproperlyConfigured(f'{serializer.__class__.__name__}.{name} is not supported by .values()')
+            elif isinstance(field, IDENTITY_FIELDS):
+                plan.append((name, lookup, None, None))
+            elif (
+                isinstance(field, serializers.DateTimeField)
+                and not hasattr(field, 'timezone')
+                and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601
+            ):
+                plan.append((name, lookup, partial(_datetime_to_iso, field), None))
+            else:
+                plan.append((name, lookup, partial(_field_to_representation, field), None))
+        return plan
+
+
+board_values_serializer = ValuesSerializer(BoardSerializer)
+goal_category_values_serializer = ValuesSerializer(GoalCategorySerializer)
+goal_values_serializer = ValuesSerializer(GoalSerializer)
+goal_comment_values_serializer = ValuesSerializer(GoalCommentSerializer)
@@ -0,0 +1,16 @@
+from django.core.management import BaseCommand
+
+from todolist.goals.archive import ARCHIVE_BATCH_SIZE, archive_goals
+
+
+class Command(BaseCommand):
+    """Перенос целей в статусе archived с комментариями в архивные таблицы, запускается по расписанию"""
+
+    help = 'Move archived goals and their comments to the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='goals moved per transaction')
+
+    def handle(self, *args, **options):
+        moved = archive_goals(batch_size=options['batch_size'])
+        self.stdout.write(f'Moved {moved} goals to archive')
@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import urls as core_urls
+from todolist.benchmark.dataset import PRESETS, dataset_exists, seed_dataset
+from todolist.benchmark.report import compare
+from todolist.benchmark.runner import Runner
+from todolist.benchmark.scenarios import SCENARIOS, find_personas
+from todolist.goals import urls as goals_urls
+from todolist.goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
+from todolist.schema import get_code_version
+
+
+def uncovered_url_names() -> set[str]:
+    """Адреса goals и core, для которых нет ни одного сценария"""
+    names = {f'todolist.goals:{pattern.name}' for pattern in goals_urls.urlpatterns}
+    names |= {f'core:{pattern.name}' for pattern in core_urls.urlpatterns}
+    return names - {scenario.url_name for scenario in SCENARIOS}
+
+
+class Command(BaseCommand):
+    """Задержка p50/p95 и число SQL запросов для каждого адреса goals и core на большом наборе данных.
+    Набор данных создаётся один раз (--seed) и переиспользуется, запросы сценариев откатываются.
+    Результат в JSON сравнивается с результатом предыдущего коммита (--baseline)"""
+
+    help = 'Measure latency and SQL query count of every goals and core endpoint on a generated dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help='generate the dataset if it does not exist')
+        parser.add_argument('--preset', choices=PRESETS, default='small', help='dataset size for --seed')
+        parser.add_argument('--random-seed', type=int, default=0, help='seed of the dataset generator')
+        parser.add_argument('--requests', type=int, default=100, help='measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=5, help='unmeasured requests per scenario')
+        parser.add_argument('--only', help='run scenarios whose name contains this substring')
+        parser.add_argument('--output', help='write results as JSON to this file')
+        parser.add_argument('--baseline', help='JSON results to compare with, regressions fail the command')
+        parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative growth of p95')
+        parser.add_argument('--min-delta-ms', type=float, default=1.0, help='ignore p95 growth below this')
+        parser.add_argument('--json', action='store_true', help='print results as JSON')
+
+    def handle(self, *args, **options):
+        if missing := uncovered_url_names():
+            raise CommandError(f'No benchmark scenarios for {", ".join(sorted(missing))}')
+
+        if options['seed'] and not dataset_exists():
+            seed_dataset(PRESETS[options['preset']], options['random_seed'], log=self.stderr.write)
+        try:
+            runner = Runner(find_personas())
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        results = {}
+        for scenario in SCENARIOS:
+            if options['only'] and options['only'] not in scenario.name:
+                continue
+            try:
+                results[scenario.name] = runner.run(scenario, options['requests'], options['warmup'])
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        report = {
+            'meta': {
+                'code_version': get_code_version(),
+                'date': timezone.now().isoformat(),
+                'requests': options['requests'],
+                'rows': {
+                    model.__name__: model.objects.count()
+                    for model in (Board, BoardParticipant, GoalCategory, Goal, GoalComment)
+                },
+            },
+            'results': results,
+        }
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2))
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            for name, result in results.items():
+                self.stdout.write(
+                    f'{name:<24} p50 {result["p50_ms"]:>8.2f} ms  p95 {result["p95_ms"]:>8.2f} ms  '
+                    f'queries {result["queries"]}'
+                )
+
+        if options['baseline']:
+            baseline = json.loads(Path(options['baseline']).read_text())
+            if regressions := compare(baseline, report, options['threshold'], options['min_delta_ms']):
+                raise CommandError('Regressions:\n' + '\n'.join(map(str, regressions)))
@@ -0,0 +1,92 @@
+import time
+from dataclasses import replace
+
+from django.core.management import BaseCommand, CommandError
+
+from todolist.benchmark.dataset import PRESETS, DatasetSpec, dataset_exists, seed_dataset
+from todolist.goals.models import Goal
+
+
+def parse_mix(value: str, choices: type[Goal.Status] | type[Goal.Priority]) -> dict[int, float]:
+    """Доли значений вида to_do=40,done=60"""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        try:
+            value, weight = choices[name.strip()].value, float(weight)
+        except (KeyError, ValueError):
+            raise CommandError(f'Invalid mix item {item!r}, expected one of {", ".join(choices.names)} with a weight')
+        if weight < 0:
+            raise CommandError(f'Invalid mix item {item!r}, weight must not be negative')
+        mix[value] = weight
+    return mix
+
+
+class Command(BaseCommand):
+    """Синтетические доски, участники, категории, цели и комментарии для воспроизведения нагрузки.
+    Строки загружаются командами COPY в одной транзакции, при одинаковом --seed данные совпадают"""
+
+    help = 'Generate a large synthetic dataset of boards, goals and comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--preset', choices=PRESETS, default='small', help='base sizes and distributions')
+        parser.add_argument('--seed', type=int, default=0, help='random generator seed')
+        parser.add_argument('--prefix', help='username prefix of generated users, must not be in use')
+        parser.add_argument('--users', type=int)
+        parser.add_argument('--boards', type=int)
+        parser.add_argument('--goals', type=int)
+        parser.add_argument('--comments', type=int)
+        parser.add_argument('--members-per-board', type=int, help='average participants of a board')
+        parser.add_argument('--categories-per-board', type=int, help='average categories of a board')
+        parser.add_argument('--membership-skew', type=float, help='Zipf exponent of boards per user')
+        parser.add_argument('--goal-skew', type=float, help='Zipf exponent of goals per category')
+        parser.add_argument('--comment-skew', type=float, help='Zipf exponent of comments per goal')
+        parser.add_argument(
+            '--status-mix', help='goal status weights, e.g. to_do=40,in_progress=30,done=20,archived=10'
+        )
+        parser.add_argument('--priority-mix', help='goal priority weights, e.g. low=20,medium=50,hight=20,critical=10')
+        parser.add_argument('--due-date-share', type=float, help='share of goals with a due date')
+        parser.add_argument(
+            '--drop-indexes',
+            action='store_true',
+            help='drop indexes and foreign keys while loading, blocks reads of the tables, for an idle database only',
+        )
+
+    def handle(self, *args, **options):
+        overrides = {
+            'username_prefix': options['prefix'],
+            'users': options['users'],
+            'boards': options['boards'],
+            'goals': options['goals'],
+            'comments': options['comments'],
+            'members_per_board': options['members_per_board'],
+            'categories_per_board': options['categories_per_board'],
+            'membership_skew': options['membership_skew'],
+            'goal_skew': options['goal_skew'],
+            'comment_skew': options['comment_skew'],
+            'due_date_share': options['due_date_share'],
+        }
+        if options['status_mix']:
+            overrides['status_mix'] = parse_mix(options['status_mix'], Goal.Status)
+        if options['priority_mix']:
+            overrides['priority_mix'] = parse_mix(options['priority_mix'], Goal.Priority)
+        spec: DatasetSpec = replace(
+            PRESETS[options['preset']], **{key: value for key, value in overrides.items() if value is not None}
+        )
+
+        if spec.users < 1 or spec.boards < 1:
+            raise CommandError('At least one user and one board are required')
+        if spec.members_per_board < 1 or spec.categories_per_board < 1:
+            raise CommandError('At least one member and one category per board are required')
+        if not sum(spec.status_mix.values()) or not sum(spec.priority_mix.values()):
+            raise CommandError('Status and priority mixes need at least one positive weight')
+        if spec.comments and not spec.goals:
+            raise CommandError('Comments require goals')
+        if dataset_exists(spec.username_prefix):
+            raise CommandError(f'Users with prefix {spec.username_prefix!r} already exist, use another --prefix')
+
+        started = time.perf_counter()
+        rows = seed_dataset(spec, options['seed'], log=self.stdout.write, drop_indexes=options['drop_indexes'])
+        elapsed = time.perf_counter() - started
+        total = sum(rows.values())
+        self.stdout.write(f'{total} rows in {elapsed:.1f} s, {total / elapsed:.0f} rows/s')
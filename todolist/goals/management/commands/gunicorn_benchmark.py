@@ -0,0 +1,123 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+# Запрос проходит резолвер, загрузку несуществующей сессии из базы и проверку прав DRF
+PROBE_PATH = '/goals/board/list'
+PROBE_COOKIE = f'{settings.SESSION_COOKIE_NAME}=gunicorn-benchmark'
+
+
+class Command(BaseCommand):
+    """Сравнение запуска gunicorn с прежними параметрами (-w N, без конфигурации) и с gunicorn.conf.py:
+    время до первого ответа, задержка первых запросов и память воркеров"""
+
+    help = 'Compare startup time and worker memory of plain gunicorn and gunicorn.conf.py'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='workers in both setups')
+        parser.add_argument('--requests', type=int, default=20, help='probe requests after startup')
+        parser.add_argument('--json', action='store_true', help='print results as JSON')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        config = Path(settings.BASE_DIR) / 'gunicorn.conf.py'
+        setups = {
+            'plain': ['--config', os.devnull, '--workers', str(workers)],
+            'tuned': ['--config', str(config)],
+        }
+        results = {name: self.measure(arguments, workers, options['requests']) for name, arguments in setups.items()}
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, stats in results.items():
+            self.stdout.write(
+                f'{name}: first response after {stats["startup_s"]} s, first request {stats["first_request_ms"]} ms, '
+                f'p50 {stats["p50_ms"]} ms, RSS per worker {stats["rss_mb"]} MB, PSS per worker {stats["pss_mb"]} MB'
+            )
+
+    def measure(self, arguments: list[str], workers: int, requests: int) -> dict:
+        port = self.free_port()
+        env = dict(os.environ, GUNICORN_WORKERS=str(workers), GUNICORN_BIND=f'127.0.0.1:{port}')
+        command = [sys.executable, '-m', 'gunicorn', 'todolist.wsgi', '--bind', f'127.0.0.1:{port}', *arguments]
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            url = f'http://127.0.0.1:{port}{PROBE_PATH}'
+            first_request = self.wait_for_first_response(url, process)
+            startup = time.perf_counter() - started
+            latencies = sorted(self.probe(url) for _ in range(requests))
+            self.wait_for_workers(process.pid, workers)
+            memory = [self.worker_memory(pid) for pid in self.worker_pids(process.pid)]
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=30)
+
+        return {
+            'workers': len(memory),
+            'startup_s': round(startup, 3),
+            'first_request_ms': round(first_request * 1000, 2),
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+            'rss_mb': round(sum(rss for rss, _ in memory) / len(memory) / 1024, 1),
+            'pss_mb': round(sum(pss for _, pss in memory) / len(memory) / 1024, 1),
+        }
+
+    def wait_for_first_response(self, url: str, process: subprocess.Popen, timeout: float = 60) -> float:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'gunicorn exited with code {process.returncode}')
+            try:
+                return self.probe(url)
+            except (ConnectionError, urllib.error.URLError):
+                time.sleep(0.05)
+        raise CommandError('gunicorn did not respond in time')
+
+    @staticmethod
+    def probe(url: str) -> float:
+        request = urllib.request.Request(url, headers={'Cookie': PROBE_COOKIE})
+        started = time.perf_counter()
+        try:
+            urllib.request.urlopen(request).read()
+        except urllib.error.HTTPError as exc:
+            exc.read()
+        return time.perf_counter() - started
+
+    def wait_for_workers(self, master_pid: int, workers: int, timeout: float = 30) -> None:
+        deadline = time.monotonic() + timeout
+        while len(self.worker_pids(master_pid)) < workers and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    @staticmethod
+    def worker_pids(master_pid: int) -> list[int]:
+        children = Path(f'/proc/{master_pid}/task/{master_pid}/children')
+        return [int(pid) for pid in children.read_text().split()]
+
+    @staticmethod
+    def worker_memory(pid: int) -> tuple[int, int]:
+        """RSS и PSS процесса в килобайтах. PSS делит общие страницы между процессами и показывает выигрыш
+        от copy-on-write"""
+        values = {}
+        for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines()[1:]:
+            name, value = line.split(':', 1)
+            values[name] = int(value.split()[0])
+        return values['Rss'], values['Pss']
+
+    @staticmethod
+    def free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
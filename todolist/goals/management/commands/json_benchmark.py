@@ -0,0 +1,84 @@
+import io
+import json
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.models import User
+from core.tokens import issue_tokens
+from todolist.fastjson import FastJSONParser, FastJSONRenderer, orjson
+from todolist.goals.models import Board, BoardParticipant, GoalCategory, Goal
+from todolist.goals.views import GoalListView
+
+
+class Command(BaseCommand):
+    """Скорость рендеринга и разбора больших страниц goal/list стандартными классами DRF и на orjson.
+    Все созданные данные откатываются в конце, в базе ничего не остаётся"""
+
+    help = 'Compare DRF JSONRenderer/JSONParser with the orjson based renderer and parser on goal/list pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', default='100,1000,5000', help='comma separated goal/list page sizes')
+        parser.add_argument('--repeat', type=int, default=50, help='renders per measurement')
+        parser.add_argument('--json', action='store_true', help='print results as JSON')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed, the fast renderer falls back to the standard one')
+
+        sizes = [int(size) for size in options['pages'].split(',')]
+        results = {}
+        with transaction.atomic():
+            user = self.create_data(max(sizes))
+            authorization = f'Bearer {issue_tokens(user)["access"]}'
+            view = GoalListView.as_view()
+            for size in sizes:
+                request = RequestFactory().get('/goals/goal/list', {'limit': size}, HTTP_AUTHORIZATION=authorization)
+                data = view(request).data
+                body = JSONRenderer().render(data)
+                if FastJSONRenderer().render(data) != body:
+                    raise CommandError('Rendered JSON differs from DRF')
+
+                repeat = max(1, options['repeat'] * 100 // size)
+                results[size] = {
+                    'bytes': len(body),
+                    'render_drf_ms': self.measure(lambda: JSONRenderer().render(data), repeat),
+                    'render_fast_ms': self.measure(lambda: FastJSONRenderer().render(data), repeat),
+                    'parse_drf_ms': self.measure(lambda: JSONParser().parse(io.BytesIO(body)), repeat),
+                    'parse_fast_ms': self.measure(lambda: FastJSONParser().parse(io.BytesIO(body)), repeat),
+                }
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for size, stats in results.items():
+            self.stdout.write(
+                f'goal/list limit={size} ({stats["bytes"]} bytes): render {stats["render_drf_ms"]} -> '
+                f'{stats["render_fast_ms"]} ms, parse {stats["parse_drf_ms"]} -> {stats["parse_fast_ms"]} ms'
+            )
+
+    @staticmethod
+    def measure(func, repeat: int) -> float:
+        func()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return round((time.perf_counter() - started) / repeat * 1000, 3)
+
+    @staticmethod
+    def create_data(goals: int) -> User:
+        user = User.objects.create_user(username='json_benchmark', first_name='Павел', email='json@example.com')
+        board = Board.objects.create(title='JSON benchmark')
+        BoardParticipant.objects.create(board=board, user=user)
+        category = GoalCategory.objects.create(board=board, user=user, title='Категория')
+        Goal.objects.bulk_create(
+            Goal(user=user, category=category, title=f'Цель №{i} — проверка', description='Описание цели ' * 5)
+            for i in range(goals)
+        )
+        return user
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from todolist.goals.retention import Purger, vacuum
+
+
+class Command(BaseCommand):
+    """Окончательное удаление досок, категорий и архивных целей старше срока хранения, запускается по расписанию"""
+
+    help = 'Delete soft-deleted boards, categories and archived goals older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.RETENTION_DAYS, help='retention period in days')
+        parser.add_argument('--batch-size', type=int, default=settings.PURGE_BATCH_SIZE, help='rows per transaction')
+        parser.add_argument('--pause', type=float, default=settings.PURGE_PAUSE, help='seconds between transactions')
+        parser.add_argument(
+            '--max-replica-lag',
+            type=float,
+            default=settings.PURGE_MAX_REPLICA_LAG,
+            help='wait while any replica lags behind more than this many seconds',
+        )
+        parser.add_argument('--vacuum', action='store_true', help='run VACUUM (ANALYZE) on purged tables')
+
+    def handle(self, *args, **options):
+        purger = Purger(options['batch_size'], options['pause'], options['max_replica_lag'])
+        deleted = purger.purge(timezone.now() - timedelta(days=options['days']))
+        for model, count in deleted.items():
+            self.stdout.write(f'{model._meta.label}: {count} rows deleted')
+        if options['vacuum'] and deleted:
+            vacuum(deleted)
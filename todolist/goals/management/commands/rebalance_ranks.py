@@ -0,0 +1,21 @@
+from django.core.management import BaseCommand
+
+from todolist.goals.models import Goal, GoalCategory
+from todolist.goals.ranking import RANK_MAX_LENGTH, long_rank_scopes, rebalance
+
+
+class Command(BaseCommand):
+    """Перебалансировка рангов ручной сортировки в группах с длинными ключами, запускается по расписанию"""
+
+    help = 'Rewrite long manual-ordering ranks of goals and categories with short ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-length', type=int, default=RANK_MAX_LENGTH, help='rebalance groups with longer ranks'
+        )
+
+    def handle(self, *args, **options):
+        for model in (GoalCategory, Goal):
+            scopes = long_rank_scopes(model, options['max_length'])
+            rows = sum(rebalance(model, scope) for scope in scopes)
+            self.stdout.write(f'{model._meta.label}: {len(scopes)} groups, {rows} rows rebalanced')
@@ -0,0 +1,103 @@
+import json
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core.models import User
+from todolist.goals.fast_serializers import (
+    board_values_serializer,
+    goal_category_values_serializer,
+    goal_values_serializer,
+    goal_comment_values_serializer,
+)
+from todolist.goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
+
+
+class Command(BaseCommand):
+    """Стоимость сериализации одной строки списка: сериализатор DRF на моделях против ValuesSerializer.
+    Все созданные данные откатываются в конце, в базе ничего не остаётся"""
+
+    help = 'Measure per-row serialization cost of list endpoints with DRF serializers and the .values() fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='rows per page, as on a list endpoint')
+        parser.add_argument('--repeat', type=int, default=200, help='pages serialized per measurement')
+        parser.add_argument('--json', action='store_true', help='print results as JSON')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        with transaction.atomic():
+            self.create_data(rows)
+            querysets = {
+                'boards': (board_values_serializer, Board.objects.filter(title__startswith='Benchmark')),
+                'categories': (goal_category_values_serializer, GoalCategory.objects.select_related('user')),
+                'goals': (goal_values_serializer, Goal.objects.select_related('user')),
+                'comments': (goal_comment_values_serializer, GoalComment.objects.select_related('user')),
+            }
+            results = {}
+            for name, (values_serializer, queryset) in querysets.items():
+                queryset = queryset.order_by('pk')[:rows]
+                objects = list(queryset)
+                values = list(values_serializer.values(queryset))
+
+                drf = values_serializer.serializer_class(objects, many=True).data
+                fast = values_serializer.serialize(values)
+                if JSONRenderer().render(drf) != JSONRenderer().render(fast):
+                    raise CommandError(f'{name}: fast path output differs from DRF')
+
+                results[name] = {
+                    'rows': len(objects),
+                    'drf_us_per_row': self.measure(
+                        lambda: values_serializer.serializer_class(objects, many=True).data, repeat, len(objects)
+                    ),
+                    'values_us_per_row': self.measure(
+                        lambda: values_serializer.serialize(values), repeat, len(objects)
+                    ),
+                    # с выборкой из базы: модели с select_related против .values()
+                    'drf_with_query_us_per_row': self.measure(
+                        lambda: values_serializer.serializer_class(list(queryset.all()), many=True).data,
+                        repeat // 10 or 1,
+                        len(objects),
+                    ),
+                    'values_with_query_us_per_row': self.measure(
+                        lambda: values_serializer.serialize(list(values_serializer.values(queryset.all()))),
+                        repeat // 10 or 1,
+                        len(objects),
+                    ),
+                }
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, stats in results.items():
+            self.stdout.write(
+                f'{name} ({stats["rows"]} rows): serialization {stats["drf_us_per_row"]} -> '
+                f'{stats["values_us_per_row"]} us/row, with query {stats["drf_with_query_us_per_row"]} -> '
+                f'{stats["values_with_query_us_per_row"]} us/row'
+            )
+
+    @staticmethod
+    def measure(func, repeat: int, rows: int) -> float:
+        func()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return round((time.perf_counter() - started) / repeat / rows * 10**6, 2)
+
+    @staticmethod
+    def create_data(rows: int) -> None:
+        user = User.objects.create_user(username='serialization_benchmark', email='benchmark@example.com')
+        boards = Board.objects.bulk_create(Board(title=f'Benchmark board {i}') for i in range(rows))
+        BoardParticipant.objects.bulk_create(BoardParticipant(board=board, user=user) for board in boards)
+        categories = GoalCategory.objects.bulk_create(
+            GoalCategory(board=boards[0], user=user, title=f'Benchmark category {i}') for i in range(rows)
+        )
+        goals = Goal.objects.bulk_create(
+            Goal(user=user, category=categories[0], title=f'Benchmark goal {i}', description='x' * 100)
+            for i in range(rows)
+        )
+        GoalComment.objects.bulk_create(GoalComment(user=user, goal=goals[0], text=f'Comment {i}') for i in range(rows))
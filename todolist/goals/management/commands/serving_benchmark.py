@@ -0,0 +1,179 @@
+import asyncio
+import importlib
+import json
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, transaction
+from django.test import RequestFactory, override_settings
+from django.urls import clear_url_caches, reverse
+
+from core.models import User
+from core.tokens import issue_tokens
+from todolist.goals import urls as goals_urls
+from todolist.goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
+
+HOST = 'benchmark.local'
+
+
+@contextmanager
+def read_views(async_views: bool):
+    """Подключает синхронные или асинхронные вью чтения, как это делает ASYNC_READ_VIEWS при старте"""
+    with override_settings(ASYNC_READ_VIEWS=async_views):
+        reload_urlconf()
+        yield
+    reload_urlconf()
+
+
+def reload_urlconf() -> None:
+    importlib.reload(goals_urls)
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+class Command(BaseCommand):
+    """Сравнение одного синхронного WSGI воркера с одним ASGI воркером на медленных клиентах.
+    Все созданные данные откатываются в конце, в базе ничего не остаётся"""
+
+    help = 'Compare requests per second and concurrency of a WSGI worker and an ASGI worker on read endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='requests per endpoint and server')
+        parser.add_argument('--concurrency', type=int, default=50, help='simultaneous clients of the ASGI worker')
+        parser.add_argument('--client-delay', type=float, default=0.05, help='seconds a slow client reads a response')
+        parser.add_argument('--goals', type=int, default=100, help='goals on the benchmark board')
+        parser.add_argument('--json', action='store_true', help='print results as JSON')
+
+    def handle(self, *args, **options):
+        self.client_delay = options['client_delay']
+        results = {}
+
+        # Соединение внутри откатываемой транзакции не должно закрываться между запросами
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            with transaction.atomic():
+                paths, token = self.create_data(options['goals'])
+                self.authorization = f'Bearer {token}'.encode()
+
+                for name, path in paths.items():
+                    with read_views(async_views=False):
+                        wsgi = self.run_wsgi(path, options['requests'])
+                    with read_views(async_views=True):
+                        asgi = async_to_sync(self.run_asgi)(path, options['requests'], options['concurrency'])
+                    results[name] = {'wsgi': wsgi, 'asgi': asgi}
+
+                transaction.set_rollback(True)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f'1 worker, slow clients read each response for {self.client_delay * 1000:.0f} ms')
+        for name, servers in results.items():
+            for server, stats in servers.items():
+                self.stdout.write(
+                    f'{name} {server}: {stats["requests_per_second"]} req/s, '
+                    f'concurrency {stats["concurrency"]}, p50 {stats["p50_ms"]} ms'
+                )
+
+    def create_data(self, goals: int) -> tuple[dict[str, str], str]:
+        user = User.objects.create_user(username='serving_benchmark', password='Benchmark-password-1')
+        board = Board.objects.create(title='Serving benchmark')
+        BoardParticipant.objects.create(board=board, user=user, role=BoardParticipant.Role.owner)
+        category = GoalCategory.objects.create(board=board, user=user, title='Serving benchmark')
+        Goal.objects.bulk_create(
+            Goal(user=user, category=category, title=f'Benchmark goal {i}', description='x' * 100) for i in range(goals)
+        )
+        goal = Goal.objects.filter(category=category).first()
+        GoalComment.objects.bulk_create(GoalComment(user=user, goal=goal, text=f'Comment {i}') for i in range(50))
+
+        paths = {
+            'goal_list': reverse('todolist.goals:goal_list') + '?limit=50',
+            'board_list': reverse('todolist.goals:board-list'),
+            'comments_list': reverse('todolist.goals:comments_list') + f'?goal={goal.pk}&limit=50',
+            'board': reverse('todolist.goals:board', kwargs={'pk': board.pk}),
+        }
+        return paths, issue_tokens(user)['access']
+
+    def run_wsgi(self, path: str, requests: int) -> dict:
+        """Синхронный воркер обслуживает клиентов по очереди и занят, пока клиент читает ответ"""
+        handler = WSGIHandler()
+        environ = RequestFactory().get(path, HTTP_AUTHORIZATION=self.authorization.decode(), SERVER_NAME=HOST).environ
+        latencies = []
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started_at = time.perf_counter()
+            response = handler(dict(environ), self.check_status)
+            for _chunk in response:
+                time.sleep(self.client_delay)
+            response.close()
+            latencies.append(time.perf_counter() - request_started_at)
+        return self.summary(latencies, time.perf_counter() - started)
+
+    async def run_asgi(self, path: str, requests: int, concurrency: int) -> dict:
+        """Асинхронный воркер переключается на другие запросы, пока клиенты читают ответы"""
+        application = ASGIHandler()
+        url = urlsplit(path)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': url.path,
+            'raw_path': url.path.encode(),
+            'query_string': url.query.encode(),
+            'headers': [(b'host', HOST.encode()), (b'authorization', self.authorization)],
+            'client': ('127.0.0.1', 0),
+            'server': (HOST, 80),
+        }
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def receive() -> dict:
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message: dict) -> None:
+            if message['type'] == 'http.response.start':
+                self.check_status(str(message['status']), [])
+            elif message['type'] == 'http.response.body':
+                await asyncio.sleep(self.client_delay)
+
+        async def client() -> None:
+            async with semaphore:
+                request_started_at = time.perf_counter()
+                await application(dict(scope), receive, send)
+                latencies.append(time.perf_counter() - request_started_at)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(requests)))
+        return self.summary(latencies, time.perf_counter() - started)
+
+    @staticmethod
+    def check_status(status: str, headers: list) -> None:
+        if not status.startswith('200'):
+            raise RuntimeError(f'Benchmark request failed with status {status}')
+
+    @staticmethod
+    def summary(latencies: list[float], elapsed: float) -> dict:
+        latencies = sorted(latencies)
+        return {
+            'requests': len(latencies),
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(len(latencies) / elapsed, 1),
+            # По закону Литтла: среднее число запросов, одновременно находящихся в обработке воркером
+            'concurrency': round(sum(latencies) / elapsed, 1),
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        }
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0005_alter_goalcategory_board'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True), fields=['user', 'id'], name='goal_user_live_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0006_goal_user_live_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status__in', (1, 2))), fields=['due_date'], name='goal_due_date_open_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:28
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_deleted(apps, schema_editor):
+    # Дата удаления раньше не сохранялась, для уже удалённых досок и категорий берётся дата последнего обновления
+    for model_name in ('Board', 'GoalCategory'):
+        apps.get_model('goals', model_name).objects.filter(is_deleted=True).update(deleted=F('updated'))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0008_archivedgoal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='deleted',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата удаления'),
+        ),
+        migrations.AddField(
+            model_name='goalcategory',
+            name='deleted',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата удаления'),
+        ),
+        migrations.RunPython(fill_deleted, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='archivedgoal',
+            index=models.Index(fields=['archived'], name='archived_goal_archived_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted'], name='board_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcategory',
+            index=models.Index(
+                condition=models.Q(('is_deleted', True)), fields=['deleted'], name='goal_category_deleted_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0009_retention'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='goal',
+            name='goal_user_live_idx',
+        ),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['id'], name='board_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status__in', (1, 2, 3))), fields=['user', 'id'], name='goal_user_live_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status__in', (1, 2, 3))), fields=['category'], name='goal_category_live_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='goalcategory',
+            index=models.Index(
+                condition=models.Q(('is_deleted', False)), fields=['board'], name='goal_category_board_live_idx'
+            ),
+        ),
+    ]
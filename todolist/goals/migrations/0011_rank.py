@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:40
+
+from django.db import migrations, models
+
+# Начальные ранги в порядке создания: n * 10 + 5 десятичными цифрами одной длины в группе,
+# цифры входят в алфавит рангов, ключи не заканчиваются на 0
+INITIAL_RANKS_SQL = """
+UPDATE {table} t SET rank = lpad((r.n * 10 + 5)::text, length((r.total * 10 + 5)::text), '0')
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY {scope} ORDER BY created, id) AS n,
+           count(*) OVER (PARTITION BY {scope}) AS total
+    FROM {table} WHERE {live}
+) r
+WHERE t.id = r.id
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0010_live_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='goal',
+            name='goal_category_live_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='goalcategory',
+            name='goal_category_board_live_idx',
+        ),
+        migrations.AddField(
+            model_name='goal',
+            name='rank',
+            field=models.CharField(blank=True, db_collation='C', default='', max_length=255, verbose_name='Ранг'),
+        ),
+        migrations.AddField(
+            model_name='goalcategory',
+            name='rank',
+            field=models.CharField(blank=True, db_collation='C', default='', max_length=255, verbose_name='Ранг'),
+        ),
+        migrations.AddField(
+            model_name='archivedgoal',
+            name='rank',
+            field=models.CharField(blank=True, db_collation='C', default='', max_length=255, verbose_name='Ранг'),
+        ),
+        migrations.RunSQL(
+            INITIAL_RANKS_SQL.format(table='goals_goal', scope='category_id', live='status IN (1, 2, 3)'),
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            INITIAL_RANKS_SQL.format(table='goals_goalcategory', scope='board_id', live='NOT is_deleted'),
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status__in', (1, 2, 3))),
+                fields=['category', 'rank'],
+                name='goal_category_live_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='goalcategory',
+            index=models.Index(
+                condition=models.Q(('is_deleted', False)), fields=['board', 'rank'], name='goal_category_board_live_idx'
+            ),
+        ),
+    ]
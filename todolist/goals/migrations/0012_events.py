@@ -0,0 +1,100 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:12
+
+from django.db import migrations
+
+# Уведомления об изменениях строк для потока событий досок, см. todolist/goals/events.py.
+# Доска строки определяется по таблице, удаление флагом is_deleted и перенос цели в архив (status = 4)
+# публикуются как delete. Строки, доска которых уже не находится (комментарии удалённой цели), пропускаются
+EVENTS_SQL = """
+CREATE SEQUENCE goals_event_version_seq;
+
+CREATE FUNCTION goals_notify_event() RETURNS trigger AS $$
+DECLARE
+    entity text := TG_ARGV[0];
+    op text := CASE TG_OP WHEN 'INSERT' THEN 'create' ELSE lower(TG_OP) END;
+    rec record;
+    board bigint;
+    payload json;
+BEGIN
+    IF current_setting('todolist.skip_events', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        rec := OLD;
+    ELSE
+        rec := NEW;
+    END IF;
+
+    IF entity = 'board' THEN
+        board := rec.id;
+    ELSIF entity IN ('participant', 'category') THEN
+        board := rec.board_id;
+    ELSIF entity = 'goal' THEN
+        SELECT c.board_id INTO board FROM goals_goalcategory c WHERE c.id = rec.category_id;
+    ELSE
+        SELECT c.board_id INTO board
+        FROM goals_goal g JOIN goals_goalcategory c ON c.id = g.category_id
+        WHERE g.id = rec.goal_id;
+    END IF;
+    IF board IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- поля записи проверяются только в ветке своей таблицы
+    IF TG_OP = 'UPDATE' AND entity IN ('board', 'category') THEN
+        IF NEW.is_deleted AND NOT OLD.is_deleted THEN
+            op := 'delete';
+        END IF;
+    ELSIF TG_OP = 'UPDATE' AND entity = 'goal' THEN
+        IF NEW.status = 4 AND OLD.status <> 4 THEN
+            op := 'delete';
+        END IF;
+    END IF;
+
+    IF entity = 'participant' THEN
+        payload := json_build_object(
+            'board', board, 'entity', entity, 'id', rec.id, 'op', op,
+            'version', nextval('goals_event_version_seq'), 'user', rec.user_id
+        );
+    ELSE
+        payload := json_build_object(
+            'board', board, 'entity', entity, 'id', rec.id, 'op', op,
+            'version', nextval('goals_event_version_seq')
+        );
+    END IF;
+    PERFORM pg_notify('goals_events', payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_board_events AFTER INSERT OR UPDATE OR DELETE ON goals_board
+    FOR EACH ROW EXECUTE FUNCTION goals_notify_event('board');
+CREATE TRIGGER goals_boardparticipant_events AFTER INSERT OR UPDATE OR DELETE ON goals_boardparticipant
+    FOR EACH ROW EXECUTE FUNCTION goals_notify_event('participant');
+CREATE TRIGGER goals_goalcategory_events AFTER INSERT OR UPDATE OR DELETE ON goals_goalcategory
+    FOR EACH ROW EXECUTE FUNCTION goals_notify_event('category');
+CREATE TRIGGER goals_goal_events AFTER INSERT OR UPDATE OR DELETE ON goals_goal
+    FOR EACH ROW EXECUTE FUNCTION goals_notify_event('goal');
+CREATE TRIGGER goals_goalcomment_events AFTER INSERT OR UPDATE OR DELETE ON goals_goalcomment
+    FOR EACH ROW EXECUTE FUNCTION goals_notify_event('comment');
+"""
+
+DROP_EVENTS_SQL = """
+DROP TRIGGER goals_board_events ON goals_board;
+DROP TRIGGER goals_boardparticipant_events ON goals_boardparticipant;
+DROP TRIGGER goals_goalcategory_events ON goals_goalcategory;
+DROP TRIGGER goals_goal_events ON goals_goal;
+DROP TRIGGER goals_goalcomment_events ON goals_goalcomment;
+DROP FUNCTION goals_notify_event();
+DROP SEQUENCE goals_event_version_seq;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0011_rank'),
+    ]
+
+    operations = [
+        migrations.RunSQL(EVENTS_SQL, DROP_EVENTS_SQL),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:40
+
+from django.db import migrations
+
+TABLES = {
+    'goals_board': 'board',
+    'goals_boardparticipant': 'participant',
+    'goals_goalcategory': 'category',
+    'goals_goal': 'goal',
+    'goals_goalcomment': 'comment',
+}
+
+# Отключённые события проверяются в условии WHEN, без вызова функции триггера на каждую строку
+# массовой вставки: копирование доски, загрузка набора данных
+CREATE_SQL = """
+DROP TRIGGER {table}_events ON {table};
+CREATE TRIGGER {table}_events AFTER INSERT OR UPDATE OR DELETE ON {table}
+    FOR EACH ROW WHEN (current_setting('todolist.skip_events', true) IS DISTINCT FROM 'on')
+    EXECUTE FUNCTION goals_notify_event('{entity}');
+"""
+
+REVERSE_SQL = """
+DROP TRIGGER {table}_events ON {table};
+CREATE TRIGGER {table}_events AFTER INSERT OR UPDATE OR DELETE ON {table}
+    FOR EACH ROW EXECUTE FUNCTION goals_notify_event('{entity}');
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0012_events'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL.format(table=table, entity=entity), REVERSE_SQL.format(table=table, entity=entity))
+        for table, entity in TABLES.items()
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:02
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.functions.text
+
+SEARCH_INDEXES = [
+    (
+        'goal',
+        django.contrib.postgres.indexes.GinIndex(
+            django.contrib.postgres.indexes.OpClass(
+                django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'
+            ),
+            name='goal_title_search_idx',
+        ),
+    ),
+    (
+        'goal',
+        django.contrib.postgres.indexes.GinIndex(
+            django.contrib.postgres.indexes.OpClass(
+                django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'
+            ),
+            name='goal_description_search_idx',
+        ),
+    ),
+    (
+        'goalcategory',
+        django.contrib.postgres.indexes.GinIndex(
+            django.contrib.postgres.indexes.OpClass(
+                django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'
+            ),
+            name='goal_category_title_search_idx',
+        ),
+    ),
+    (
+        'goalcomment',
+        django.contrib.postgres.indexes.GinIndex(
+            django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('text'), name='gin_trgm_ops'),
+            name='goal_comment_text_search_idx',
+        ),
+    ),
+]
+
+
+def add_search_indexes(apps, schema_editor):
+    # Сборки PostgreSQL без contrib не содержат pg_trgm, поиск в админке там работает без индексов
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for model_name, index in SEARCH_INDEXES:
+        schema_editor.add_index(apps.get_model('goals', model_name), index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    for _, index in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0013_events_when'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(add_search_indexes, remove_search_indexes)],
+            state_operations=[
+                migrations.AddIndex(model_name=model_name, index=index) for model_name, index in SEARCH_INDEXES
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='goalcomment',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created'], name='goal_comment_created_brin'),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:05
+
+from django.db import migrations
+
+# Перенос цели в категорию другой доски и категории в другую доску публикуется ещё и как delete для прежней
+# доски: её подписчики больше не получат событий этой строки. Остальное как в 0012_events
+EVENTS_SQL = """
+CREATE OR REPLACE FUNCTION goals_notify_event() RETURNS trigger AS $$
+DECLARE
+    entity text := TG_ARGV[0];
+    op text := CASE TG_OP WHEN 'INSERT' THEN 'create' ELSE lower(TG_OP) END;
+    rec record;
+    board bigint;
+    old_board bigint;
+    payload json;
+BEGIN
+    IF current_setting('todolist.skip_events', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        rec := OLD;
+    ELSE
+        rec := NEW;
+    END IF;
+
+    IF entity = 'board' THEN
+        board := rec.id;
+    ELSIF entity IN ('participant', 'category') THEN
+        board := rec.board_id;
+    ELSIF entity = 'goal' THEN
+        SELECT c.board_id INTO board FROM goals_goalcategory c WHERE c.id = rec.category_id;
+    ELSE
+        SELECT c.board_id INTO board
+        FROM goals_goal g JOIN goals_goalcategory c ON c.id = g.category_id
+        WHERE g.id = rec.goal_id;
+    END IF;
+
+    -- поля записи проверяются только в ветке своей таблицы
+    IF TG_OP = 'UPDATE' AND entity = 'category' THEN
+        IF NEW.board_id <> OLD.board_id THEN
+            old_board := OLD.board_id;
+        END IF;
+    ELSIF TG_OP = 'UPDATE' AND entity = 'goal' THEN
+        IF NEW.category_id <> OLD.category_id THEN
+            SELECT c.board_id INTO old_board FROM goals_goalcategory c WHERE c.id = OLD.category_id;
+        END IF;
+    END IF;
+    IF old_board IS NOT NULL AND old_board IS DISTINCT FROM board THEN
+        payload := json_build_object(
+            'board', old_board, 'entity', entity, 'id', rec.id, 'op', 'delete',
+            'version', nextval('goals_event_version_seq')
+        );
+        PERFORM pg_notify('goals_events', payload::text);
+    END IF;
+    IF board IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND entity IN ('board', 'category') THEN
+        IF NEW.is_deleted AND NOT OLD.is_deleted THEN
+            op := 'delete';
+        END IF;
+    ELSIF TG_OP = 'UPDATE' AND entity = 'goal' THEN
+        IF NEW.status = 4 AND OLD.status <> 4 THEN
+            op := 'delete';
+        END IF;
+    END IF;
+
+    IF entity = 'participant' THEN
+        payload := json_build_object(
+            'board', board, 'entity', entity, 'id', rec.id, 'op', op,
+            'version', nextval('goals_event_version_seq'), 'user', rec.user_id
+        );
+    ELSE
+        payload := json_build_object(
+            'board', board, 'entity', entity, 'id', rec.id, 'op', op,
+            'version', nextval('goals_event_version_seq')
+        );
+    END IF;
+    PERFORM pg_notify('goals_events', payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0014_admin_search'),
+    ]
+
+    operations = [
+        # функция совместима со схемой 0012_events, откат её не меняет
+        migrations.RunSQL(EVENTS_SQL, migrations.RunSQL.noop),
+    ]
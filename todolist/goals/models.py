@@ -1,6 +1,13 @@
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 from core.models import User
+from todolist.goals import ranking
+
+# Поиск в админке (icontains) сравнивает UPPER(поле) LIKE '%...%', такое условие обслуживают триграммные
+# GIN индексы по UPPER(поле). Нужно расширение pg_trgm, без него индексы не создаются (миграция 0014)
+SEARCH_OPCLASS = 'gin_trgm_ops'
 
 
 class BaseModel(models.Model):
@@ -13,15 +20,58 @@ class BaseModel(models.Model):
         abstract = True
 
 
+class RankedModel(models.Model):
+    """Абстрактная модель с ручной сортировкой внутри группы rank_scope среди объектов менеджера live,
+    ключи описаны в todolist.goals.ranking. Новый объект добавляется в конец группы"""
+
+    rank_scope: str
+
+    rank = models.CharField(verbose_name='Ранг', max_length=255, blank=True, default='', db_collation='C')
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs) -> None:
+        if self._state.adding and not self.rank:
+            self.rank = ranking.next_rank(self)
+        super().save(*args, **kwargs)
+
+
+class LiveManager(models.Manager):
+    """Неудалённые доски и категории. Условие is_deleted=False совпадает с условием частичных индексов,
+    поэтому запросы не читают удалённые строки"""
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(is_deleted=False)
+
+
+class LiveGoalManager(models.Manager):
+    """Неархивные цели, статусы перечислены явно, как в условиях частичных индексов"""
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(status__in=self.model.live_statuses)
+
+
 class Board(BaseModel):
     """Модель доски"""
 
     class Meta:
         verbose_name = 'Доска'
         verbose_name_plural = 'Доски'
+        indexes = [
+            # поиск удалённых досок с истёкшим сроком хранения
+            models.Index(fields=('deleted',), condition=models.Q(is_deleted=True), name='board_deleted_idx'),
+            # доски участника соединяются только с неудалёнными
+            models.Index(fields=('id',), condition=models.Q(is_deleted=False), name='board_live_idx'),
+        ]
 
     title = models.CharField(verbose_name='Название', max_length=255)
     is_deleted = models.BooleanField(verbose_name='Удалена', default=False)
+    deleted = models.DateTimeField(verbose_name='Дата удаления', null=True, blank=True)
+
+    # objects объявлен первым и остаётся менеджером по умолчанию для админки и связей
+    objects = models.Manager()
+    live = LiveManager()
 
     def __str__(self) -> str:
         return self.title
@@ -47,25 +97,43 @@ class BoardParticipant(BaseModel):
     editable_roles: list[tuple[int, str]] = Role.choices[1:]
 
 
-class GoalCategory(BaseModel):
+class GoalCategory(RankedModel, BaseModel):
     """Модель категории"""
 
+    rank_scope = 'board'
+
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            # поиск удалённых категорий с истёкшим сроком хранения
+            models.Index(fields=('deleted',), condition=models.Q(is_deleted=True), name='goal_category_deleted_idx'),
+            # категории досок участника и их ручная сортировка
+            models.Index(
+                fields=('board', 'rank'), condition=models.Q(is_deleted=False), name='goal_category_board_live_idx'
+            ),
+            # поиск в админке, см. SEARCH_OPCLASS
+            GinIndex(OpClass(Upper('title'), name=SEARCH_OPCLASS), name='goal_category_title_search_idx'),
+        ]
 
     title = models.CharField(verbose_name='Название', max_length=255)
     user = models.ForeignKey(User, verbose_name='Автор', on_delete=models.PROTECT)
     is_deleted = models.BooleanField(verbose_name='Удалена', default=False)
+    deleted = models.DateTimeField(verbose_name='Дата удаления', null=True, blank=True)
     board = models.ForeignKey(Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='categories')
 
+    objects = models.Manager()
+    live = LiveManager()
+
     def __str__(self) -> str:
         return self.title
 
 
-class Goal(BaseModel):
+class Goal(RankedModel, BaseModel):
     """Модель цели"""
 
+    rank_scope = 'category'
+
     class Status(models.IntegerChoices):
         to_do = 1, 'К выполнению'
         in_progress = 2, 'В процессе'
@@ -86,9 +154,27 @@ class Goal(BaseModel):
     status = models.PositiveSmallIntegerField(choices=Status.choices, default=Status.to_do)
     priority = models.PositiveSmallIntegerField(choices=Priority.choices, default=Priority.medium)
 
+    live_statuses: tuple[int, ...] = (Status.to_do, Status.in_progress, Status.done)
+
+    objects = models.Manager()
+    live = LiveGoalManager()
+
     class Meta:
         verbose_name = 'Цель'
         verbose_name_plural = 'Цели'
+        indexes = [
+            # keyset-пагинация целей пользователя в боте, 1, 2, 3 - live_statuses
+            models.Index(fields=('user', 'id'), condition=models.Q(status__in=(1, 2, 3)), name='goal_user_live_idx'),
+            # цели категорий досок участника и их ручная сортировка
+            models.Index(
+                fields=('category', 'rank'), condition=models.Q(status__in=(1, 2, 3)), name='goal_category_live_idx'
+            ),
+            # поиск целей с подходящим сроком для напоминаний, 1, 2 - Status.to_do, Status.in_progress
+            models.Index(fields=('due_date',), condition=models.Q(status__in=(1, 2)), name='goal_due_date_open_idx'),
+            # поиск в админке, см. SEARCH_OPCLASS
+            GinIndex(OpClass(Upper('title'), name=SEARCH_OPCLASS), name='goal_title_search_idx'),
+            GinIndex(OpClass(Upper('description'), name=SEARCH_OPCLASS), name='goal_description_search_idx'),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -100,6 +186,12 @@ class GoalComment(BaseModel):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            # поиск в админке, см. SEARCH_OPCLASS
+            GinIndex(OpClass(Upper('text'), name=SEARCH_OPCLASS), name='goal_comment_text_search_idx'),
+            # фильтр по дате создания в админке: даты растут вместе с id, BRIN занимает несколько страниц
+            BrinIndex(fields=('created',), name='goal_comment_created_brin'),
+        ]
 
     user = models.ForeignKey(User, on_delete=models.PROTECT, related_name='comments')
     goal = models.ForeignKey(Goal, on_delete=models.CASCADE, related_name='comments')
@@ -107,3 +199,47 @@ class GoalComment(BaseModel):
 
     def __str__(self) -> str:
         return self.text
+
+
+class ArchivedGoal(models.Model):
+    """Архивная цель: цели в статусе Status.archived переносятся сюда командой archive_goals с тем же id,
+    чтобы таблица и индексы целей содержали только живые данные"""
+
+    class Meta:
+        verbose_name = 'Архивная цель'
+        verbose_name_plural = 'Архивные цели'
+        indexes = [models.Index(fields=('archived',), name='archived_goal_archived_idx')]
+
+    id = models.BigIntegerField(primary_key=True)
+    created = models.DateTimeField(verbose_name='Дата создания')
+    updated = models.DateTimeField(verbose_name='Дата последнего обновления')
+    archived = models.DateTimeField(verbose_name='Дата переноса в архив')
+    title = models.CharField(max_length=255)
+    description = models.TextField(null=True, blank=True)
+    category = models.ForeignKey(GoalCategory, on_delete=models.PROTECT, related_name='archived_goals')
+    due_date = models.DateField(null=True, blank=True)
+    user = models.ForeignKey(User, on_delete=models.PROTECT, related_name='archived_goals')
+    status = models.PositiveSmallIntegerField(choices=Goal.Status.choices, default=Goal.Status.archived)
+    priority = models.PositiveSmallIntegerField(choices=Goal.Priority.choices, default=Goal.Priority.medium)
+    rank = models.CharField(verbose_name='Ранг', max_length=255, blank=True, default='', db_collation='C')
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class ArchivedGoalComment(models.Model):
+    """Комментарий архивной цели"""
+
+    class Meta:
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
+
+    id = models.BigIntegerField(primary_key=True)
+    created = models.DateTimeField(verbose_name='Дата создания')
+    updated = models.DateTimeField(verbose_name='Дата последнего обновления')
+    user = models.ForeignKey(User, on_delete=models.PROTECT, related_name='archived_comments')
+    goal = models.ForeignKey(ArchivedGoal, on_delete=models.CASCADE, related_name='comments')
+    text = models.TextField()
+
+    def __str__(self) -> str:
+        return self.text
@@ -0,0 +1,140 @@
+"""Ключи ручной сортировки.
+
+Ранг - строка из цифр DIGITS, которая сравнивается побайтно (collation "C") как дробь 0.<ранг>
+в системе счисления по основанию 62. Ранги сравниваются среди объектов менеджера live одной группы.
+Между любыми двумя рангами есть ещё один, поэтому перемещение объекта меняет ранг только у него.
+Ранги не заканчиваются на '0', чтобы место оставалось и перед ними. Частые вставки в одно место
+удлиняют ключи, команда rebalance_ranks переписывает их короткими.
+"""
+from django.db import models, transaction
+from django.db.models import Max, Q
+from django.db.models.functions import Length
+
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+# ранги длиннее перебалансируются
+RANK_MAX_LENGTH = 12
+
+
+def rank_between(before: str, after: str | None) -> str:
+    """Ранг строго между before и after. Пустой before - начало, after=None - конец.
+    ValueError, если ранги не упорядочены или равны и места между ними нет"""
+    if before.endswith('0') or (after is not None and (not after or after.endswith('0') or before >= after)):
+        raise ValueError(f'No rank between {before!r} and {after!r}')
+    if after is None and before:
+        return _increment(before)
+    return _midpoint(before, after)
+
+
+def _increment(before: str) -> str:
+    """Ранг после before для добавления в конец: увеличивается самая правая цифра, отличная от последней
+    цифры алфавита, хвост отбрасывается. Ключ растёт на разряд только после BASE - 1 добавлений подряд"""
+    stripped = before.rstrip(DIGITS[-1])
+    if not stripped:
+        return before + DIGITS[1]
+    return stripped[:-1] + DIGITS[DIGITS.index(stripped[-1]) + 1]
+
+
+def _midpoint(before: str, after: str | None) -> str:
+    if after is not None:
+        # общий префикс переносится как есть, before дополняется нулями
+        n = 0
+        while n < len(after) and (before[n] if n < len(before) else '0') == after[n]:
+            n += 1
+        if n:
+            return after[:n] + _midpoint(before[n:], after[n:])
+
+    digit_before = DIGITS.index(before[0]) if before else 0
+    digit_after = DIGITS.index(after[0]) if after is not None else BASE
+    if digit_after - digit_before > 1:
+        return DIGITS[(digit_before + digit_after + 1) // 2]
+    # соседние цифры: берётся первая цифра after, если за ней что-то есть, иначе следующий разряд
+    if after is not None and len(after) > 1:
+        return after[0]
+    return DIGITS[digit_before] + _midpoint(before[1:], None)
+
+
+def spread_ranks(count: int) -> list[str]:
+    """count возрастающих рангов минимальной длины, равномерно распределённых с промежутками для вставок"""
+    return [spread_rank(index, count) for index in range(count)]
+
+
+def spread_rank(index: int, count: int) -> str:
+    """Ранг с номером index из spread_ranks(count)"""
+    length = 1
+    while BASE**length <= 2 * count:
+        length += 1
+    return _encode(BASE**length // (count + 1) * (index + 1), length).rstrip('0')
+
+
+def _encode(value: int, length: int) -> str:
+    digits = []
+    for _ in range(length):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits))
+
+
+def scope_filter(obj: models.Model) -> dict:
+    """Условие на объекты той же группы сортировки, например целей той же категории"""
+    attname = obj._meta.get_field(obj.rank_scope).attname
+    return {attname: getattr(obj, attname)}
+
+
+def next_rank(obj: models.Model) -> str:
+    """Ранг в конце группы, одним запросом по индексу (группа, ранг)"""
+    last = type(obj).live.filter(**scope_filter(obj)).aggregate(last=Max('rank'))['last']
+    return rank_between(last or '', None)
+
+
+def move_after(obj: models.Model, after: models.Model | None) -> None:
+    """Ставит obj сразу после after, в начало группы при after=None. Обновляется одна строка,
+    если соседи с одинаковыми рангами не оставляют места или новый ранг длиннее RANK_MAX_LENGTH
+    (повторные вставки в одно место) - группа сначала перебалансируется"""
+    model = type(obj)
+    siblings = model.live.filter(**scope_filter(obj)).exclude(pk=obj.pk).order_by('rank', 'pk')
+    for attempt in range(2):
+        if after is None:
+            before, following = '', siblings.values_list('rank', flat=True).first()
+        else:
+            before = after.rank
+            following = (
+                siblings.filter(Q(rank__gt=after.rank) | Q(rank=after.rank, pk__gt=after.pk))
+                .values_list('rank', flat=True)
+                .first()
+            )
+        try:
+            rank = rank_between(before, following)
+        except ValueError:
+            if attempt:
+                raise
+        else:
+            if attempt or len(rank) <= RANK_MAX_LENGTH:
+                obj.rank = rank
+                break
+        rebalance(model, scope_filter(obj))
+        if after is not None:
+            after.refresh_from_db(fields=['rank'])
+    model.objects.filter(pk=obj.pk).update(rank=obj.rank)
+
+
+def rebalance(model: type[models.Model], scope: dict) -> int:
+    """Переписывает ранги группы короткими равномерно распределёнными ключами, сохраняя порядок"""
+    with transaction.atomic():
+        objs = list(model.live.filter(**scope).select_for_update().order_by('rank', 'pk').only('pk', 'rank'))
+        for obj, rank in zip(objs, spread_ranks(len(objs))):
+            obj.rank = rank
+        model.objects.bulk_update(objs, ['rank'], batch_size=1000)
+    return len(objs)
+
+
+def long_rank_scopes(model: type[models.Model], max_length: int = RANK_MAX_LENGTH) -> list[dict]:
+    """Группы, в которых есть ранги длиннее max_length"""
+    attname = model._meta.get_field(model.rank_scope).attname
+    return [
+        {attname: value}
+        for value in model.live.values(attname)
+        .annotate(longest=Max(Length('rank')))
+        .filter(longest__gt=max_length)
+        .values_list(attname, flat=True)
+    ]
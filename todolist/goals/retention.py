@@ -0,0 +1,104 @@
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Model, Q, QuerySet
+
+from todolist.db.routers import replica_lag
+from todolist.goals.archive import delete_goal_dependents
+from todolist.goals.events import suppress_events
+from todolist.goals.models import (
+    ArchivedGoal,
+    ArchivedGoalComment,
+    Board,
+    BoardParticipant,
+    Goal,
+    GoalCategory,
+    GoalComment,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def expired_querysets(cutoff: datetime) -> list[QuerySet]:
+    """Строки с истёкшим сроком хранения в порядке удаления: сначала ссылающиеся, затем те, на которые ссылаются.
+    Удаляются доски, удалённые раньше cutoff, со всем содержимым, удалённые категории с целями и архивные цели,
+    перенесённые в архив раньше cutoff"""
+    boards = Board.objects.filter(is_deleted=True, deleted__lt=cutoff)
+    categories = GoalCategory.objects.filter(Q(is_deleted=True, deleted__lt=cutoff) | Q(board__in=boards))
+    goals = Goal.objects.filter(category__in=categories)
+    archived_goals = ArchivedGoal.objects.filter(Q(archived__lt=cutoff) | Q(category__in=categories))
+    return [
+        GoalComment.objects.filter(goal__in=goals),
+        goals,
+        ArchivedGoalComment.objects.filter(goal__in=archived_goals),
+        archived_goals,
+        categories,
+        BoardParticipant.objects.filter(board__in=boards),
+        boards,
+    ]
+
+
+class Purger:
+    """Удаляет строки пачками по batch_size, каждая пачка в своей транзакции. После пачки делает паузу pause секунд
+    и ждёт, пока отставание реплик не станет меньше max_replica_lag секунд"""
+
+    def __init__(
+        self,
+        batch_size: int = settings.PURGE_BATCH_SIZE,
+        pause: float = settings.PURGE_PAUSE,
+        max_replica_lag: float = settings.PURGE_MAX_REPLICA_LAG,
+    ):
+        self.batch_size = batch_size
+        self.pause = pause
+        self.max_replica_lag = max_replica_lag
+        self.deleted: Counter = Counter()
+
+    def purge(self, cutoff: datetime) -> Counter:
+        """Удаляет всё, что удалено или архивировано раньше cutoff, возвращает количество удалённых строк по моделям"""
+        for queryset in expired_querysets(cutoff):
+            self.delete(queryset)
+        return self.deleted
+
+    def delete(self, queryset: QuerySet) -> None:
+        model = queryset.model
+        table = connection.ops.quote_name(model._meta.db_table)
+        while True:
+            with transaction.atomic():
+                ids = list(queryset.order_by().values_list('pk', flat=True)[: self.batch_size])
+                if not ids:
+                    return
+                # удаляемые строки клиенты уже видят удалёнными
+                suppress_events()
+                if model is Goal:
+                    delete_goal_dependents(ids)
+                with connection.cursor() as cursor:
+                    # без сборщика связанных объектов Django: ссылающиеся строки удалены на предыдущих шагах
+                    cursor.execute(f'DELETE FROM {table} WHERE id = ANY(%s)', [ids])
+                    self.deleted[model] += cursor.rowcount
+            self.throttle()
+
+    def throttle(self) -> None:
+        if self.pause:
+            time.sleep(self.pause)
+        while (lag := self.replica_lag()) > self.max_replica_lag:
+            logger.info('Purge paused, replica lag %.1f s', lag)
+            time.sleep(max(self.pause, 1))
+
+    @staticmethod
+    def replica_lag() -> float:
+        """Наибольшее отставание реплик, недоступная реплика не учитывается"""
+        lags = [replica_lag(alias) for alias in settings.DATABASE_REPLICAS]
+        return max([lag for lag in lags if lag is not None], default=0.0)
+
+
+def vacuum(model_classes: Iterable[type[Model]]) -> None:
+    """VACUUM (ANALYZE) таблиц после удаления: место удалённых строк становится доступно для новых,
+    таблицы и индексы не растут. Выполняется вне транзакции"""
+    with connection.cursor() as cursor:
+        for model in model_classes:
+            cursor.execute(f'VACUUM (ANALYZE) {connection.ops.quote_name(model._meta.db_table)}')
@@ -1,4 +1,6 @@
 from datetime import date
+from typing import Any
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError, PermissionDenied
@@ -16,7 +18,7 @@ class BoardSerializer(serializers.ModelSerializer):
     class Meta:
         model = Board
         read_only_fields = ('id', 'created', 'updated', 'is_deleted')
-        fields = '__all__'
+        exclude = ('deleted',)
 
 
 class BoardParticipantSerializer(serializers.ModelSerializer):
@@ -66,17 +68,18 @@ class GoalCategoryCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания категории"""
 
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    board = serializers.PrimaryKeyRelatedField(
+        queryset=Board.live.all(), error_messages={'does_not_exist': 'Board is deleted'}
+    )
 
     class Meta:
         model = GoalCategory
-        read_only_fields = ('id', 'created', 'updated', 'user', 'is_deleted')
-        fields = '__all__'
+        read_only_fields = ('id', 'created', 'updated', 'user', 'is_deleted', 'rank')
+        exclude = ('deleted',)
 
     def validate_board(self, board: Board) -> Board:
-        """Проверка, что доска не удалена и запрос на создание категории на ней от владельца или редактора"""
-        if board.is_deleted:
-            raise ValidationError('Board is deleted')
-
+        """Проверка, что запрос на создание категории на доске от владельца или редактора,
+        удалённые доски отсекает queryset поля"""
         if not BoardParticipant.objects.filter(
             board_id=board.id,
             user_id=self.context['request'].user.id,
@@ -97,16 +100,18 @@ class GoalCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания цели"""
 
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    category = serializers.PrimaryKeyRelatedField(
+        queryset=GoalCategory.live.all(), error_messages={'does_not_exist': 'Category not found'}
+    )
 
     class Meta:
         model = Goal
-        read_only_fields = ('id', 'created', 'updated', 'user')
+        read_only_fields = ('id', 'created', 'updated', 'user', 'rank')
         fields = '__all__'
 
     def validate_category(self, cat: GoalCategory):
-        """Проверка, что категория не удалена и запрос на создание цели в ней от владельца или редактора"""
-        if cat.is_deleted:
-            raise ValidationError('Category not found')
+        """Проверка, что запрос на создание цели в категории от владельца или редактора,
+        удалённые категории отсекает queryset поля"""
         if not BoardParticipant.objects.filter(
             board_id=cat.board.id,
             user_id=self.context['request'].user.id,
@@ -132,15 +137,17 @@ class GoalCommentCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания комментария"""
 
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    goal = serializers.PrimaryKeyRelatedField(
+        queryset=Goal.live.all(), error_messages={'does_not_exist': 'Goal not found'}
+    )
 
     class Meta:
         model = GoalComment
         fields = '__all__'
 
     def validate_goal(self, goal: Goal):
-        """Проверка, что цель не удалена и запрос на создание комментария в ней от владельца или редактора"""
-        if goal.status == Goal.Status.archived:
-            raise ValidationError('Goal not found')
+        """Проверка, что запрос на создание комментария к цели от владельца или редактора,
+        архивные цели отсекает queryset поля"""
         if not BoardParticipant.objects.filter(
             board_id=goal.category.board.id,
             user_id=self.context['request'].user.id,
@@ -159,3 +166,42 @@ class GoalCommentSerializer(GoalCommentCreateSerializer):
         model = GoalComment
         read_only_fields = ('id', 'created', 'updated', 'user')
         fields = '__all__'
+
+
+class BoardCloneSerializer(serializers.Serializer):
+    """Сериализатор копирования доски: что копировать кроме категорий и название копии,
+    по умолчанию название исходной доски"""
+
+    title = serializers.CharField(max_length=255, required=False)
+    goals = serializers.BooleanField(default=False)
+    participants = serializers.BooleanField(default=False)
+    comments = serializers.BooleanField(default=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs['comments'] and not attrs['goals']:
+            raise ValidationError({'comments': 'Comments are copied only with goals'})
+        return attrs
+
+
+class ReorderSerializer(serializers.Serializer):
+    """Сериализатор перемещения в ручной сортировке: объект ставится сразу после after, без after - в начало.
+    after ищется среди siblings из контекста - объектов той же группы"""
+
+    after = serializers.IntegerField(allow_null=True, required=False, default=None)
+
+    def validate_after(self, value: int | None) -> Any:
+        if value is None:
+            return None
+        sibling = self.context['siblings'].filter(pk=value).first()
+        if sibling is None:
+            raise ValidationError('Not found in the same group')
+        return sibling
+
+
+class EventStreamSerializer(serializers.Serializer):
+    """Параметры потока событий: timeout - через сколько секунд поток закрывается, после чего клиент
+    переподключается"""
+
+    timeout = serializers.IntegerField(
+        min_value=0, max_value=settings.EVENTS_STREAM_TIMEOUT, default=settings.EVENTS_STREAM_TIMEOUT
+    )
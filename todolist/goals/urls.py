@@ -1,19 +1,34 @@
+from django.conf import settings
 from django.urls import path
 
-from todolist.goals import views
+from todolist.goals import views, async_views
 
+if settings.ASYNC_READ_VIEWS:
+    board_list_view = async_views.AsyncBoardListView
+    board_view = async_views.AsyncBoardDetailView
+    goal_list_view = async_views.AsyncGoalListView
+    comment_list_view = async_views.AsyncGoalCommentListView
+else:
+    board_list_view = views.BoardListView
+    board_view = views.BoardDetailView
+    goal_list_view = views.GoalListView
+    comment_list_view = views.GoalCommentListView
 
 urlpatterns = [
     path('board/create', views.BoardCreateView.as_view(), name='create-board'),
-    path('board/list', views.BoardListView.as_view(), name='board-list'),
-    path('board/<int:pk>', views.BoardDetailView.as_view(), name='board'),
+    path('board/list', board_list_view.as_view(), name='board-list'),
+    path('board/<int:pk>', board_view.as_view(), name='board'),
+    path('board/<int:pk>/clone', views.BoardCloneView.as_view(), name='board_clone'),
     path('goal_category/create', views.GoalCategoryCreateView.as_view(), name='create_category'),
     path('goal_category/list', views.GoalCategoryListView.as_view(), name='category_list'),
     path('goal_category/<int:pk>', views.GoalCategoryView.as_view(), name='goal_category'),
+    path('goal_category/<int:pk>/reorder', views.GoalCategoryReorderView.as_view(), name='category_reorder'),
     path('goal/create', views.GoalCreateView.as_view(), name='create_goal'),
-    path('goal/list', views.GoalListView.as_view(), name='goal_list'),
+    path('goal/list', goal_list_view.as_view(), name='goal_list'),
     path('goal/<int:pk>', views.GoalView.as_view(), name='goal'),
+    path('goal/<int:pk>/reorder', views.GoalReorderView.as_view(), name='goal_reorder'),
     path('goal_comment/create', views.GoalCommentCreateView.as_view(), name='create_comment'),
-    path('goal_comment/list', views.GoalCommentListView.as_view(), name='comments_list'),
+    path('goal_comment/list', comment_list_view.as_view(), name='comments_list'),
     path('goal_comment/<int:pk>', views.GoalCommentView.as_view(), name='comment'),
+    path('events', views.EventStreamView.as_view(), name='events'),
 ]
@@ -1,8 +1,25 @@
-from django.db import transaction
+from django.conf import settings
+from django.db import connection, transaction
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics, permissions, filters
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import filters, generics, permissions, status
 from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from todolist.goals.fast_serializers import (
+    ValuesSerializer,
+    board_values_serializer,
+    goal_category_values_serializer,
+    goal_values_serializer,
+    goal_comment_values_serializer,
+)
+from todolist.fastjson import FastJSONRenderer
+from todolist.goals import cloning, events, ranking
 from todolist.goals.filters import GoalDateFilter
 from todolist.goals.models import GoalCategory, Goal, GoalComment, BoardParticipant, Board
 from todolist.goals.permissions import GoalCommentPermission, GoalPermission, GoalCategoryPermission, BoardPermission
@@ -13,11 +30,41 @@ from todolist.goals.serializers import (
     GoalSerializer,
     GoalCommentSerializer,
     GoalCommentCreateSerializer,
+    BoardCloneSerializer,
     BoardSerializer,
     BoardWithParticipantsSerializer,
+    EventStreamSerializer,
+    ReorderSerializer,
 )
 
 
+class ValuesListMixin:
+    """Отдаёт список через ValuesSerializer, минуя создание моделей и полей DRF"""
+
+    values_serializer: ValuesSerializer
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        queryset = self.values_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.values_serializer.serialize(page))
+        return Response(self.values_serializer.serialize(queryset))
+
+
+class ReorderMixin:
+    """Перемещение объекта в ручной сортировке внутри его группы, меняется ранг только этого объекта"""
+
+    @extend_schema(request=ReorderSerializer)
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        instance = self.get_object()
+        siblings = self.get_queryset().filter(**ranking.scope_filter(instance)).exclude(pk=instance.pk)
+        serializer = ReorderSerializer(data=request.data, context={'siblings': siblings})
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            ranking.move_after(instance, serializer.validated_data['after'])
+        return Response(self.get_serializer(instance).data)
+
+
 class BoardCreateView(generics.CreateAPIView):
     """Вью создания доски"""
 
@@ -29,17 +76,18 @@ class BoardCreateView(generics.CreateAPIView):
         BoardParticipant.objects.create(user=self.request.user, board=serializer.save())
 
 
-class BoardListView(generics.ListAPIView):
+class BoardListView(ValuesListMixin, generics.ListAPIView):
     """Вью отображения списка досок"""
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BoardSerializer
+    values_serializer = board_values_serializer
     filter_backends = [filters.OrderingFilter]
     ordering = ['title']
 
     def get_queryset(self) -> QuerySet[Board]:
         """Возвращает все доски кроме удалённых"""
-        return Board.objects.filter(participants__user_id=self.request.user.id).exclude(is_deleted=True)
+        return Board.live.filter(participants__user_id=self.request.user.id)
 
 
 class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -50,14 +98,42 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self) -> QuerySet[Board]:
         """Возвращает все доски пользователя, где он является участником, кроме удалённых"""
-        return Board.objects.filter(participants__user_id=self.request.user.id).exclude(is_deleted=True)
+        return Board.live.filter(participants__user_id=self.request.user.id).prefetch_related('participants__user')
 
     def perform_destroy(self, instance: Board) -> None:
         """Удаление доски с обновлением статуса на удалённый (архивный), в том числе для категорий и целей на ней"""
         with transaction.atomic():
-            Board.objects.filter(id=instance.id).update(is_deleted=True)
-            instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(status=Goal.Status.archived)
+            now = timezone.now()
+            Board.objects.filter(id=instance.id).update(is_deleted=True, deleted=now)
+            # клиентам достаточно события удаления доски
+            events.suppress_events()
+            instance.categories.filter(is_deleted=False).update(is_deleted=True, deleted=now)
+            Goal.live.filter(category__board=instance).update(status=Goal.Status.archived)
+
+
+class BoardCloneView(generics.GenericAPIView):
+    """Вью копирования доски как шаблона. Доска только читается, поэтому копию может сделать любой её участник,
+    но участников в копию переносит только владелец: иначе любой читатель мог бы добавлять их на свои доски"""
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BoardCloneSerializer
+
+    def get_queryset(self) -> QuerySet[Board]:
+        """Возвращает все доски пользователя, где он является участником, кроме удалённых"""
+        return Board.live.filter(participants__user_id=self.request.user.id)
+
+    @extend_schema(responses={201: BoardSerializer})
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        board = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if (
+            serializer.validated_data['participants']
+            and not board.participants.filter(user=request.user, role=BoardParticipant.Role.owner).exists()
+        ):
+            self.permission_denied(request, message='Копировать участников может только владелец доски')
+        clone = cloning.clone_board(board, request.user, **serializer.validated_data)
+        return Response(BoardSerializer(clone).data, status=status.HTTP_201_CREATED)
 
 
 class GoalCategoryCreateView(generics.CreateAPIView):
@@ -67,20 +143,21 @@ class GoalCategoryCreateView(generics.CreateAPIView):
     serializer_class = GoalCategoryCreateSerializer
 
 
-class GoalCategoryListView(generics.ListAPIView):
+class GoalCategoryListView(ValuesListMixin, generics.ListAPIView):
     """Вью отображения списка категорий"""
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalCategorySerializer
+    values_serializer = goal_category_values_serializer
     filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
     filterset_fields = ['board']
-    ordering_fields = ['title', 'created']
+    ordering_fields = ['title', 'created', 'rank']
     ordering = ['title']
     search_fields = ['title']
 
     def get_queryset(self) -> QuerySet[GoalCategory]:
         """Возвращает все категории пользователя из досок, где он является участником, кроме удалённых"""
-        return GoalCategory.objects.filter(board__participants__user=self.request.user).exclude(is_deleted=True)
+        return GoalCategory.live.select_related('user').filter(board__participants__user=self.request.user)
 
 
 class GoalCategoryView(generics.RetrieveUpdateDestroyAPIView):
@@ -91,14 +168,27 @@ class GoalCategoryView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self) -> QuerySet[GoalCategory]:
         """Возвращает все категории пользователя из досок, где он является участником, кроме удалённых"""
-        return GoalCategory.objects.filter(board__participants__user=self.request.user).exclude(is_deleted=True)
+        return GoalCategory.live.select_related('user').filter(board__participants__user=self.request.user)
 
     def perform_destroy(self, instance: GoalCategory) -> None:
         """Обработка удаления категории"""
         with transaction.atomic():
             instance.is_deleted = True
-            instance.save(update_fields=['is_deleted'])
-            instance.goals.update(status=Goal.Status.archived)
+            instance.deleted = timezone.now()
+            instance.save(update_fields=['is_deleted', 'deleted'])
+            events.suppress_events()
+            Goal.live.filter(category=instance).update(status=Goal.Status.archived)
+
+
+class GoalCategoryReorderView(ReorderMixin, generics.GenericAPIView):
+    """Вью перемещения категории в ручной сортировке на доске"""
+
+    serializer_class = GoalCategorySerializer
+    permission_classes = [GoalCategoryPermission]
+
+    def get_queryset(self) -> QuerySet[GoalCategory]:
+        """Возвращает все категории пользователя из досок, где он является участником, кроме удалённых"""
+        return GoalCategory.live.select_related('user').filter(board__participants__user=self.request.user)
 
 
 class GoalCreateView(generics.CreateAPIView):
@@ -108,22 +198,21 @@ class GoalCreateView(generics.CreateAPIView):
     serializer_class = GoalCreateSerializer
 
 
-class GoalListView(generics.ListAPIView):
+class GoalListView(ValuesListMixin, generics.ListAPIView):
     """Вью отображения списка целей"""
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalSerializer
+    values_serializer = goal_values_serializer
     filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
     filterset_class = GoalDateFilter
-    ordering_fields = ('title', 'created')
+    ordering_fields = ('title', 'created', 'rank')
     ordering = ['title']
     search_fields = ('title', 'description')
 
     def get_queryset(self) -> QuerySet[Goal]:
         """Возвращает все цели пользователя из категорий, где он является участником, кроме архивных"""
-        return Goal.objects.filter(category__board__participants__user=self.request.user).exclude(
-            status=Goal.Status.archived
-        )
+        return Goal.live.select_related('user').filter(category__board__participants__user=self.request.user)
 
 
 class GoalView(generics.RetrieveUpdateDestroyAPIView):
@@ -134,9 +223,7 @@ class GoalView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self) -> QuerySet[Goal]:
         """Возвращает все цели пользователя из категорий, где он является участником, кроме архивных"""
-        return Goal.objects.filter(category__board__participants__user=self.request.user).exclude(
-            status=Goal.Status.archived
-        )
+        return Goal.live.select_related('user').filter(category__board__participants__user=self.request.user)
 
     def perform_destroy(self, instance: Goal) -> None:
         """Обработка удаления цели"""
@@ -144,6 +231,17 @@ class GoalView(generics.RetrieveUpdateDestroyAPIView):
         instance.save(update_fields=('status',))
 
 
+class GoalReorderView(ReorderMixin, generics.GenericAPIView):
+    """Вью перемещения цели в ручной сортировке внутри категории"""
+
+    permission_classes = [GoalPermission]
+    serializer_class = GoalSerializer
+
+    def get_queryset(self) -> QuerySet[Goal]:
+        """Возвращает все цели пользователя из категорий, где он является участником, кроме архивных"""
+        return Goal.live.select_related('user').filter(category__board__participants__user=self.request.user)
+
+
 class GoalCommentCreateView(generics.CreateAPIView):
     """Вью создания комментария"""
 
@@ -155,18 +253,21 @@ class GoalCommentCreateView(generics.CreateAPIView):
         return super().create(request, args, kwargs)
 
 
-class GoalCommentListView(generics.ListAPIView):
+class GoalCommentListView(ValuesListMixin, generics.ListAPIView):
     """Вью отображения списка комментариев"""
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalCommentSerializer
+    values_serializer = goal_comment_values_serializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['goal']
     ordering = ['-created']
 
     def get_queryset(self) -> QuerySet[GoalComment]:
         """Возвращает все комментарии пользователя из цели, где он является участником"""
-        return GoalComment.objects.filter(goal__category__board__participants__user=self.request.user.id)
+        return GoalComment.objects.select_related('user').filter(
+            goal__category__board__participants__user=self.request.user.id
+        )
 
 
 class GoalCommentView(generics.RetrieveUpdateDestroyAPIView):
@@ -175,3 +276,50 @@ class GoalCommentView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [GoalCommentPermission]
     serializer_class = GoalCommentSerializer
     queryset = GoalComment.objects.select_related('user')
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Позволяет запрашивать поток событий с Accept: text/event-stream, ошибки отдаются в JSON"""
+
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return FastJSONRenderer().render(data)
+
+
+class EventStreamView(generics.GenericAPIView):
+    """Вью потока изменений досок пользователя в формате Server-Sent Events, см. todolist/goals/events.py"""
+
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, EventStreamRenderer]
+    serializer_class = EventStreamSerializer
+
+    @extend_schema(
+        parameters=[EventStreamSerializer],
+        responses={(200, 'text/event-stream'): OpenApiTypes.STR, 503: OpenApiTypes.OBJECT},
+    )
+    def get(self, request: Request, *args, **kwargs) -> StreamingHttpResponse | Response:
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        board_ids = set(Board.live.filter(participants__user=request.user).values_list('id', flat=True))
+        # соединение с базой возвращается в пул сразу, а не после закрытия потока
+        if not connection.in_atomic_block:
+            connection.close()
+        subscription = events.Subscription(request.user.id, board_ids)
+        timeout = serializer.validated_data['timeout']
+        if settings.ASYNC_READ_VIEWS:
+            content = events.astream(subscription, timeout)
+        elif events.hub.acquire_stream(settings.EVENTS_MAX_STREAMS):
+            content = events.BoundedStream(events.stream(subscription, timeout))
+        else:
+            return Response(
+                {'detail': 'Слишком много подключённых потоков событий'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(events.RETRY_MS // 1000)},
+            )
+        response = StreamingHttpResponse(content, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # nginx не должен буферизовать поток
+        response['X-Accel-Buffering'] = 'no'
+        return response
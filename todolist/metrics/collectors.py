@@ -0,0 +1,73 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.db import connections
+
+from todolist.metrics.registry import Registry
+
+REGISTRY = Registry()
+
+LABELS = ('view', 'method')
+
+requests_total = REGISTRY.counter(
+    'todolist_http_requests_total', 'HTTP requests by URL name, method and status', ('view', 'method', 'status')
+)
+request_duration = REGISTRY.histogram(
+    'todolist_http_request_duration_seconds',
+    'Request processing time',
+    LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+sampled_requests_total = REGISTRY.counter(
+    'todolist_http_sampled_requests_total', 'Requests with SQL and response size measured', LABELS
+)
+db_queries = REGISTRY.histogram(
+    'todolist_http_db_queries', 'SQL queries per sampled request', LABELS, buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+db_duration = REGISTRY.histogram(
+    'todolist_http_db_duration_seconds',
+    'Total SQL time per sampled request',
+    LABELS,
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+response_size = REGISTRY.histogram(
+    'todolist_http_response_size_bytes',
+    'Response body size of sampled requests',
+    LABELS,
+    buckets=(100, 1000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+
+
+@dataclass
+class QueryStats:
+    """SQL запросы одного запроса к API"""
+
+    count: int = 0
+    duration: float = 0.0
+
+
+# Выставляется MetricsMiddleware только для попавших в выборку запросов
+current_query_stats: ContextVar[QueryStats | None] = ContextVar('current_query_stats', default=None)
+
+
+def sql_wrapper(execute, sql, params, many, context):
+    """Обёртка DB execute, считающая запросы и их время в QueryStats текущего запроса"""
+    stats = current_query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def install_sql_wrapper(sender=None, connection=None, **kwargs) -> None:
+    """Подключает sql_wrapper к соединению при его открытии (обработчик сигнала connection_created),
+    без аргументов - ко всем уже созданным соединениям потока"""
+    for db in [connection] if connection is not None else connections.all(initialized_only=True):
+        if sql_wrapper not in db.execute_wrappers:
+            # в начало списка: connection.execute_wrapper() при выходе снимает последнюю обёртку
+            db.execute_wrappers.insert(0, sql_wrapper)
@@ -0,0 +1,87 @@
+import os
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+
+from todolist.metrics import collectors
+from todolist.metrics.collectors import QueryStats, current_query_stats, install_sql_wrapper
+from todolist.metrics.registry import write_snapshot
+
+
+class MetricsMiddleware:
+    """Собирает длительность запросов по имени URL. Для доли METRICS_SAMPLE_RATE запросов дополнительно
+    считает SQL запросы, их суммарное время и размер ответа"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate: float = settings.METRICS_SAMPLE_RATE
+        self.directory: str = settings.METRICS_DIR
+        self.flush_interval: float = settings.METRICS_FLUSH_INTERVAL
+        self._flushed_at = 0.0
+        self._pid = os.getpid()
+        connection_created.connect(install_sql_wrapper, dispatch_uid='todolist.metrics.sql_wrapper')
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = self.start_sample()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_query_stats.reset(token)
+        self.observe(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        stats = self.start_sample()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_query_stats.reset(token)
+        self.observe(request, response, time.perf_counter() - started, stats)
+        return response
+
+    def start_sample(self) -> QueryStats | None:
+        if random.random() >= self.sample_rate:
+            return None
+        install_sql_wrapper()
+        return QueryStats()
+
+    def observe(self, request: HttpRequest, response: HttpResponse, duration: float, stats: QueryStats | None) -> None:
+        match = request.resolver_match
+        labels = (match.url_name if match and match.url_name else 'unresolved', request.method)
+        collectors.requests_total.inc((*labels, str(response.status_code)))
+        collectors.request_duration.observe(labels, duration)
+
+        if stats is not None:
+            collectors.sampled_requests_total.inc(labels)
+            collectors.db_queries.observe(labels, stats.count)
+            collectors.db_duration.observe(labels, stats.duration)
+            if not response.streaming:
+                collectors.response_size.observe(labels, len(response.content))
+
+        if self.directory:
+            self.flush()
+
+    def flush(self) -> None:
+        now = time.monotonic()
+        # после fork у воркера новый pid, а снимок мастера ему не нужен
+        if now - self._flushed_at < self.flush_interval and self._pid == os.getpid():
+            return
+        self._flushed_at = now
+        self._pid = os.getpid()
+        write_snapshot(collectors.REGISTRY, self.directory)
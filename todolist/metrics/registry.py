@@ -0,0 +1,178 @@
+import json
+import math
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+# Сумма снимков завершившихся воркеров
+DEAD_SNAPSHOT = 'metrics-dead.json'
+
+
+class Registry:
+    """Счётчики и гистограммы с метками в памяти процесса.
+
+    Снимок состояния можно сохранить в каталог METRICS_DIR, чтобы /metrics любого воркера gunicorn
+    отдавал сумму по всем воркерам, включая уже перезапущенные"""
+
+    def __init__(self):
+        self.metrics: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...]) -> 'Counter':
+        self._register(name, COUNTER, documentation, labelnames)
+        return Counter(self, name)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: tuple[str, ...], buckets: tuple[float, ...]
+    ) -> 'Histogram':
+        self._register(name, HISTOGRAM, documentation, labelnames, buckets=sorted(buckets))
+        return Histogram(self, name)
+
+    def _register(self, name: str, kind: str, documentation: str, labelnames: tuple, **extra) -> None:
+        self.metrics[name] = {'type': kind, 'help': documentation, 'labels': list(labelnames), 'samples': {}, **extra}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    **metric,
+                    'samples': [[list(labels), list(values)] for labels, values in metric['samples'].items()],
+                }
+                for name, metric in self.metrics.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            for metric in self.metrics.values():
+                metric['samples'].clear()
+
+
+class Counter:
+    def __init__(self, registry: Registry, name: str):
+        self._registry = registry
+        self._samples = registry.metrics[name]['samples']
+
+    def inc(self, labels: tuple, amount: float = 1) -> None:
+        with self._registry._lock:
+            values = self._samples.setdefault(labels, [0])
+            values[0] += amount
+
+
+class Histogram:
+    """Значения хранятся как [число попаданий в каждый интервал..., сумма, количество]"""
+
+    def __init__(self, registry: Registry, name: str):
+        self._registry = registry
+        metric = registry.metrics[name]
+        self._buckets = metric['buckets']
+        self._samples = metric['samples']
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = next((i for i, bound in enumerate(self._buckets) if value <= bound), len(self._buckets))
+        with self._registry._lock:
+            values = self._samples.get(labels)
+            if values is None:
+                values = self._samples[labels] = [0] * (len(self._buckets) + 3)
+            values[index] += 1
+            values[-2] += value
+            values[-1] += 1
+
+
+def merge(snapshots: list[dict]) -> dict:
+    """Складывает снимки нескольких процессов"""
+    merged: dict[str, dict] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, 'samples': {}})
+            for labels, values in metric['samples']:
+                current = target['samples'].setdefault(tuple(labels), [0] * len(values))
+                for i, value in enumerate(values):
+                    current[i] += value
+    return {
+        name: {**metric, 'samples': [[list(labels), values] for labels, values in metric['samples'].items()]}
+        for name, metric in merged.items()
+    }
+
+
+def write_snapshot(registry: Registry, directory: str) -> None:
+    """Атомарно сохраняет снимок процесса в каталог"""
+    _write(Path(directory) / f'metrics-{os.getpid()}.json', registry.snapshot())
+
+
+def fold_snapshot(directory: str, pid: int) -> None:
+    """Добавляет снимок завершившегося процесса к общему снимку DEAD_SNAPSHOT и удаляет его файл, чтобы каталог
+    не рос с каждым перезапуском воркера. Вызывается из мастера gunicorn, поэтому общий снимок пишет один процесс"""
+    path = Path(directory) / f'metrics-{pid}.json'
+    try:
+        snapshot = json.loads(path.read_text())
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError):
+        snapshot = {}
+    dead_path = Path(directory) / DEAD_SNAPSHOT
+    try:
+        snapshots = [json.loads(dead_path.read_text()), snapshot]
+    except (OSError, ValueError):
+        snapshots = [snapshot]
+    _write(dead_path, merge(snapshots))
+    path.unlink(missing_ok=True)
+
+
+def _write(path: Path, snapshot: dict) -> None:
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, delete=False, suffix='.tmp') as file:
+        json.dump(snapshot, file)
+    os.replace(file.name, path)
+
+
+def read_snapshots(directory: str, exclude_pid: int | None = None) -> list[dict]:
+    snapshots = []
+    for path in Path(directory).glob('metrics-*.json'):
+        if exclude_pid is not None and path.name == f'metrics-{exclude_pid}.json':
+            continue
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def render(snapshot: dict) -> str:
+    """Текстовый формат экспозиции Prometheus"""
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f'# HELP {name} {metric["help"]}')
+        lines.append(f'# TYPE {name} {metric["type"]}')
+        labelnames = metric['labels']
+        for labels, values in sorted(metric['samples']):
+            pairs = list(zip(labelnames, labels))
+            if metric['type'] == COUNTER:
+                lines.append(f'{name}{_labels(pairs)} {_number(values[0])}')
+                continue
+            cumulative = 0
+            for bound, count in zip([*metric['buckets'], math.inf], values):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels([*pairs, ("le", _number(bound))])} {_number(cumulative)}')
+            lines.append(f'{name}_sum{_labels(pairs)} {_number(values[-2])}')
+            lines.append(f'{name}_count{_labels(pairs)} {_number(values[-1])}')
+    return '\n'.join(lines) + '\n'
+
+
+def _labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
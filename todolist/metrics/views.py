@@ -0,0 +1,27 @@
+import os
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from todolist.metrics.collectors import REGISTRY
+from todolist.metrics.registry import merge, read_snapshots, render
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Метрики в текстовом формате Prometheus, при заданном METRICS_DIR - сумма по всем воркерам.
+    Без METRICS_TOKEN метрики отдаются только при DEBUG"""
+    if not settings.METRICS_TOKEN:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {settings.METRICS_TOKEN}'):
+        return HttpResponseForbidden()
+
+    snapshots = [REGISTRY.snapshot()]
+    if settings.METRICS_DIR:
+        snapshots += read_snapshots(settings.METRICS_DIR, exclude_pid=os.getpid())
+    return HttpResponse(render(merge(snapshots)), content_type=CONTENT_TYPE)
@@ -0,0 +1,95 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from drf_spectacular.plumbing import set_query_parameters
+from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+VERSION_PARAM = 'v'
+
+
+@lru_cache
+def get_code_version() -> str:
+    """Версия кода из CODE_VERSION (задаётся при сборке образа), иначе хеш исходников приложений проекта
+    и poetry.lock"""
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+    base_dir = Path(settings.BASE_DIR)
+    digest = hashlib.sha256()
+    paths = [base_dir / 'poetry.lock']
+    for app_config in apps.get_app_configs():
+        app_path = Path(app_config.path)
+        if app_path.is_relative_to(base_dir):
+            paths.extend(app_path.rglob('*.py'))
+    for path in sorted(set(paths)):
+        if path.is_file():
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """Схема OpenAPI, которая строится один раз для версии кода и хранится в кеше уже отрисованной.
+    Отдаётся с ETag; по адресу с параметром v=<версия кода> - с заголовками неизменяемого ресурса"""
+
+    def _get_schema_response(self, request):
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        key = ':'.join(
+            (
+                'openapi',
+                get_code_version(),
+                str(version),
+                request.GET.get('lang') or '',
+                request.accepted_media_type,
+            )
+        )
+        entry = cache.get(key)
+        if entry is None:
+            response = super()._get_schema_response(request)
+            content = request.accepted_renderer.render(
+                response.data, request.accepted_media_type, self.get_renderer_context()
+            )
+            entry = {
+                'content': content,
+                'etag': quote_etag(hashlib.sha256(content).hexdigest()[:32]),
+                'disposition': response.headers['Content-Disposition'],
+            }
+            cache.set(key, entry, None)
+
+        if entry['etag'] in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            content_type = request.accepted_media_type
+            if request.accepted_renderer.charset:
+                content_type = f'{content_type}; charset={request.accepted_renderer.charset}'
+            response = HttpResponse(entry['content'], content_type=content_type)
+            response['Content-Disposition'] = entry['disposition']
+        response['ETag'] = entry['etag']
+
+        if request.GET.get(VERSION_PARAM) == get_code_version():
+            patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+class VersionedSpectacularSwaggerView(SpectacularSwaggerView):
+    """Swagger UI, запрашивающий схему по адресу с версией кода, чтобы браузер брал её из своего кеша"""
+
+    def _get_schema_url(self, request):
+        return set_query_parameters(url=super()._get_schema_url(request), **{VERSION_PARAM: get_code_version()})
+
+
+def warm_schema() -> None:
+    """Строит схему заранее, чтобы первый запрос к /api/schema/ не ждал её генерации"""
+    from django.test import RequestFactory
+
+    view = CachedSpectacularAPIView.as_view()
+    for accept in ('application/vnd.oai.openapi', 'application/vnd.oai.openapi+json'):
+        view(RequestFactory().get('/api/schema/', HTTP_ACCEPT=accept))
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'drf_spectacular',
     'core',
     'todolist.goals',
+    'todolist.slowlog',
     'bot',
 ]
 
@@ -54,17 +55,45 @@ if DEBUG:
     ]
 
 MIDDLEWARE = [
+    'todolist.metrics.middleware.MetricsMiddleware',
+    'todolist.slowlog.middleware.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'todolist.db.middleware.ReplicaRoutingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'todolist.urls'
 
+# Метрики /metrics: доля запросов, для которых считаются SQL запросы и размер ответа. Каталог METRICS_DIR
+# нужен при нескольких воркерах, туда каждый процесс раз в METRICS_FLUSH_INTERVAL секунд сохраняет свои метрики
+METRICS_SAMPLE_RATE = env.float('METRICS_SAMPLE_RATE', default=1.0)
+METRICS_DIR = env.str('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=5.0)
+# Токен для заголовка Authorization: Bearer <токен>, без него /metrics закрыт, если не включён DEBUG
+METRICS_TOKEN = env.str('METRICS_TOKEN', default='')
+
+# Журнал медленных SQL запросов в админке, выключен при SLOW_QUERY_THRESHOLD_MS = 0. Для доли
+# SLOW_QUERY_EXPLAIN_RATE запросов к API самый долгий медленный SELECT повторяется с EXPLAIN (ANALYZE, BUFFERS)
+SLOW_QUERY_THRESHOLD_MS = env.float('SLOW_QUERY_THRESHOLD_MS', default=0)
+SLOW_QUERY_EXPLAIN_RATE = env.float('SLOW_QUERY_EXPLAIN_RATE', default=0)
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = env.int('SLOW_QUERY_EXPLAIN_TIMEOUT_MS', default=5000)
+SLOW_QUERY_LOG_SIZE = env.int('SLOW_QUERY_LOG_SIZE', default=1000)
+
+# Через сколько дней удалённые доски и категории и архивные цели удаляются из базы командой purge_deleted
+RETENTION_DAYS = env.int('RETENTION_DAYS', default=90)
+# Строк в одной транзакции, пауза в секундах между транзакциями и допустимое отставание реплик в секундах
+PURGE_BATCH_SIZE = env.int('PURGE_BATCH_SIZE', default=1000)
+PURGE_PAUSE = env.float('PURGE_PAUSE', default=0.1)
+PURGE_MAX_REPLICA_LAG = env.float('PURGE_MAX_REPLICA_LAG', default=2)
+
+# С какого числа строк списки в админке показывают оценку по статистике PostgreSQL вместо COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = env.int('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100_000)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -83,17 +112,80 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'todolist.wsgi.application'
 
+# Асинхронные версии списков и детального просмотра досок (см. todolist/goals/async_views.py),
+# включаются в todolist/asgi.py для запуска под ASGI сервером
+ASYNC_READ_VIEWS = env.bool('ASYNC_READ_VIEWS', default=False)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # todolist.db.backends.postgresql_pool переиспользует соединения между запросами,
+        # django.db.backends.postgresql открывает новое соединение на каждый запрос
+        'ENGINE': env.str('POSTGRES_ENGINE', default='todolist.db.backends.postgresql_pool'),
         'NAME': env('POSTGRES_DB'),
         'USER': env('POSTGRES_USER'),
         'PASSWORD': env('POSTGRES_PASSWORD'),
         'HOST': env('POSTGRES_HOST', default='127.0.0.1'),
         'PORT': env.int('POSTGRES_PORT', default=5432),
+        # pgbouncer в режиме transaction не поддерживает серверные курсоры
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('POSTGRES_PGBOUNCER', default=False),
+        'POOL': {
+            'MIN_SIZE': env.int('POSTGRES_POOL_MIN_SIZE', default=1),
+            'MAX_SIZE': env.int('POSTGRES_POOL_MAX_SIZE', default=10),
+            'TIMEOUT': env.int('POSTGRES_POOL_TIMEOUT', default=10),
+            'MAX_LIFETIME': env.int('POSTGRES_POOL_MAX_LIFETIME', default=30 * 60),
+            'MAX_IDLE': env.int('POSTGRES_POOL_MAX_IDLE', default=10 * 60),
+            'CHECK_INTERVAL': env.int('POSTGRES_POOL_CHECK_INTERVAL', default=30),
+        },
+    }
+}
+
+# Кеш общий для всех воркеров и контейнеров: в нём сессии и кеш пользователей, их сброс при выходе, смене пароля
+# и блокировке должен быть виден всем процессам. LocMemCache допустим только с одним воркером,
+# с несколькими gunicorn не запустится (gunicorn.conf.py)
+CACHES = {
+    'default': {
+        'BACKEND': env.str('CACHE_BACKEND', default='django.core.cache.backends.redis.RedisCache'),
+        'LOCATION': env.str('CACHE_LOCATION', default='redis://localhost:6379/0'),
     }
 }
 
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+USER_CACHE_TIMEOUT = env.int('USER_CACHE_TIMEOUT', default=5 * 60)
+
+# Реплики для чтения задаются списком host[:port], алиасы replica_0, replica_1...
+# Для локальной проверки можно указать тот же сервер, что и у default
+DATABASE_REPLICAS = []
+for index, replica_host in enumerate(env.list('POSTGRES_REPLICA_HOSTS', default=[])):
+    replica_host, _, replica_port = replica_host.partition(':')
+    DATABASE_REPLICAS.append(f'replica_{index}')
+    DATABASES[f'replica_{index}'] = DATABASES['default'] | {
+        'HOST': replica_host,
+        'PORT': int(replica_port or DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['todolist.db.routers.ReplicaRouter']
+# Сколько секунд после изменения клиент читает только из основной базы
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=5)
+# Допустимое отставание реплики в секундах и как часто его проверять
+REPLICA_MAX_LAG = env.int('REPLICA_MAX_LAG', default=5)
+REPLICA_LAG_CHECK_INTERVAL = env.int('REPLICA_LAG_CHECK_INTERVAL', default=5)
+
+# Поток изменений досок (todolist/goals/events.py). LISTEN не работает через pgbouncer в режиме transaction,
+# в этом случае слушатель подключается к PostgreSQL напрямую по EVENTS_LISTEN_HOST и EVENTS_LISTEN_PORT
+EVENTS_LISTEN_HOST = env.str('EVENTS_LISTEN_HOST', default=DATABASES['default']['HOST'])
+EVENTS_LISTEN_PORT = env.int('EVENTS_LISTEN_PORT', default=DATABASES['default']['PORT'])
+# Интервал keepalive и наибольшая длительность одного потока в секундах, после неё клиент переподключается
+EVENTS_KEEPALIVE = env.int('EVENTS_KEEPALIVE', default=15)
+EVENTS_STREAM_TIMEOUT = env.int('EVENTS_STREAM_TIMEOUT', default=300)
+# Событий в очереди одного клиента, при переполнении поток закрывается
+EVENTS_QUEUE_SIZE = env.int('EVENTS_QUEUE_SIZE', default=1000)
+# Одновременных потоков событий в процессе под WSGI: каждый занимает поток воркера, пока клиент подключён,
+# поэтому по умолчанию один из GUNICORN_THREADS остаётся остальным запросам. Сверх предела отдаётся 503.
+# В деплое поток обслуживает ASGI сервис events, где поток не занимает воркер и не ограничивается,
+# под WSGI он остаётся для запуска без него
+EVENTS_MAX_STREAMS = env.int('EVENTS_MAX_STREAMS', default=env.int('GUNICORN_THREADS', default=2) - 1)
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -110,7 +202,21 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = 'static/'
-STATIC_ROOT = BASE_DIR.joinpath('static')
+STATIC_ROOT = env.str('STATIC_ROOT', default=str(BASE_DIR.joinpath('static')))
+# В образе (Dockerfile.prod) статика собирается при сборке, имена файлов содержат хеш содержимого (staticfiles.json).
+# Без STATIC_MANIFEST манифест не нужен: при разработке и в тестах collectstatic не запускается
+STATIC_MANIFEST = env.bool('STATIC_MANIFEST', default=False)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+        if STATIC_MANIFEST
+        else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    },
+}
+
+# Снимок миграций, сохраняемый при сборке образа (manage.py ensure_migrated --write)
+MIGRATIONS_FINGERPRINT_FILE = env.str('MIGRATIONS_FINGERPRINT_FILE', default=str(BASE_DIR.joinpath('migrations.lock')))
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -125,6 +231,14 @@ SOCIAL_AUTH_USER_MODEL = 'core.User'
 SOCIAL_AUTH_VK_OAUTH2_SCOPE = ['email']
 
 BOT_TOKEN = env.str('BOT_TOKEN')
+BOT_API_URL = env.str('BOT_API_URL', default='https://api.telegram.org')
+BOT_REMINDERS_INTERVAL = env.int('BOT_REMINDERS_INTERVAL', default=0)
+BOT_CHECKPOINT_BATCH = env.int('BOT_CHECKPOINT_BATCH', default=100)
+BOT_CHECKPOINT_INTERVAL = env.int('BOT_CHECKPOINT_INTERVAL', default=5)
+# Обновление, обработка которого упала, повторяется до BOT_UPDATE_MAX_ATTEMPTS раз с паузой
+# BOT_UPDATE_RETRY_DELAY секунд, удваивающейся после каждой попытки, затем пропускается
+BOT_UPDATE_MAX_ATTEMPTS = env.int('BOT_UPDATE_MAX_ATTEMPTS', default=5)
+BOT_UPDATE_RETRY_DELAY = env.float('BOT_UPDATE_RETRY_DELAY', default=1.0)
 
 AUTHENTICATION_BACKENDS = (
     'social_core.backends.vk.VKOAuth2',
@@ -138,10 +252,32 @@ SOCIAL_AUTH_VK_EXTRA_DATA = [
 SOCIAL_AUTH_LOGIN_ERROR_URL = '/login-error/'
 
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'rest_framework.authentication.SessionAuthentication',
+        'core.authentication.SignedTokenAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'todolist.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'todolist.fastjson.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Время жизни access и refresh токенов API клиентов и кеширования версии токенов пользователя, в секундах
+ACCESS_TOKEN_LIFETIME = env.int('ACCESS_TOKEN_LIFETIME', default=15 * 60)
+REFRESH_TOKEN_LIFETIME = env.int('REFRESH_TOKEN_LIFETIME', default=14 * 24 * 60 * 60)
+TOKEN_VERSION_CACHE_TIMEOUT = env.int('TOKEN_VERSION_CACHE_TIMEOUT', default=60)
+
+# Версия кода (например, хеш коммита), передаётся при сборке образа. По ней обновляется закешированная схема API
+CODE_VERSION = env.str('CODE_VERSION', default='')
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Todolist3 API',
     'DESCRIPTION': 'Event organizer',
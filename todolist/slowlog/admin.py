@@ -0,0 +1,37 @@
+from django.contrib import admin
+from django.utils.html import format_html
+
+from todolist.slowlog.models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Просмотр журнала медленных запросов, записи только для чтения"""
+
+    list_display = ('created', 'duration_ms', 'method', 'view', 'database', 'short_sql', 'has_plan')
+    list_filter = ('view', 'database')
+    search_fields = ('sql', 'path')
+    fields = ('created', 'duration_ms', 'database', 'method', 'view', 'path', 'sql_display', 'params', 'plan_display')
+    readonly_fields = fields
+
+    @admin.display(description='SQL')
+    def short_sql(self, obj: SlowQuery) -> str:
+        return obj.sql[:120]
+
+    @admin.display(description='EXPLAIN', boolean=True)
+    def has_plan(self, obj: SlowQuery) -> bool:
+        return bool(obj.plan)
+
+    @admin.display(description='SQL')
+    def sql_display(self, obj: SlowQuery) -> str:
+        return format_html('<pre style="white-space: pre-wrap">{}</pre>', obj.sql)
+
+    @admin.display(description='План EXPLAIN (ANALYZE, BUFFERS)')
+    def plan_display(self, obj: SlowQuery) -> str:
+        return format_html('<pre>{}</pre>', obj.plan) if obj.plan else '-'
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class SlowlogConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'todolist.slowlog'
+    verbose_name = 'Медленные запросы'
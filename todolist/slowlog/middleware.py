@@ -0,0 +1,98 @@
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+
+from todolist.slowlog import recorder
+from todolist.slowlog.models import SlowQuery
+from todolist.slowlog.recorder import CapturedQuery, SlowQueryCapture, current_capture, install_slow_query_wrapper
+
+logger = logging.getLogger(__name__)
+
+
+class SlowQueryMiddleware:
+    """Журнал SQL запросов дольше SLOW_QUERY_THRESHOLD_MS с адресом и вью, из которой они выполнены.
+
+    Запись в журнал и EXPLAIN делаются при закрытии ответа, когда он уже отправлен клиенту, и не задерживают его,
+    их собственные запросы не учитываются. Значения параметров SQL и строки запроса в журнале скрыты.
+    Для доли SLOW_QUERY_EXPLAIN_RATE запросов самый долгий медленный SELECT повторяется с EXPLAIN (ANALYZE, BUFFERS).
+    При нулевом пороге middleware отключается"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.threshold_ms: float = settings.SLOW_QUERY_THRESHOLD_MS
+        if self.threshold_ms <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.explain_rate: float = settings.SLOW_QUERY_EXPLAIN_RATE
+        self.size: int = settings.SLOW_QUERY_LOG_SIZE
+        connection_created.connect(install_slow_query_wrapper, dispatch_uid='todolist.slowlog.slow_query_wrapper')
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        install_slow_query_wrapper()
+        capture = SlowQueryCapture(self.threshold_ms)
+        token = current_capture.set(capture)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_capture.reset(token)
+        return self.defer_record(request, response, capture)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        capture = SlowQueryCapture(self.threshold_ms)
+        token = current_capture.set(capture)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_capture.reset(token)
+        return self.defer_record(request, response, capture)
+
+    def defer_record(self, request: HttpRequest, response: HttpResponse, capture: SlowQueryCapture) -> HttpResponse:
+        """Откладывает запись до закрытия ответа: WSGI сервер закрывает его после отправки тела,
+        ASGI обработчик Django - в синхронном потоке"""
+        if capture.queries:
+            # через этот же список FileResponse закрывает свой файл
+            response._resource_closers.append(lambda: self.record(request, capture.queries))
+        return response
+
+    def record(self, request: HttpRequest, queries: list[CapturedQuery]) -> None:
+        match = request.resolver_match
+        view = match.view_name if match else ''
+        candidates = [query for query in queries if query.explainable]
+        explained = None
+        if candidates and random.random() < self.explain_rate:
+            explained = max(candidates, key=lambda query: query.duration_ms)
+
+        entries = []
+        for query in queries:
+            logger.warning(
+                'Slow query %.1f ms in %s %s: %s', query.duration_ms, request.method, request.path, query.sql
+            )
+            entries.append(
+                SlowQuery(
+                    duration_ms=query.duration_ms,
+                    database=query.database,
+                    sql=query.sql,
+                    params=recorder.jsonable_params(query.params, query.many),
+                    view=view,
+                    method=request.method,
+                    path=recorder.masked_path(request.path, request.GET),
+                    plan=recorder.explain(query) if query is explained else '',
+                )
+            )
+        # журнал не должен ломать ответ, например до применения миграций
+        try:
+            recorder.save(entries, self.size)
+        except Exception:
+            logger.exception('Failed to save slow query log')
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:50
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата')),
+                ('duration_ms', models.FloatField(verbose_name='Длительность, мс')),
+                ('database', models.CharField(max_length=64, verbose_name='База')),
+                ('sql', models.TextField(verbose_name='SQL')),
+                (
+                    'params',
+                    models.JSONField(
+                        blank=True,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name='Параметры',
+                    ),
+                ),
+                ('view', models.CharField(blank=True, max_length=255, verbose_name='Вью')),
+                ('method', models.CharField(blank=True, max_length=10, verbose_name='Метод')),
+                ('path', models.TextField(blank=True, verbose_name='Адрес запроса')),
+                ('plan', models.TextField(blank=True, verbose_name='План EXPLAIN (ANALYZE, BUFFERS)')),
+            ],
+            options={
+                'verbose_name': 'Медленный запрос',
+                'verbose_name_plural': 'Медленные запросы',
+                'ordering': ('-id',),
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """SQL запрос, выполнявшийся дольше SLOW_QUERY_THRESHOLD_MS. Хранятся последние SLOW_QUERY_LOG_SIZE записей"""
+
+    class Meta:
+        verbose_name = 'Медленный запрос'
+        verbose_name_plural = 'Медленные запросы'
+        ordering = ('-id',)
+
+    created = models.DateTimeField(verbose_name='Дата', auto_now_add=True)
+    duration_ms = models.FloatField(verbose_name='Длительность, мс')
+    database = models.CharField(verbose_name='База', max_length=64)
+    sql = models.TextField(verbose_name='SQL')
+    params = models.JSONField(verbose_name='Параметры', encoder=DjangoJSONEncoder, null=True, blank=True)
+    view = models.CharField(verbose_name='Вью', max_length=255, blank=True)
+    method = models.CharField(verbose_name='Метод', max_length=10, blank=True)
+    path = models.TextField(verbose_name='Адрес запроса', blank=True)
+    plan = models.TextField(verbose_name='План EXPLAIN (ANALYZE, BUFFERS)', blank=True)
+
+    def __str__(self) -> str:
+        return f'{self.duration_ms:.0f} ms {self.view}'
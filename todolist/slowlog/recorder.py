@@ -0,0 +1,117 @@
+import datetime
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.http import QueryDict
+
+from todolist.slowlog.models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+# значения параметров, которые сохраняются в журнал как есть
+VISIBLE_TYPES = (int, float, type(None), datetime.date, datetime.time, datetime.timedelta, Decimal)
+MASK = '***'
+
+
+@dataclass
+class CapturedQuery:
+    """Медленный запрос, дожидающийся записи в журнал после ответа"""
+
+    database: str
+    sql: str
+    params: Any
+    many: bool
+    duration_ms: float
+
+    @property
+    def explainable(self) -> bool:
+        """EXPLAIN ANALYZE выполняет запрос, поэтому повторяются только SELECT"""
+        return not self.many and self.sql.lstrip().lower().startswith('select')
+
+
+@dataclass
+class SlowQueryCapture:
+    """Медленные запросы одного запроса к API"""
+
+    threshold_ms: float
+    queries: list[CapturedQuery] = field(default_factory=list)
+
+
+# Выставляется SlowQueryMiddleware на время обработки запроса
+current_capture: ContextVar[SlowQueryCapture | None] = ContextVar('current_slow_query_capture', default=None)
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """Обёртка DB execute, запоминающая запросы дольше порога текущего запроса"""
+    capture = current_capture.get()
+    if capture is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= capture.threshold_ms:
+            capture.queries.append(CapturedQuery(context['connection'].alias, sql, params, many, duration_ms))
+
+
+def install_slow_query_wrapper(sender=None, connection=None, **kwargs) -> None:
+    """Подключает slow_query_wrapper к соединению при его открытии (обработчик сигнала connection_created),
+    без аргументов - ко всем уже созданным соединениям потока"""
+    for db in [connection] if connection is not None else connections.all(initialized_only=True):
+        if slow_query_wrapper not in db.execute_wrappers:
+            # в начало списка: connection.execute_wrapper() при выходе снимает последнюю обёртку
+            db.execute_wrappers.insert(0, slow_query_wrapper)
+
+
+def jsonable_params(params: Any, many: bool = False) -> Any:
+    """Параметры запроса в виде, пригодном для JSONField. Журнал виден в админке, поэтому строки и прочие значения,
+    которые могут содержать пользовательские данные, токены и ключи сессий, заменяются типом, сохраняются только
+    числа, даты и None. У executemany сохраняется только число наборов"""
+    if params is None:
+        return None
+    if many:
+        return {'executemany': len(params) if hasattr(params, '__len__') else None}
+    if isinstance(params, dict):
+        return {key: _masked(value) for key, value in params.items()}
+    return [_masked(value) for value in params]
+
+
+def _masked(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_masked(item) for item in value]
+    if isinstance(value, VISIBLE_TYPES):
+        return value
+    return f'<{type(value).__name__}>'
+
+
+def masked_path(path: str, query: QueryDict) -> str:
+    """Адрес запроса со скрытыми значениями параметров строки запроса"""
+    if not query:
+        return path
+    return f'{path}?' + '&'.join(f'{key}={MASK}' for key, values in query.lists() for _ in values)
+
+
+def explain(query: CapturedQuery) -> str:
+    """Повторяет запрос с EXPLAIN (ANALYZE, BUFFERS) в откатываемой транзакции с ограничением по времени"""
+    try:
+        with transaction.atomic(using=query.database), connections[query.database].cursor() as cursor:
+            cursor.execute(f'SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}')
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {query.sql}', query.params)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+            transaction.set_rollback(True, using=query.database)
+    except DatabaseError as exc:
+        return f'EXPLAIN failed: {exc}'
+    return plan
+
+
+def save(entries: list[SlowQuery], size: int) -> None:
+    """Записывает журнал и удаляет записи сверх последних size"""
+    created = SlowQuery.objects.bulk_create(entries)
+    SlowQuery.objects.filter(pk__lte=created[-1].pk - size).delete()
@@ -17,17 +17,20 @@ Including another URLconf
 from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+from todolist.metrics.views import metrics_view
+from todolist.schema import CachedSpectacularAPIView, VersionedSpectacularSwaggerView
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('api/schema/', CachedSpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/swagger-ui/', VersionedSpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('core/', include(('core.urls', 'core'))),
     path('goals/', include(('todolist.goals.urls', 'todolist.goals'))),
     path('bot/', include(('bot.urls', 'bot'))),
     path('oauth/', include('social_django.urls', namespace='social')),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,53 @@
+import logging
+
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from todolist.schema import warm_schema
+
+logger = logging.getLogger(__name__)
+
+
+def warm_app() -> None:
+    """Заполняет кеши URL-резолвера и метаданных моделей, собирая поля сериализаторов всех вью API, и строит схему.
+    Вызывается в мастер-процессе после предзагрузки приложения, чтобы воркеры получили кеши через copy-on-write"""
+    resolver = get_resolver()
+    # обращение к reverse_dict заполняет резолвер и все вложенные include
+    resolver.reverse_dict
+    for view_class in _iter_view_classes(resolver):
+        serializer_class = getattr(view_class, 'serializer_class', None)
+        if serializer_class is None:
+            continue
+        try:
+            serializer_class().fields
+        except Exception:
+            logger.debug('Failed to warm %s', serializer_class, exc_info=True)
+
+    try:
+        warm_schema()
+    except Exception:
+        logger.warning('Failed to build OpenAPI schema', exc_info=True)
+
+
+def warm_connections() -> None:
+    """Открывает соединения с базами до MIN_SIZE пула и оставляет их в пуле"""
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+            pool = getattr(connection, 'pool', None)
+            if pool is not None:
+                pool.warm()
+        except Exception:
+            logger.warning('Failed to warm connection to %s', connection.alias, exc_info=True)
+        finally:
+            connection.close()
+
+
+def _iter_view_classes(resolver: URLResolver):
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_view_classes(pattern)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, 'cls', None) or getattr(pattern.callback, 'view_class', None)
+            if view_class is not None:
+                yield view_class